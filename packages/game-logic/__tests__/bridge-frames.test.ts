@@ -0,0 +1,229 @@
+import { describe, it, expect } from "vitest";
+import type { CardData, GameStateSnapshot } from "../src/types.js";
+import {
+  encodeFrame,
+  encodePayload,
+  FRAME_BATCH,
+  FRAME_GAME_OVER,
+  FRAME_JSON,
+  FRAME_TURN,
+  TURN_HEADER_SIZE,
+} from "../src/training/bridge-frames.js";
+import { ACTION_SIZE, STATE_SIZE } from "../src/training/constants.js";
+
+const cd = (rank: number, suit: number): CardData => ({
+  rank,
+  suit,
+  value: rank * 4 + suit,
+});
+
+function readMask(view: DataView, offset: number): number[] {
+  const values: number[] = [];
+  const lo = view.getUint32(offset, true);
+  const hi = view.getUint32(offset + 4, true);
+  for (let v = 0; v < 32; v++) if (lo & (1 << v)) values.push(v);
+  for (let v = 0; v < 20; v++) if (hi & (1 << v)) values.push(32 + v);
+  return values;
+}
+
+function snapshot(overrides?: Partial<GameStateSnapshot>): GameStateSnapshot {
+  return {
+    hands: [[cd(0, 0), cd(12, 3)], [cd(5, 1)], [], [cd(8, 2), cd(9, 2)]],
+    currentPlayer: 0,
+    lastPlay: { combo: "SINGLE", cards: [cd(4, 0)], suited: false },
+    lastPlayBy: 3,
+    passedPlayers: [false, true, true, false],
+    winOrder: [2],
+    playersInGame: [true, true, false, true],
+    cardsPlayedByPlayer: [[], [cd(3, 3)], [cd(1, 0), cd(11, 1)], [cd(4, 0)]],
+    combosPlayedByPlayer: [{}, { SINGLE: 1 }, { SINGLE: 2 }, { SINGLE: 1 }],
+    ...overrides,
+  };
+}
+
+describe("bridge binary frames", () => {
+  it("prefixes the payload with its little-endian length", () => {
+    const frame = encodeFrame({ type: "game_over", win_order: [1, 0, 3, 2] });
+    const view = new DataView(frame.buffer);
+    expect(view.getUint32(0, true)).toBe(frame.length - 4);
+    expect(Array.from(frame.slice(4))).toEqual([FRAME_GAME_OVER, 4, 1, 0, 3, 2]);
+  });
+
+  it("encodes turn scalars, masks and actions", () => {
+    const comboMap = new Array(364).fill(0);
+    comboMap[0] = 1;
+    comboMap[51 * 7 + 0] = 2;
+    const buf = encodePayload({
+      type: "turn",
+      state: snapshot({ handComboTypeMap: comboMap }),
+      player: 0,
+      valid_actions: [[cd(12, 3)], [cd(0, 0), cd(12, 3)]],
+      can_pass: true,
+    });
+    const view = new DataView(buf.buffer);
+
+    expect(buf[0]).toBe(FRAME_TURN);
+    expect(buf[1]).toBe(0);
+    expect(buf[2]).toBe(1 | 2); // can_pass + has lastPlay
+    expect(view.getInt8(4)).toBe(3);
+    expect(buf[5]).toBe(0); // SINGLE
+    expect(buf[6]).toBe(0b0110);
+    expect(buf[7]).toBe(0b1011);
+    expect(buf[8]).toBe(1);
+    expect(buf[9]).toBe(2);
+
+    expect(readMask(view, 16)).toEqual([0, 51]);
+    expect(readMask(view, 24)).toEqual([21]);
+    expect(readMask(view, 40)).toEqual([34, 38]);
+    expect(readMask(view, 48 + 16)).toEqual([4, 45]);
+    expect(readMask(view, 80)).toEqual([16]);
+    expect(buf[88 + 2 * 7 + 0]).toBe(2);
+    expect(buf[116 + 51 * 7]).toBe(2);
+
+    expect(view.getUint16(496, true)).toBe(2);
+    expect(view.getUint16(498, true)).toBe(3);
+    expect(Array.from(buf.slice(TURN_HEADER_SIZE))).toEqual([1, 2, 51, 0, 51]);
+  });
+
+  it("encodes tournament context when present", () => {
+    const buf = encodePayload({
+      type: "turn",
+      state: snapshot({
+        tourneyContext: {
+          scores: [4, 10, 0, 7],
+          targetScore: 21,
+          gameNumber: 3,
+          expectedTotalGames: 12,
+        },
+      }),
+      player: 0,
+      valid_actions: [],
+      can_pass: true,
+    });
+    const view = new DataView(buf.buffer);
+    expect(buf[2] & 8).toBe(8);
+    expect(view.getInt16(482, true)).toBe(10);
+    expect(view.getUint16(488, true)).toBe(21);
+    expect(view.getUint16(490, true)).toBe(3);
+    expect(view.getUint16(492, true)).toBe(12);
+  });
+
+  it("records forced moves after the actions", () => {
+    const buf = encodePayload({
+      type: "turn",
+      state: snapshot(),
+      player: 0,
+      valid_actions: [[cd(12, 3)]],
+      can_pass: true,
+      forced: 2,
+      forced_moves: [
+        { player: 1, can_pass: true, cards: [] },
+        { player: 3, can_pass: false, cards: [45] },
+      ],
+    });
+    const view = new DataView(buf.buffer);
+    expect(buf[2] & 32).toBe(32);
+    expect(view.getUint16(494, true)).toBe(2);
+    expect(Array.from(buf.slice(TURN_HEADER_SIZE))).toEqual([1, 51, 2, 0, 1 | 4, 0, 3, 1, 45]);
+  });
+
+  it("marks seat moves in the record", () => {
+    const buf = encodePayload({
+      type: "turn",
+      state: snapshot(),
+      player: 0,
+      valid_actions: [],
+      can_pass: true,
+      forced: 0,
+      forced_moves: [{ player: 2, can_pass: true, cards: [7, 11], seat: true }],
+    });
+    const view = new DataView(buf.buffer);
+    expect(buf[2] & 32).toBe(32);
+    expect(view.getUint16(494, true)).toBe(0);
+    expect(Array.from(buf.slice(TURN_HEADER_SIZE))).toEqual([1, 0, 2 | 4 | 8, 2, 7, 11]);
+  });
+
+  it("appends the move record to game over", () => {
+    const buf = encodePayload({
+      type: "game_over",
+      win_order: [1, 0, 3],
+      forced: 1,
+      forced_moves: [
+        { player: 3, can_pass: true, cards: [] },
+        { player: 2, can_pass: false, cards: [9], seat: true },
+      ],
+    });
+    expect(Array.from(buf)).toEqual([
+      FRAME_GAME_OVER, 3, 1, 0, 3, 1, 0, 2, 0, 3 | 4, 0, 2 | 8, 1, 9,
+    ]);
+  });
+
+  it("flags projected fields", () => {
+    const full = snapshot();
+    const buf = encodePayload({
+      type: "turn",
+      state: {
+        ...full,
+        hands: [full.hands[0], [], [], []],
+        handSizes: [2, 1, 0, 2],
+      },
+      player: 0,
+      valid_actions: [[51], [0, 51]],
+      can_pass: true,
+    });
+    const view = new DataView(buf.buffer);
+    expect(buf[13]).toBe(1 | 2 | 4);
+    expect(view.getUint16(14, true)).toBe(2 | (1 << 4) | (2 << 12));
+    expect(readMask(view, 16)).toEqual([0, 51]);
+    expect(readMask(view, 24)).toEqual([]);
+    expect(Array.from(buf.slice(TURN_HEADER_SIZE))).toEqual([1, 2, 51, 0, 51]);
+  });
+
+  it("appends aligned float32 features when present", () => {
+    const stateFeatures = new Float32Array(STATE_SIZE).fill(0.5);
+    const actionFeatures = new Float32Array(2 * ACTION_SIZE);
+    actionFeatures[ACTION_SIZE + 3] = 1;
+    const buf = encodePayload({
+      type: "turn",
+      state: snapshot(),
+      player: 0,
+      valid_actions: [[cd(12, 3)], [cd(0, 0), cd(12, 3)]],
+      can_pass: true,
+      state_features: stateFeatures,
+      action_features: actionFeatures,
+    });
+    const view = new DataView(buf.buffer);
+    const offset = 508; // 500 header + 5 action bytes, padded to 4
+
+    expect(buf[2] & 16).toBe(16);
+    expect(buf.length).toBe(offset + (STATE_SIZE + 2 * ACTION_SIZE) * 4);
+    expect(view.getFloat32(offset, true)).toBe(0.5);
+    expect(view.getFloat32(offset + (STATE_SIZE - 1) * 4, true)).toBe(0.5);
+    const actionsOffset = offset + STATE_SIZE * 4;
+    expect(view.getFloat32(actionsOffset + (ACTION_SIZE + 3) * 4, true)).toBe(1);
+    expect(view.getFloat32(actionsOffset + 3 * 4, true)).toBe(0);
+  });
+
+  it("nests sub-frames in a batch", () => {
+    const buf = encodePayload({
+      type: "batch",
+      responses: [
+        { type: "game_over", win_order: [0, 1, 2, 3] },
+        { type: "error", message: "No active game" },
+      ],
+    });
+    const view = new DataView(buf.buffer);
+    expect(buf[0]).toBe(FRAME_BATCH);
+    expect(view.getUint16(1, true)).toBe(2);
+
+    const firstLen = view.getUint32(3, true);
+    expect(buf[7]).toBe(FRAME_GAME_OVER);
+    const secondOffset = 7 + firstLen;
+    const secondLen = view.getUint32(secondOffset, true);
+    expect(buf[secondOffset + 4]).toBe(FRAME_JSON);
+    const json = new TextDecoder().decode(
+      buf.slice(secondOffset + 5, secondOffset + 4 + secondLen),
+    );
+    expect(JSON.parse(json)).toEqual({ type: "error", message: "No active game" });
+  });
+});
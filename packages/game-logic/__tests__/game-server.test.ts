@@ -0,0 +1,314 @@
+import { describe, it, expect } from "vitest";
+import { spawn, type ChildProcessWithoutNullStreams } from "node:child_process";
+import { closeSync, openSync, readSync, rmSync, writeSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join } from "node:path";
+import { fileURLToPath } from "node:url";
+import { createInterface } from "node:readline";
+import { GameState } from "../src/game-state.js";
+import { choosePlay } from "../src/bot/bot-player.js";
+import type { CardData, GameStateSnapshot, PlayData } from "../src/types.js";
+import { FRAME_JSON, FRAME_TURN } from "../src/training/bridge-frames.js";
+import { SHM_HEADER_SIZE, SHM_MAGIC } from "../src/training/shm-transport.js";
+
+const SERVER = fileURLToPath(new URL("../src/training/game-server.ts", import.meta.url));
+
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+type Response = Record<string, any>;
+
+/** A game-server subprocess spoken to over its JSON-line pipes. */
+class Server {
+  private proc: ChildProcessWithoutNullStreams;
+  private lines: string[] = [];
+  private waiting: ((line: string) => void) | null = null;
+
+  constructor() {
+    this.proc = spawn(process.execPath, ["--import", "tsx", SERVER]);
+    createInterface({ input: this.proc.stdout }).on("line", (line) => {
+      if (this.waiting) {
+        const resolve = this.waiting;
+        this.waiting = null;
+        resolve(line);
+      } else {
+        this.lines.push(line);
+      }
+    });
+  }
+
+  async read(): Promise<Response> {
+    const line = this.lines.shift() ?? (await new Promise<string>((r) => (this.waiting = r)));
+    return JSON.parse(line);
+  }
+
+  async send(cmd: Response): Promise<Response> {
+    this.proc.stdin.write(JSON.stringify(cmd) + "\n");
+    return this.read();
+  }
+
+  close(): void {
+    this.proc.kill();
+  }
+}
+
+async function withServer(test: (server: Server) => Promise<void>): Promise<void> {
+  const server = new Server();
+  try {
+    expect((await server.read()).type).toBe("ready");
+    await test(server);
+  } finally {
+    server.close();
+  }
+}
+
+/** Step with the first valid play each turn until game over; returns the turns seen. */
+async function playOut(server: Server, turn: Response, gameId?: number): Promise<Response[]> {
+  const turns: Response[] = [];
+  while (turn.type !== "game_over") {
+    expect(turn.type).not.toBe("error");
+    turns.push(turn);
+    turn = await server.send({ cmd: "step", game_id: gameId, action_index: 0 });
+  }
+  return turns;
+}
+
+const values = (cards: CardData[]) => cards.map((c) => c.value).sort((a, b) => a - b);
+
+/** Delta turn folded into the previous full state (as game_bridge.SnapshotTracker does). */
+function applyDelta(prev: GameStateSnapshot, delta: Response): GameStateSnapshot {
+  const hands = [...prev.hands];
+  const played = [...prev.cardsPlayedByPlayer!];
+  const combos = [...prev.combosPlayedByPlayer!];
+  let lastPlay: PlayData | null = prev.lastPlay;
+  let lastPlayBy = prev.lastPlayBy;
+  for (const event of delta.events) {
+    if (event === "round_reset") {
+      lastPlay = null;
+      lastPlayBy = -1;
+      continue;
+    }
+    if (event.play === "pass") continue;
+    const p: number = event.player;
+    const gone = new Set(event.play.cards.map((c: CardData) => c.value));
+    hands[p] = hands[p].filter((c) => !gone.has(c.value));
+    played[p] = [...played[p], ...event.play.cards];
+    combos[p] = { ...combos[p], [event.play.combo]: (combos[p][event.play.combo] ?? 0) + 1 };
+    lastPlay = event.play;
+    lastPlayBy = p;
+  }
+  return {
+    hands,
+    currentPlayer: delta.player,
+    lastPlay,
+    lastPlayBy,
+    passedPlayers: delta.passed_players,
+    winOrder: delta.win_order,
+    playersInGame: delta.players_in_game,
+    cardsPlayedByPlayer: played,
+    combosPlayedByPlayer: combos,
+  };
+}
+
+function comparable(snapshot: GameStateSnapshot) {
+  return { ...snapshot, hands: snapshot.hands.map(values) };
+}
+
+describe("game server sessions", () => {
+  it("keeps interleaved games apart", () =>
+    withServer(async (server) => {
+      const turns: Response[] = [
+        await server.send({ cmd: "new_game", game_id: 1, greedy_seats: [1, 2, 3] }),
+        await server.send({ cmd: "new_game", game_id: 2, greedy_seats: [1, 2, 3] }),
+      ];
+      const played = [0, 0];
+      while (turns.some((t) => t.type === "turn")) {
+        for (const id of [0, 1]) {
+          const turn = turns[id];
+          if (turn.type !== "turn") continue;
+          const { hands, cardsPlayedByPlayer } = turn.state as GameStateSnapshot;
+          const seen = [...hands.flat(), ...cardsPlayedByPlayer!.flat()].map((c) => c.value);
+          expect(seen.sort((a, b) => a - b)).toEqual([...Array(52).keys()]);
+          const count = cardsPlayedByPlayer!.flat().length;
+          expect(count).toBeGreaterThanOrEqual(played[id]);
+          played[id] = count;
+          turns[id] = await server.send({ cmd: "step", game_id: id + 1, action_index: 0 });
+        }
+      }
+      for (const turn of turns) {
+        expect(turn.type).toBe("game_over");
+        expect([...turn.win_order].sort()).toEqual([0, 1, 2, 3]);
+      }
+    }));
+});
+
+describe("game server seat move record", () => {
+  it("lists every random seat move", () =>
+    withServer(async (server) => {
+      await server.send({ cmd: "configure", record_seats: true });
+      let turn = await server.send({ cmd: "new_game", random_seats: [1, 2, 3] });
+      const played: number[][] = [[], [], [], []];
+      let recorded = 0;
+      while (turn.type === "turn") {
+        expect(turn.forced).toBe(undefined);
+        for (const move of turn.forced_moves) {
+          expect(move.seat).toBe(true);
+          expect([1, 2, 3]).toContain(move.player);
+          played[move.player].push(...move.cards);
+          recorded++;
+        }
+        const state = turn.state as GameStateSnapshot;
+        for (const p of [1, 2, 3]) {
+          expect(values(state.cardsPlayedByPlayer![p])).toEqual(played[p].sort((a, b) => a - b));
+        }
+        // action_index 0 is the first valid play, or a pass if there is none
+        played[0].push(...(turn.valid_actions[0] ?? []).map((c: CardData) => c.value));
+        turn = await server.send({ cmd: "step", action_index: 0 });
+      }
+      expect(turn.type).toBe("game_over");
+      expect(recorded).toBeGreaterThan(0);
+      // Moves after our last turn come with game_over: every finisher's hand is accounted for
+      expect(turn.forced).toBe(0);
+      for (const move of turn.forced_moves) played[move.player].push(...move.cards);
+      for (const p of turn.win_order.slice(0, 3)) expect(played[p].length).toBe(13);
+    }));
+});
+
+describe("game server delta turns", () => {
+  it("rebuilds the full snapshot from turn deltas", () =>
+    withServer(async (server) => {
+      await server.send({ cmd: "configure", delta: true });
+      const greedy = new Set([1, 2, 3]);
+      let turn = await server.send({
+        cmd: "new_game",
+        game_id: 7,
+        greedy_seats: [...greedy],
+        projection: { no_combo_map: true },
+      });
+      expect(turn.type).toBe("turn");
+      expect(turn.game_id).toBe("7");
+      let state: GameStateSnapshot = turn.state;
+      // Replays the same moves locally: our action, then the greedy seats
+      const replica = GameState.fromSnapshot(state);
+      let deltas = 0;
+      for (;;) {
+        const player = replica.currentPlayer;
+        // action_index 0 is the first valid play, or a pass if there is none
+        if (turn.valid_actions.length > 0) {
+          const action = turn.valid_actions[0].map((c: CardData) => c.value);
+          replica.playCards(
+            player,
+            replica.getHand(player).filter((c) => action.includes(c.value)),
+          );
+        } else {
+          replica.passTurn(player);
+        }
+        while (!replica.isGameOver() && greedy.has(replica.currentPlayer)) {
+          const p = replica.currentPlayer;
+          const cards = choosePlay(replica.getHand(p), replica.lastPlay);
+          if (cards.length > 0) replica.playCards(p, cards);
+          else replica.passTurn(p);
+        }
+
+        turn = await server.send({ cmd: "step", game_id: 7, action_index: 0 });
+        if (turn.type === "game_over") break;
+        expect(turn.type).toBe("turn_delta");
+        expect(turn.state).toBe(undefined);
+        state = applyDelta(state, turn);
+        expect(comparable(state)).toEqual(comparable(replica.toSnapshot()));
+        deltas++;
+      }
+      expect(turn.win_order).toEqual(replica.winOrder);
+      expect(deltas).toBeGreaterThan(0);
+    }));
+});
+
+describe("game server prefetch", () => {
+  it("takes the prefetched game only for the same seats", () =>
+    withServer(async (server) => {
+      await server.send({ cmd: "configure", prefetch: true });
+      const stats = () => server.send({ cmd: "stats" });
+
+      await playOut(server, await server.send({ cmd: "new_game", greedy_seats: [1, 3] }));
+      expect((await stats()).prefetched).toBe(1);
+
+      // Seat lists are sets: [3, 1] matches a game prefetched for [1, 3]
+      let turn = await server.send({ cmd: "new_game", greedy_seats: [3, 1] });
+      expect(turn.type).toBe("turn");
+      expect([0, 2]).toContain(turn.player);
+      expect((await stats()).prefetch_hits).toBe(1);
+
+      await playOut(server, turn);
+      expect((await stats()).prefetched).toBe(2);
+      turn = await server.send({ cmd: "new_game", greedy_seats: [1, 2, 3] });
+      expect(turn.player).toBe(0);
+      const after = await stats();
+      expect(after.prefetch_hits).toBe(1);
+      expect(after.commands.new_game.count).toBe(3);
+    }));
+});
+
+describe("game server shm transport", () => {
+  const SLOTS = 2;
+  const SLOT_SIZE = 1 << 16;
+
+  it("answers a request through the shared ring", () => {
+    const path = join(tmpdir(), `game-server-test-${process.pid}.shm`);
+    const fd = openSync(path, "w+");
+    const word = Buffer.alloc(4);
+    const readWord = (offset: number) => {
+      readSync(fd, word, 0, 4, offset);
+      return word.readUInt32LE(0);
+    };
+    const writeWord = (offset: number, value: number) => {
+      word.writeUInt32LE(value, 0);
+      writeSync(fd, word, 0, 4, offset);
+    };
+    const header = Buffer.alloc(SHM_HEADER_SIZE);
+    header.writeUInt32LE(SHM_MAGIC, 0);
+    header.writeUInt32LE(SLOTS, 4);
+    header.writeUInt32LE(SLOT_SIZE, 8);
+    writeSync(fd, header, 0, header.length, 0);
+    writeSync(fd, Buffer.alloc(1), 0, 1, SHM_HEADER_SIZE + 2 * SLOTS * SLOT_SIZE - 1);
+
+    let seq = 0;
+    const request = async (cmd: Response): Promise<Buffer> => {
+      const slot = seq % SLOTS;
+      const json = Buffer.from(JSON.stringify(cmd));
+      writeWord(SHM_HEADER_SIZE + slot * SLOT_SIZE, json.length);
+      writeSync(fd, json, 0, json.length, SHM_HEADER_SIZE + slot * SLOT_SIZE + 4);
+      writeWord(12, ++seq);
+      while (readWord(16) !== seq) await new Promise((r) => setTimeout(r, 1));
+      const offset = SHM_HEADER_SIZE + (SLOTS + slot) * SLOT_SIZE;
+      const payload = Buffer.alloc(readWord(offset));
+      readSync(fd, payload, 0, payload.length, offset + 4);
+      return payload;
+    };
+
+    return withServer(async (server) => {
+      const ack = await server.send({ cmd: "configure", transport: "shm", path });
+      expect(ack).toEqual({
+        type: "configured",
+        protocol: "binary",
+        encode: false,
+        delta: false,
+        prefetch: false,
+        record_seats: false,
+        transport: "shm",
+      });
+
+      const turn = await request({ cmd: "new_game", greedy_seats: [1, 2, 3] });
+      expect(turn[0]).toBe(FRAME_TURN);
+      expect(turn[1]).toBe(0);
+
+      // Wraps around to slot 0 on the third request
+      await request({ cmd: "step", action_index: 0 });
+      const stats = await request({ cmd: "stats" });
+      expect(stats[0]).toBe(FRAME_JSON);
+      const body = JSON.parse(stats.subarray(1).toString("utf8"));
+      expect(body.commands.new_game.count).toBe(1);
+      expect(body.commands.step.count).toBe(1);
+    }).finally(() => {
+      closeSync(fd);
+      rmSync(path, { force: true });
+    });
+  });
+});
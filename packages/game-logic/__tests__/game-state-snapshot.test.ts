@@ -3,6 +3,31 @@ import { Card, Rank, Suit } from "../src/card.js";
 import { Combo, Play } from "../src/play.js";
 import { GameState } from "../src/game-state.js";
 import { deal } from "../src/deck.js";
+import { choosePlay } from "../src/bot/bot-player.js";
+import { seededRandom } from "../src/training/simulate.js";
+
+/** Greedy moves for the current player; false once the game is over */
+function step(game: GameState): boolean {
+  if (game.isGameOver()) return false;
+  const player = game.currentPlayer;
+  const cards = choosePlay(game.getHand(player), game.lastPlay);
+  if (cards.length > 0) game.playCards(player, cards);
+  else game.passTurn(player);
+  return true;
+}
+
+/** cardsPlayedByPlayer / combosPlayedByPlayer rebuilt from the play log */
+function fromPlayLog(game: GameState) {
+  const cards: number[][] = [[], [], [], []];
+  const combos: Record<string, number>[] = [{}, {}, {}, {}];
+  for (const entry of game.playLog) {
+    if (entry === "round_reset" || entry.play === "pass") continue;
+    cards[entry.player].push(...entry.play.cards.map((c) => c.value));
+    const name = Combo[entry.play.combo];
+    combos[entry.player][name] = (combos[entry.player][name] ?? 0) + 1;
+  }
+  return { cards, combos };
+}
 
 describe("GameState snapshot round-trip", () => {
   it("round-trips a fresh game", () => {
@@ -100,4 +125,56 @@ describe("GameState snapshot round-trip", () => {
     const result = restored.playCards(player, [card]);
     expect(result.valid).toBe(true);
   });
+
+  it("keeps played cards and combo counts in step with the play log", () => {
+    for (let seed = 0; seed < 10; seed++) {
+      const game = new GameState(deal(4, seededRandom(seed)));
+      do {
+        const snapshot = game.toSnapshot();
+        const expected = fromPlayLog(game);
+        expect(snapshot.cardsPlayedByPlayer!.map((p) => p.map((c) => c.value))).toEqual(
+          expected.cards,
+        );
+        expect(snapshot.combosPlayedByPlayer).toEqual(expected.combos);
+        expect(snapshot.hands.map((h) => h.map((c) => c.value))).toEqual(
+          game.hands.map((h) => h.map((c) => c.value)),
+        );
+      } while (step(game));
+    }
+  });
+
+  it("shares unchanged structure with earlier snapshots", () => {
+    const game = new GameState(deal(4, seededRandom(7)));
+    const player = game.currentPlayer;
+    game.playCards(player, [game.getHand(player)[0]]);
+    const before = game.toSnapshot();
+    const next = game.currentPlayer;
+    game.passTurn(next);
+    const after = game.toSnapshot();
+
+    for (let p = 0; p < 4; p++) {
+      expect(after.hands[p]).toBe(before.hands[p]);
+      expect(after.cardsPlayedByPlayer![p]).toBe(before.cardsPlayedByPlayer![p]);
+      expect(after.combosPlayedByPlayer![p]).toBe(before.combosPlayedByPlayer![p]);
+    }
+    expect(after.lastPlay).toBe(before.lastPlay);
+
+    // Later plays replace entries instead of mutating the ones already handed out
+    const mover = game.currentPlayer;
+    const played = before.cardsPlayedByPlayer![mover].length;
+    const handSize = before.hands[mover].length;
+    while (fromPlayLog(game).cards[mover].length === played && step(game));
+    expect(game.toSnapshot().cardsPlayedByPlayer![mover].length).toBeGreaterThan(played);
+    expect(before.cardsPlayedByPlayer![mover]).toHaveLength(played);
+    expect(before.hands[mover]).toHaveLength(handSize);
+  });
+
+  it("round-trips played cards and combo counts", () => {
+    const game = new GameState(deal(4, seededRandom(3)));
+    for (let i = 0; i < 12; i++) step(game);
+    const snapshot = game.toSnapshot();
+    const restored = GameState.fromSnapshot(snapshot).toSnapshot();
+    expect(restored.cardsPlayedByPlayer).toEqual(snapshot.cardsPlayedByPlayer);
+    expect(restored.combosPlayedByPlayer).toEqual(snapshot.combosPlayedByPlayer);
+  });
 });
@@ -0,0 +1,120 @@
+import { describe, it, expect } from "vitest";
+import { Card, Rank } from "../src/card.js";
+import { Combo, Play } from "../src/play.js";
+import { validate } from "../src/move-validator.js";
+import { evaluate, getAllPlays, type EvaluationResult } from "../src/bot/hand-evaluator.js";
+import { deal } from "../src/deck.js";
+import { seededRandom } from "../src/training/simulate.js";
+
+/**
+ * Unpruned reference: every candidate of every category is generated and
+ * checked with validate(), as evaluate() did before it narrowed categories
+ * by lastPlay.
+ */
+function referenceEvaluate(hand: Card[], lastPlay: Play | null): EvaluationResult {
+  const byRank = new Map<Rank, Card[]>();
+  for (const card of hand) {
+    const existing = byRank.get(card.rank);
+    if (existing) existing.push(card);
+    else byRank.set(card.rank, [card]);
+  }
+  const keep = (cards: Card[]) => validate(lastPlay, cards).valid;
+
+  const singles = hand.map((card) => [card]).filter(keep);
+  const pairs: Card[][] = [];
+  const triples: Card[][] = [];
+  const quads: Card[][] = [];
+  for (const [, cards] of byRank) {
+    for (let i = 0; i < cards.length; i++) {
+      for (let j = i + 1; j < cards.length; j++) {
+        pairs.push([cards[i], cards[j]]);
+        for (let k = j + 1; k < cards.length; k++) {
+          triples.push([cards[i], cards[j], cards[k]]);
+        }
+      }
+    }
+    if (cards.length === 4) quads.push([...cards]);
+  }
+
+  const runs: Card[][] = [];
+  const sorted = hand.filter((c) => c.rank !== Rank.TWO).sort(Card.compare);
+  const runLengths =
+    lastPlay?.combo === Combo.RUN ? [lastPlay.cards.length] : sorted.map((_, i) => i + 1);
+  for (const length of runLengths) {
+    if (length < 3) continue;
+    for (let startIdx = 0; startIdx <= sorted.length - length; startIdx++) {
+      const run: Card[] = [];
+      for (let i = startIdx; i < sorted.length && run.length < length; i++) {
+        const last = run[run.length - 1];
+        if (!last || sorted[i].rank === last.rank + 1) run.push(sorted[i]);
+        else if (sorted[i].rank !== last.rank) break;
+      }
+      if (run.length === length) runs.push(run);
+    }
+  }
+
+  const bombs: Card[][] = [];
+  const pairRanks = [...byRank.keys()].filter((r) => byRank.get(r)!.length >= 2).sort((a, b) => a - b);
+  for (let numPairs = 3; numPairs <= pairRanks.length; numPairs++) {
+    for (let startIdx = 0; startIdx <= pairRanks.length - numPairs; startIdx++) {
+      const ranks = pairRanks.slice(startIdx, startIdx + numPairs);
+      if (ranks.some((r, i) => i > 0 && ranks[i - 1] + 1 !== r)) continue;
+      bombs.push(ranks.flatMap((r) => byRank.get(r)!.slice(0, 2)));
+    }
+  }
+
+  return {
+    singles,
+    pairs: pairs.filter(keep),
+    triples: triples.filter(keep),
+    quads: quads.filter(keep),
+    runs: runs.filter(keep),
+    bombs: bombs.filter(keep),
+  };
+}
+
+const values = (result: EvaluationResult) =>
+  Object.fromEntries(
+    Object.entries(result).map(([key, plays]) => [key, plays.map((p: Card[]) => p.map((c) => c.value))]),
+  );
+
+const card = (value: number) => new Card(Math.floor(value / 4), value % 4);
+
+describe("evaluate", () => {
+  it("matches the unpruned reference on random hands and tables", () => {
+    const random = seededRandom(2024);
+    for (let round = 0; round < 150; round++) {
+      const hands = deal(4, random);
+      // Tables: opening, and plays another hand could make on an open table
+      const tables: (Play | null)[] = [null];
+      for (const cards of getAllPlays(referenceEvaluate(hands[1], null))) {
+        if (random() < 0.3) tables.push(validate(null, cards).play);
+      }
+      for (const lastPlay of tables) {
+        for (const size of [13, 7, 3]) {
+          const hand = hands[0].slice(0, size);
+          expect(values(evaluate(hand, lastPlay))).toEqual(values(referenceEvaluate(hand, lastPlay)));
+        }
+      }
+    }
+  });
+
+  it("matches the reference on 2s and bombs", () => {
+    // Double-heavy hand: quads, a four-pair bomb and a long run
+    const hand = [0, 1, 2, 3, 4, 5, 8, 9, 12, 13, 16, 20, 24, 28, 48, 49, 50, 51].map(card);
+    const tables = [
+      new Play(Combo.SINGLE, [card(51)]),
+      new Play(Combo.PAIR, [card(48), card(50)]),
+      new Play(Combo.TRIPLE, [card(48), card(49), card(50)]),
+      new Play(Combo.BOMB, [0, 1, 4, 5, 8, 9].map(card)),
+      new Play(Combo.RUN, [0, 4, 8, 12].map(card)),
+      new Play(Combo.RUN, [1, 5, 9].map(card), true),
+      new Play(Combo.QUAD, [0, 1, 2, 3].map(card)),
+    ];
+    for (const lastPlay of tables) {
+      expect(values(evaluate(hand, lastPlay))).toEqual(values(referenceEvaluate(hand, lastPlay)));
+    }
+    expect(evaluate(hand, tables[0]).quads.length).toBeGreaterThan(0);
+    expect(evaluate(hand, tables[1]).bombs.length).toBe(1);
+  });
+});
@@ -0,0 +1,66 @@
+import { describe, it, expect } from "vitest";
+import { choosePlay } from "../src/bot/bot-player.js";
+import { deal } from "../src/deck.js";
+import { seededRandom, simulate, type SeatPolicy } from "../src/training/simulate.js";
+
+const greedy: SeatPolicy = (game, player) => choosePlay(game.getHand(player), game.lastPlay);
+
+describe("simulate", () => {
+  it("seeded deals are reproducible", () => {
+    const a = deal(4, seededRandom(42)).map((h) => h.map((c) => c.value));
+    const b = deal(4, seededRandom(42)).map((h) => h.map((c) => c.value));
+    const other = deal(4, seededRandom(43)).map((h) => h.map((c) => c.value));
+    expect(a).toEqual(b);
+    expect(a).not.toEqual(other);
+  });
+
+  it("counts every finishing position once per game", async () => {
+    const result = await simulate({
+      policies: [greedy, greedy, greedy, greedy],
+      games: 20,
+      shuffleSeats: true,
+      random: seededRandom(1),
+    });
+    expect(result.games).toBe(20);
+    for (const slot of result.positions) {
+      expect(slot.reduce((a, b) => a + b, 0)).toBe(20);
+    }
+    for (let k = 0; k < 4; k++) {
+      expect(result.positions.reduce((sum, slot) => sum + slot[k], 0)).toBe(20);
+    }
+    const totalPpg = result.ppg.reduce((a, b) => a + b, 0);
+    expect(totalPpg).toBeCloseTo(7);
+  });
+
+  it("is deterministic for a seed", async () => {
+    const run = () =>
+      simulate({
+        policies: [greedy, greedy, greedy, greedy],
+        games: 10,
+        shuffleSeats: true,
+        random: seededRandom(7),
+      });
+    expect(await run()).toEqual(await run());
+  });
+
+  it("plays tournaments to the target score", async () => {
+    const seen: number[] = [];
+    const tracking: SeatPolicy = (game, player, tourney) => {
+      seen.push(tourney!.targetScore);
+      return greedy(game, player, tourney);
+    };
+    const result = await simulate({
+      policies: [tracking, greedy, greedy, greedy],
+      tourneys: 3,
+      targetScore: 10,
+      random: seededRandom(3),
+    });
+    expect(result.tourneys).toBe(3);
+    expect(result.games).toBeGreaterThanOrEqual(3 * 3);
+    expect(seen.every((t) => t === 10)).toBe(true);
+    for (let k = 0; k < 4; k++) {
+      expect(result.tourney_positions.reduce((sum, slot) => sum + slot[k], 0)).toBe(3);
+    }
+    expect(result.tourney_scores.reduce((a, b) => a + b, 0)).toBeGreaterThanOrEqual(10);
+  });
+});
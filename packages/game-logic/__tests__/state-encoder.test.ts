@@ -280,6 +280,21 @@ describe("encodeState", () => {
     expect(result[ADVANTAGE_OFFSET + 2]).toBeCloseTo((10 - 0) / 13);
   });
 
+  it("reads opponent hand sizes from handSizes when hands are projected", () => {
+    const hands = [
+      Array.from({ length: 10 }, (_, i) => cd(i, 0)),
+      Array.from({ length: 4 }, (_, i) => cd(i, 1)),
+      Array.from({ length: 13 }, (_, i) => cd(i, 2)),
+      [],
+    ];
+    const full = encodeState(emptySnapshot({ hands }), 0);
+    const projected = encodeState(
+      emptySnapshot({ hands: [hands[0], [], [], []], handSizes: [10, 4, 13, 0] }),
+      0,
+    );
+    expect(Array.from(projected)).toEqual(Array.from(full));
+  });
+
   it("rotates relative hand advantage for different perspectives", () => {
     const snap = emptySnapshot({
       hands: [
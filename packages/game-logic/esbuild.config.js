@@ -0,0 +1,18 @@
+import { build } from "esbuild";
+
+// Single-file game server for the Python training bridge, run directly with
+// node (no yarn or tsx startup). game_bridge.py falls back to the TS source
+// when this bundle is older than src/.
+await build({
+  entryPoints: ["src/training/game-server.ts"],
+  outfile: "dist/bundle/game-server.mjs",
+  bundle: true,
+  platform: "node",
+  target: "node20",
+  format: "esm",
+  external: ["onnxruntime-node"], // native binaries, loaded only for model seats
+  minify: false,
+  sourcemap: true,
+});
+
+console.log("Built game server bundle: dist/bundle/game-server.mjs");
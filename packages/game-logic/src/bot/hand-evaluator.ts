@@ -1,6 +1,5 @@
 import { Card, Rank } from "../card.js";
 import { Combo, Play } from "../play.js";
-import { validate } from "../move-validator.js";
 
 export interface EvaluationResult {
   singles: Card[][];
@@ -36,36 +35,81 @@ function groupByRank(hand: Card[]): Map<Rank, Card[]> {
   return groups;
 }
 
-function findSingles(hand: Card[], lastPlay: Play | null): Card[][] {
+// ── Move tables ──────────────────────────────────────────────
+//
+// Run and bomb structure depends only on which ranks are held: runs take
+// one card of each held rank, bombs two of each paired rank, and neither
+// includes 2s. Streaks are looked up by that set of ranks instead of being
+// searched for, and candidates are filtered on their top card rather than
+// revalidated: evaluate() only generates lastPlay's own combo at its length
+// (or the chops), so beating it comes down to the top card and, for runs,
+// suitedness.
+
+/**
+ * Lowest ranks of every streak of n consecutive ranks, indexed by the set of
+ * ranks below the 2s (bit r for rank r), then by n. Filled on first use.
+ */
+const STREAK_STARTS: Rank[][][] = new Array(1 << Rank.TWO);
+
+function streakStarts(ranks: number): Rank[][] {
+  let starts = STREAK_STARTS[ranks];
+  if (starts) return starts;
+  const streak = new Array(Rank.TWO + 1).fill(0);
+  for (let rank = Rank.TWO - 1; rank >= 0; rank--) {
+    streak[rank] = (ranks >> rank) & 1 ? streak[rank + 1] + 1 : 0;
+  }
+  starts = [];
+  for (let n = 0; n <= Rank.TWO; n++) {
+    const ofLength: Rank[] = [];
+    for (let rank = 0; rank < Rank.TWO; rank++) {
+      if (streak[rank] >= n) ofLength.push(rank);
+    }
+    starts.push(ofLength);
+  }
+  STREAK_STARTS[ranks] = starts;
+  return starts;
+}
+
+/** Set of ranks below the 2s holding at least `minCards` cards. */
+function rankSet(byRank: Map<Rank, Card[]>, minCards: number): number {
+  let ranks = 0;
+  for (const [rank, cards] of byRank) {
+    if (rank !== Rank.TWO && cards.length >= minCards) ranks |= 1 << rank;
+  }
+  return ranks;
+}
+
+/** Whether a candidate's top card beats `floor` (-1 beats nothing, so anything goes). */
+function beats(cards: Card[], floor: number): boolean {
+  for (const card of cards) {
+    if (card.value > floor) return true;
+  }
+  return false;
+}
+
+function findSingles(hand: Card[], floor: number): Card[][] {
   const valid: Card[][] = [];
   for (const card of hand) {
-    const cards = [card];
-    if (validate(lastPlay, cards).valid) valid.push(cards);
+    if (card.value > floor) valid.push([card]);
   }
   return valid;
 }
 
-function findPairs(
-  byRank: Map<Rank, Card[]>,
-  lastPlay: Play | null,
-): Card[][] {
+function findPairs(byRank: Map<Rank, Card[]>, floor: number): Card[][] {
   const valid: Card[][] = [];
   for (const [, cardsOfRank] of byRank) {
     if (cardsOfRank.length < 2) continue;
     for (let i = 0; i < cardsOfRank.length; i++) {
       for (let j = i + 1; j < cardsOfRank.length; j++) {
         const cards = [cardsOfRank[i], cardsOfRank[j]];
-        if (validate(lastPlay, cards).valid) valid.push(cards);
+        if (beats(cards, floor)) valid.push(cards);
       }
     }
   }
   return valid;
 }
 
-function findTriples(
-  byRank: Map<Rank, Card[]>,
-  lastPlay: Play | null,
-): Card[][] {
+function findTriples(byRank: Map<Rank, Card[]>, floor: number): Card[][] {
   const valid: Card[][] = [];
   for (const [, cardsOfRank] of byRank) {
     if (cardsOfRank.length < 3) continue;
@@ -73,7 +117,7 @@ function findTriples(
       for (let j = i + 1; j < cardsOfRank.length; j++) {
         for (let k = j + 1; k < cardsOfRank.length; k++) {
           const cards = [cardsOfRank[i], cardsOfRank[j], cardsOfRank[k]];
-          if (validate(lastPlay, cards).valid) valid.push(cards);
+          if (beats(cards, floor)) valid.push(cards);
         }
       }
     }
@@ -81,57 +125,50 @@ function findTriples(
   return valid;
 }
 
-function findQuads(
-  byRank: Map<Rank, Card[]>,
-  lastPlay: Play | null,
-): Card[][] {
+function findQuads(byRank: Map<Rank, Card[]>, floor: number): Card[][] {
   const valid: Card[][] = [];
   for (const [, cardsOfRank] of byRank) {
     if (cardsOfRank.length !== 4) continue;
-    const cards = [...cardsOfRank];
-    if (validate(lastPlay, cards).valid) valid.push(cards);
+    if (beats(cardsOfRank, floor)) valid.push([...cardsOfRank]);
   }
   return valid;
 }
 
-function findRuns(hand: Card[], lastPlay: Play | null): Card[][] {
+/**
+ * Runs of `length` cards (or every length from 3 when opening), in order of
+ * length then start card. A run may start with any card of its lowest rank
+ * and continues with the lowest card of each following rank.
+ */
+function findRuns(
+  hand: Card[],
+  byRank: Map<Rank, Card[]>,
+  floor: number,
+  suited: boolean,
+  length?: number,
+): Card[][] {
   const valid: Card[][] = [];
 
-  // Filter out 2s
-  const eligible = hand.filter((c) => c.rank !== Rank.TWO);
-  if (eligible.length < 3) return valid;
-
-  const sorted = [...eligible].sort(Card.compare);
-
-  let minLength = 3;
-  let maxLength = sorted.length;
-
-  if (lastPlay && lastPlay.combo === Combo.RUN) {
-    minLength = lastPlay.cards.length;
-    maxLength = lastPlay.cards.length;
+  // Cards of each rank (2s excluded), ascending
+  const ofRank: Card[][] = [];
+  for (let rank = 0; rank < Rank.TWO; rank++) ofRank.push([]);
+  for (const card of [...hand].sort(Card.compare)) {
+    if (card.rank !== Rank.TWO) ofRank[card.rank].push(card);
   }
 
-  for (let length = minLength; length <= maxLength; length++) {
-    for (let startIdx = 0; startIdx <= sorted.length - length; startIdx++) {
-      const runCards: Card[] = [];
-
-      for (let i = startIdx; i < sorted.length; i++) {
-        const card = sorted[i];
-
-        if (runCards.length === 0) {
-          runCards.push(card);
-        } else if (card.rank === runCards[runCards.length - 1].rank + 1) {
-          runCards.push(card);
-        } else if (card.rank === runCards[runCards.length - 1].rank) {
-          continue; // Skip duplicates
-        } else {
-          break; // Gap in sequence
-        }
-
-        if (runCards.length === length) {
-          if (validate(lastPlay, runCards).valid) valid.push([...runCards]);
-          break;
-        }
+  const starts = streakStarts(rankSet(byRank, 1));
+  const minLength = length ?? 3;
+  const maxLength = length ?? Rank.TWO;
+  for (let len = minLength; len <= maxLength; len++) {
+    // No run of this length means none longer either
+    if (starts[len].length === 0) break;
+    for (const startRank of starts[len]) {
+      const rest: Card[] = [];
+      for (let rank = startRank + 1; rank < startRank + len; rank++) rest.push(ofRank[rank][0]);
+      // Every start card gives the same top card
+      if (rest[rest.length - 1].value <= floor) continue;
+      for (const start of ofRank[startRank]) {
+        const runCards = [start, ...rest];
+        if (!suited || Play.isSuited(runCards)) valid.push(runCards);
       }
     }
   }
@@ -139,58 +176,29 @@ function findRuns(hand: Card[], lastPlay: Play | null): Card[][] {
   return valid;
 }
 
-function findBombs(hand: Card[], lastPlay: Play | null): Card[][] {
+/**
+ * Bombs of `numPairs` consecutive pairs (or every size from 3), in order of
+ * size then lowest rank, using the first two cards held of each rank.
+ */
+function findBombs(
+  byRank: Map<Rank, Card[]>,
+  floor: number,
+  numPairs?: number,
+): Card[][] {
   const valid: Card[][] = [];
-  const byRank = groupByRank(hand);
 
-  // Filter to only ranks with pairs
-  const pairRanks: Rank[] = [];
-  for (const [rank, cards] of byRank) {
-    if (cards.length >= 2) pairRanks.push(rank);
-  }
-
-  if (pairRanks.length < 3) return valid;
-  pairRanks.sort((a, b) => a - b);
-
-  let minPairs = 3;
-  let maxPairs = pairRanks.length;
-
-  if (lastPlay && lastPlay.combo === Combo.BOMB) {
-    const requiredPairs = lastPlay.cards.length / 2;
-    minPairs = requiredPairs;
-    maxPairs = requiredPairs;
-  }
-
-  for (let numPairs = minPairs; numPairs <= maxPairs; numPairs++) {
-    for (
-      let startIdx = 0;
-      startIdx <= pairRanks.length - numPairs;
-      startIdx++
-    ) {
-      // Check consecutive ranks
-      let consecutive = true;
-      for (let i = 0; i < numPairs - 1; i++) {
-        if (pairRanks[startIdx + i] + 1 !== pairRanks[startIdx + i + 1]) {
-          consecutive = false;
-          break;
-        }
-      }
-      if (!consecutive) continue;
-
-      // Build bomb
+  const starts = streakStarts(rankSet(byRank, 2));
+  const minPairs = numPairs ?? 3;
+  const maxPairs = numPairs ?? Rank.TWO;
+  for (let n = minPairs; n <= maxPairs; n++) {
+    if (starts[n].length === 0) break;
+    for (const rank of starts[n]) {
       const bombCards: Card[] = [];
-      for (let i = 0; i < numPairs; i++) {
-        const rank = pairRanks[startIdx + i];
-        const cardsOfRank = byRank.get(rank)!;
+      for (let r = rank; r < rank + n; r++) {
+        const cardsOfRank = byRank.get(r)!;
         bombCards.push(cardsOfRank[0], cardsOfRank[1]);
       }
-
-      if (
-        bombCards.length === numPairs * 2 &&
-        validate(lastPlay, bombCards).valid
-      ) {
-        valid.push(bombCards);
-      }
+      if (beats(bombCards, floor)) valid.push(bombCards);
     }
   }
 
@@ -199,18 +207,45 @@ function findBombs(hand: Card[], lastPlay: Play | null): Card[][] {
 
 /**
  * Enumerate all valid plays from a hand given the current last play.
+ *
+ * Only the categories that can beat lastPlay are generated: its own combo
+ * (runs and bombs of its length), plus the chops when it is made of 2s — a
+ * quad on a single 2, n + 2 consecutive pairs on n 2s. Opening allows every
+ * combo except bombs.
  */
 export function evaluate(
   hand: Card[],
   lastPlay: Play | null,
 ): EvaluationResult {
   const byRank = groupByRank(hand);
+  if (lastPlay === null) {
+    return {
+      singles: findSingles(hand, -1),
+      pairs: findPairs(byRank, -1),
+      triples: findTriples(byRank, -1),
+      quads: findQuads(byRank, -1),
+      runs: findRuns(hand, byRank, -1, false),
+      bombs: [],
+    };
+  }
+
+  const combo = lastPlay.combo;
+  const size = lastPlay.cards.length;
+  const floor = lastPlay.value;
+  const twos = lastPlay.cards[0].rank === Rank.TWO;
+  let bombs: Card[][] = [];
+  if (combo === Combo.BOMB) bombs = findBombs(byRank, floor, size / 2);
+  else if (twos) bombs = findBombs(byRank, -1, size + 2);
+  let quads: Card[][] = [];
+  if (combo === Combo.QUAD) quads = findQuads(byRank, floor);
+  else if (twos && size === 1) quads = findQuads(byRank, -1);
+
   return {
-    singles: findSingles(hand, lastPlay),
-    pairs: findPairs(byRank, lastPlay),
-    triples: findTriples(byRank, lastPlay),
-    quads: findQuads(byRank, lastPlay),
-    runs: findRuns(hand, lastPlay),
-    bombs: findBombs(hand, lastPlay),
+    singles: combo === Combo.SINGLE ? findSingles(hand, floor) : [],
+    pairs: combo === Combo.PAIR ? findPairs(byRank, floor) : [],
+    triples: combo === Combo.TRIPLE ? findTriples(byRank, floor) : [],
+    quads,
+    runs: combo === Combo.RUN ? findRuns(hand, byRank, floor, lastPlay.suited, size) : [],
+    bombs,
   };
 }
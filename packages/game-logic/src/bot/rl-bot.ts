@@ -17,10 +17,14 @@ import { STATE_SIZE, ACTION_SIZE } from "../training/constants.js";
  * ONNX model output:
  *   - "scores": Float32[1, N] — score per candidate action
  *
- * The highest-scoring candidate is chosen.
+ * The highest-scoring candidate is chosen, or with `sample` a candidate is
+ * drawn from the softmax over the scores (as the training opponents do).
  */
 export class RLBot {
-  constructor(private session: InferenceSession) {}
+  constructor(
+    private session: InferenceSession,
+    private sample = false,
+  ) {}
 
   async choosePlay(
     hand: Card[],
@@ -68,10 +72,31 @@ export class RLBot {
     const scores = results["scores"].data as Float32Array;
 
     let bestIdx = 0;
-    for (let i = 1; i < N; i++) {
-      if (scores[i] > scores[bestIdx]) bestIdx = i;
+    if (this.sample) {
+      bestIdx = sampleSoftmax(scores, N);
+    } else {
+      for (let i = 1; i < N; i++) {
+        if (scores[i] > scores[bestIdx]) bestIdx = i;
+      }
     }
 
     return candidates[bestIdx].map((cd) => Card.fromValue(cd.value));
   }
 }
+
+function sampleSoftmax(scores: Float32Array, n: number): number {
+  let max = -Infinity;
+  for (let i = 0; i < n; i++) if (scores[i] > max) max = scores[i];
+  const weights = new Float64Array(n);
+  let total = 0;
+  for (let i = 0; i < n; i++) {
+    weights[i] = Math.exp(scores[i] - max);
+    total += weights[i];
+  }
+  let r = Math.random() * total;
+  for (let i = 0; i < n; i++) {
+    r -= weights[i];
+    if (r < 0) return i;
+  }
+  return n - 1;
+}
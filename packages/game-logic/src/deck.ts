@@ -15,18 +15,18 @@ export function generate(): Card[] {
   return cards;
 }
 
-/** Fisher-Yates shuffle (in-place, returns same array) */
-export function shuffle<T>(arr: T[]): T[] {
+/** Fisher-Yates shuffle (in-place, returns same array); `random` returns [0, 1) */
+export function shuffle<T>(arr: T[], random: () => number = Math.random): T[] {
   for (let i = arr.length - 1; i > 0; i--) {
-    const j = Math.floor(Math.random() * (i + 1));
+    const j = Math.floor(random() * (i + 1));
     [arr[i], arr[j]] = [arr[j], arr[i]];
   }
   return arr;
 }
 
 /** Deal cards to 4 players, returning sorted hands */
-export function deal(numPlayers = 4): Card[][] {
-  const cards = shuffle(generate());
+export function deal(numPlayers = 4, random: () => number = Math.random): Card[][] {
+  const cards = shuffle(generate(), random);
   const cardsPerPlayer = Math.floor(cards.length / numPlayers);
   const hands: Card[][] = [];
 
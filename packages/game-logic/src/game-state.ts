@@ -21,6 +21,21 @@ export type PlayLogEntry =
 
 const NUM_PLAYERS = 4;
 
+/** One shared CardData per card value; snapshots reference these instead of copying */
+const CARD_DATA: CardData[] = Array.from({ length: 52 }, (_, value) => ({
+  rank: value >> 2,
+  suit: value & 3,
+  value,
+}));
+
+function cardsToData(cards: Card[]): CardData[] {
+  return cards.map((c) => CARD_DATA[c.value]);
+}
+
+function emptyPerPlayer<T>(make: () => T): T[] {
+  return Array.from({ length: NUM_PLAYERS }, make);
+}
+
 export class GameState {
   hands: Card[][];
   lastPlay: Play | null = null;
@@ -33,6 +48,15 @@ export class GameState {
 
   private listeners: ((event: GameEvent) => void)[] = [];
 
+  // Snapshot aggregates, kept up to date by playCards. Each per-player entry
+  // is replaced rather than mutated, so consecutive snapshots share the
+  // entries of players who haven't played in between.
+  private cardsPlayed: CardData[][] = emptyPerPlayer(() => []);
+  private combosPlayed: Record<string, number>[] = emptyPerPlayer(() => ({}));
+  private handData: CardData[][] = [];
+  private handSource: { hand: Card[]; length: number }[] = [];
+  private lastPlayData: { play: Play; data: PlayData } | null = null;
+
   constructor(dealtHands: Card[][]) {
     this.hands = dealtHands;
     this.currentPlayer = findStartingPlayer(dealtHands);
@@ -88,6 +112,7 @@ export class GameState {
     this.lastPlay = result.play;
     this.lastPlayBy = playerId;
     this.playLog.push({ player: playerId, play: result.play! });
+    this.recordPlay(playerId, result.play!);
 
     // Check if player won (emptied hand)
     if (this.hands[playerId].length === 0) {
@@ -133,6 +158,19 @@ export class GameState {
     return true;
   }
 
+  private recordPlay(playerId: number, play: Play): void {
+    this.cardsPlayed[playerId] = [
+      ...this.cardsPlayed[playerId],
+      ...cardsToData(play.cards),
+    ];
+    const comboName = Combo[play.combo];
+    const combos = this.combosPlayed[playerId];
+    this.combosPlayed[playerId] = {
+      ...combos,
+      [comboName]: (combos[comboName] ?? 0) + 1,
+    };
+  }
+
   private playerWins(playerId: number): void {
     this.playersInGame[playerId] = false;
     this.playersInRound[playerId] = false;
@@ -227,55 +265,52 @@ export class GameState {
     return this.lastPlay === null;
   }
 
-  /** Serialize to a plain object for DynamoDB storage */
+  /**
+   * Serialize to a plain object for DynamoDB storage.
+   *
+   * Cost is independent of game length: per-player arrays and records are
+   * shared with earlier snapshots (and the game's own bookkeeping) until that
+   * player's hand or history changes, so treat snapshots as read-only.
+   */
   toSnapshot(): GameStateSnapshot {
-    // Derive cards played and combo counts per player from playLog
-    const cardsPlayedByPlayer: CardData[][] = Array.from(
-      { length: NUM_PLAYERS },
-      () => [],
-    );
-    const combosPlayedByPlayer: Record<string, number>[] = Array.from(
-      { length: NUM_PLAYERS },
-      () => ({}),
-    );
-    for (const entry of this.playLog) {
-      if (entry === "round_reset") continue;
-      if (entry.play === "pass") continue;
-      for (const card of entry.play.cards) {
-        cardsPlayedByPlayer[entry.player].push({
-          rank: card.rank,
-          suit: card.suit,
-          value: card.value,
-        });
-      }
-      const comboName = Combo[entry.play.combo];
-      combosPlayedByPlayer[entry.player][comboName] =
-        (combosPlayedByPlayer[entry.player][comboName] ?? 0) + 1;
-    }
-
     return {
-      hands: this.hands.map((hand) =>
-        hand.map((c): CardData => ({ rank: c.rank, suit: c.suit, value: c.value })),
-      ),
+      hands: this.hands.map((hand, p) => this.handSnapshot(hand, p)),
       currentPlayer: this.currentPlayer,
-      lastPlay: this.lastPlay
-        ? {
-            combo: Combo[this.lastPlay.combo],
-            cards: this.lastPlay.cards.map(
-              (c): CardData => ({ rank: c.rank, suit: c.suit, value: c.value }),
-            ),
-            suited: this.lastPlay.suited,
-          }
-        : null,
+      lastPlay: this.lastPlaySnapshot(),
       lastPlayBy: this.lastPlayBy,
       passedPlayers: this.playersInRound.map((inRound) => !inRound),
       winOrder: [...this.winOrder],
       playersInGame: [...this.playersInGame],
-      cardsPlayedByPlayer,
-      combosPlayedByPlayer,
+      cardsPlayedByPlayer: [...this.cardsPlayed],
+      combosPlayedByPlayer: [...this.combosPlayed],
     };
   }
 
+  private handSnapshot(hand: Card[], playerId: number): CardData[] {
+    const source = this.handSource[playerId];
+    if (source?.hand !== hand || source.length !== hand.length) {
+      this.handData[playerId] = cardsToData(hand);
+      this.handSource[playerId] = { hand, length: hand.length };
+    }
+    return this.handData[playerId];
+  }
+
+  private lastPlaySnapshot(): PlayData | null {
+    const play = this.lastPlay;
+    if (!play) return null;
+    if (this.lastPlayData?.play !== play) {
+      this.lastPlayData = {
+        play,
+        data: {
+          combo: Combo[play.combo],
+          cards: cardsToData(play.cards),
+          suited: play.suited,
+        },
+      };
+    }
+    return this.lastPlayData.data;
+  }
+
   /** Reconstruct a GameState from a snapshot (e.g. loaded from DynamoDB) */
   static fromSnapshot(snapshot: GameStateSnapshot): GameState {
     const hands = snapshot.hands.map((hand) =>
@@ -291,6 +326,17 @@ export class GameState {
     state.winOrder = [...snapshot.winOrder];
     state.playLog = [];
     state.listeners = [];
+    state.cardsPlayed = emptyPerPlayer(() => []);
+    state.combosPlayed = emptyPerPlayer(() => ({}));
+    state.handData = [];
+    state.handSource = [];
+    state.lastPlayData = null;
+    for (let p = 0; p < NUM_PLAYERS; p++) {
+      const played = snapshot.cardsPlayedByPlayer?.[p];
+      if (played) state.cardsPlayed[p] = played.map((c) => CARD_DATA[c.value]);
+      const combos = snapshot.combosPlayedByPlayer?.[p];
+      if (combos) state.combosPlayed[p] = { ...combos };
+    }
 
     if (snapshot.lastPlay) {
       const lp = snapshot.lastPlay;
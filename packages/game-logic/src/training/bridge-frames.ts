@@ -0,0 +1,305 @@
+/**
+ * Binary framing for the game-server bridge.
+ *
+ * Opt-in alternative to JSON lines, enabled with
+ * {"cmd": "configure", "protocol": "binary"}. Every frame is a little-endian
+ * u32 payload length followed by the payload; the first payload byte is the
+ * frame type.
+ *
+ * ⚠️  SYNC WARNING: The layout here must match _decode_payload() in
+ * packages/training/python/game_bridge.py. Any change must be made in both.
+ *
+ * Turn payload (TURN_HEADER_SIZE bytes, then the actions):
+ *   0    u8      type (FRAME_TURN)
+ *   1    u8      player
+ *   2    u8      flags: 1=can_pass, 2=has lastPlay, 4=lastPlay suited, 8=tourney context,
+ *                16=encoded features, 32=forced moves record
+ *   3    u8      currentPlayer
+ *   4    i8      lastPlayBy
+ *   5    u8      lastPlay combo (Combo enum index)
+ *   6    u8      passedPlayers bitmask
+ *   7    u8      playersInGame bitmask
+ *   8    u8      winOrder length
+ *   9    u8[4]   winOrder
+ *   13   u8      projection flags: 1=own hand only, 2=no handComboTypeMap,
+ *                4=valid actions as card values
+ *   14   u16     hand sizes, 4 bits per player (projection flag 1 only)
+ *   16   u64[4]  hand card masks (bit = card value); only the acting player's
+ *                under projection flag 1
+ *   48   u64[4]  cardsPlayedByPlayer masks
+ *   80   u64     lastPlay card mask
+ *   88   u8[28]  combosPlayedByPlayer counts (4 players × 7 combos)
+ *   116  u8[364] handComboTypeMap
+ *   480  i16[4]  tourney scores
+ *   488  u16     tourney targetScore
+ *   490  u16     tourney gameNumber
+ *   492  u16     tourney expectedTotalGames
+ *   494  u16     forced moves played since the previous response (auto_forced)
+ *   496  u16     number of valid actions
+ *   498  u16     total card count across actions
+ *   500  u8[n]   card count per action, then u8 card values for all actions
+ *
+ * The projection flags tell the decoder which fields the game's "projection"
+ * dropped; the layout itself never changes.
+ *
+ * With flag 32 (auto_forced "record" or configure "record_seats") the
+ * actions are followed by a u16 entry count and one entry per recorded move:
+ * u8 player | can_pass << 2 | seat << 3, u8 card count, u8 card values.
+ *
+ * With flag 16 (configure "encode": true) the actions (and forced moves) are
+ * followed by zero padding to a 4-byte boundary, then f32[STATE_SIZE] state features and
+ * f32[n × ACTION_SIZE] action features, copied from the encoders' Float32Arrays
+ * (little-endian on every platform we run on).
+ *
+ * Game over payload: u8 type, u8 winOrder length, u8[] winOrder. When the
+ * response carries a move record (moves played after the client's last
+ * turn), u16 forced and the record follow, laid out as in turn payloads.
+ * Batch payload: u8 type, u16 count, then count × (u32 length, payload).
+ * Anything else (errors, acks, tourney_over) is u8 FRAME_JSON + UTF-8 JSON.
+ */
+
+import { Combo } from "../play.js";
+import type { CardData, GameStateSnapshot } from "../types.js";
+import { ACTION_SIZE, STATE_SIZE } from "./constants.js";
+
+export const FRAME_TURN = 0;
+export const FRAME_GAME_OVER = 1;
+export const FRAME_BATCH = 2;
+export const FRAME_JSON = 255;
+
+export const TURN_HEADER_SIZE = 500;
+
+const NUM_COMBOS = 7;
+
+export interface ForcedMove {
+  player: number;
+  can_pass: boolean;
+  /** Card values played; empty for a pass */
+  cards: number[];
+  /** Played for a random or model seat rather than forced (record_seats) */
+  seat?: boolean;
+}
+
+interface TurnResponse {
+  type: "turn";
+  state: GameStateSnapshot;
+  player: number;
+  /** Card objects, or card values under the "values" projection */
+  valid_actions: CardData[][] | number[][];
+  can_pass: boolean;
+  forced?: number;
+  forced_moves?: ForcedMove[];
+  state_features?: Float32Array;
+  action_features?: Float32Array;
+}
+
+interface GameOverResponse {
+  type: "game_over";
+  win_order: number[];
+  forced?: number;
+  forced_moves?: ForcedMove[];
+}
+
+interface BatchResponse {
+  type: "batch";
+  responses: unknown[];
+}
+
+function writeMask(view: DataView, offset: number, cards: CardData[]): void {
+  let lo = 0;
+  let hi = 0;
+  for (const card of cards) {
+    if (card.value < 32) lo |= 1 << card.value;
+    else hi |= 1 << (card.value - 32);
+  }
+  view.setUint32(offset, lo >>> 0, true);
+  view.setUint32(offset + 4, hi >>> 0, true);
+}
+
+function bitmask(flags: boolean[]): number {
+  let mask = 0;
+  for (let i = 0; i < flags.length; i++) {
+    if (flags[i]) mask |= 1 << i;
+  }
+  return mask;
+}
+
+function cardValue(card: CardData | number): number {
+  return typeof card === "number" ? card : card.value;
+}
+
+function recordSize(moves: ForcedMove[] | undefined): number {
+  let size = moves ? 2 : 0;
+  for (const move of moves ?? []) size += 2 + move.cards.length;
+  return size;
+}
+
+/** Write a move record (u16 count, then the entries) at offset; returns the end offset. */
+function writeRecord(buf: Uint8Array, offset: number, moves: ForcedMove[]): number {
+  new DataView(buf.buffer, buf.byteOffset).setUint16(offset, moves.length, true);
+  offset += 2;
+  for (const move of moves) {
+    buf[offset++] = move.player | (move.can_pass ? 4 : 0) | (move.seat ? 8 : 0);
+    buf[offset++] = move.cards.length;
+    buf.set(move.cards, offset);
+    offset += move.cards.length;
+  }
+  return offset;
+}
+
+function floatBytes(arr: Float32Array): Uint8Array {
+  return new Uint8Array(arr.buffer, arr.byteOffset, arr.byteLength);
+}
+
+function encodeTurn(resp: TurnResponse): Uint8Array {
+  const { state, valid_actions: actions } = resp;
+  let cardCount = 0;
+  for (const action of actions) cardCount += action.length;
+
+  const forcedMoves = resp.forced_moves;
+  const actionsEnd = TURN_HEADER_SIZE + actions.length + cardCount + recordSize(forcedMoves);
+  const stateFeatures = resp.state_features;
+  const actionFeatures = resp.action_features;
+  const hasFeatures = stateFeatures !== undefined && actionFeatures !== undefined;
+  const featuresOffset = (actionsEnd + 3) & ~3;
+  const size = hasFeatures
+    ? featuresOffset + (STATE_SIZE + actions.length * ACTION_SIZE) * 4
+    : actionsEnd;
+
+  const buf = new Uint8Array(size);
+  const view = new DataView(buf.buffer);
+
+  let projection = 0;
+  if (state.handSizes) projection |= 1;
+  if (!state.handComboTypeMap) projection |= 2;
+  if (actions.some((action) => typeof action[0] === "number")) projection |= 4;
+
+  let flags = 0;
+  if (resp.can_pass) flags |= 1;
+  if (state.lastPlay) flags |= 2;
+  if (state.lastPlay?.suited) flags |= 4;
+  if (state.tourneyContext) flags |= 8;
+  if (hasFeatures) flags |= 16;
+  if (forcedMoves) flags |= 32;
+
+  buf[0] = FRAME_TURN;
+  buf[1] = resp.player;
+  buf[2] = flags;
+  buf[3] = state.currentPlayer;
+  view.setInt8(4, state.lastPlayBy);
+  buf[5] = state.lastPlay
+    ? Combo[state.lastPlay.combo as keyof typeof Combo]
+    : Combo.INVALID;
+  buf[6] = bitmask(state.passedPlayers);
+  buf[7] = bitmask(state.playersInGame);
+  buf[8] = state.winOrder.length;
+  for (let i = 0; i < state.winOrder.length; i++) buf[9 + i] = state.winOrder[i];
+  buf[13] = projection;
+  if (state.handSizes) {
+    let sizes = 0;
+    for (let p = 0; p < 4; p++) sizes |= state.handSizes[p] << (p * 4);
+    view.setUint16(14, sizes, true);
+  }
+
+  for (let p = 0; p < 4; p++) {
+    writeMask(view, 16 + p * 8, state.hands[p]);
+    writeMask(view, 48 + p * 8, state.cardsPlayedByPlayer?.[p] ?? []);
+  }
+  if (state.lastPlay) writeMask(view, 80, state.lastPlay.cards);
+
+  const combos = state.combosPlayedByPlayer;
+  if (combos) {
+    for (let p = 0; p < 4; p++) {
+      for (let c = 0; c < NUM_COMBOS; c++) {
+        buf[88 + p * NUM_COMBOS + c] = Math.min(combos[p][Combo[c]] ?? 0, 255);
+      }
+    }
+  }
+
+  const comboTypeMap = state.handComboTypeMap;
+  if (comboTypeMap) {
+    for (let i = 0; i < comboTypeMap.length; i++) {
+      buf[116 + i] = Math.min(comboTypeMap[i], 255);
+    }
+  }
+
+  const tourney = state.tourneyContext;
+  if (tourney) {
+    for (let p = 0; p < 4; p++) view.setInt16(480 + p * 2, tourney.scores[p], true);
+    view.setUint16(488, tourney.targetScore, true);
+    view.setUint16(490, tourney.gameNumber, true);
+    view.setUint16(492, tourney.expectedTotalGames, true);
+  }
+
+  view.setUint16(494, resp.forced ?? 0, true);
+  view.setUint16(496, actions.length, true);
+  view.setUint16(498, cardCount, true);
+  let lenOffset = TURN_HEADER_SIZE;
+  let cardOffset = TURN_HEADER_SIZE + actions.length;
+  for (const action of actions) {
+    buf[lenOffset++] = action.length;
+    for (const card of action) buf[cardOffset++] = cardValue(card);
+  }
+  if (forcedMoves) writeRecord(buf, cardOffset, forcedMoves);
+
+  if (hasFeatures) {
+    buf.set(floatBytes(stateFeatures), featuresOffset);
+    buf.set(floatBytes(actionFeatures), featuresOffset + STATE_SIZE * 4);
+  }
+  return buf;
+}
+
+function encodeGameOver(resp: GameOverResponse): Uint8Array {
+  const forcedMoves = resp.forced_moves;
+  const end = 2 + resp.win_order.length;
+  const buf = new Uint8Array(end + (forcedMoves ? 2 + recordSize(forcedMoves) : 0));
+  buf[0] = FRAME_GAME_OVER;
+  buf[1] = resp.win_order.length;
+  buf.set(resp.win_order, 2);
+  if (forcedMoves) {
+    new DataView(buf.buffer).setUint16(end, resp.forced ?? 0, true);
+    writeRecord(buf, end + 2, forcedMoves);
+  }
+  return buf;
+}
+
+function encodeBatch(resp: BatchResponse): Uint8Array {
+  const parts = resp.responses.map(encodePayload);
+  let size = 3;
+  for (const part of parts) size += 4 + part.length;
+
+  const buf = new Uint8Array(size);
+  const view = new DataView(buf.buffer);
+  buf[0] = FRAME_BATCH;
+  view.setUint16(1, parts.length, true);
+  let offset = 3;
+  for (const part of parts) {
+    view.setUint32(offset, part.length, true);
+    buf.set(part, offset + 4);
+    offset += 4 + part.length;
+  }
+  return buf;
+}
+
+/** Encode a server response object as a binary payload (without the length prefix). */
+export function encodePayload(resp: unknown): Uint8Array {
+  const type = (resp as { type: string }).type;
+  if (type === "turn") return encodeTurn(resp as TurnResponse);
+  if (type === "game_over") return encodeGameOver(resp as GameOverResponse);
+  if (type === "batch") return encodeBatch(resp as BatchResponse);
+
+  const json = new TextEncoder().encode(JSON.stringify(resp));
+  const buf = new Uint8Array(1 + json.length);
+  buf[0] = FRAME_JSON;
+  buf.set(json, 1);
+  return buf;
+}
+
+/** Encode a server response object as a length-prefixed frame. */
+export function encodeFrame(resp: unknown): Uint8Array {
+  const payload = encodePayload(resp);
+  const frame = new Uint8Array(4 + payload.length);
+  new DataView(frame.buffer).setUint32(0, payload.length, true);
+  frame.set(payload, 4);
+  return frame;
+}
@@ -5,8 +5,14 @@
  * Communicates via JSON lines over stdin/stdout.
  * Python sends commands, TS responds with game state.
  *
+ * Run from source with `yarn workspace @thirteen/game-logic game-server`, or
+ * bundle it with `build:game-server` and run dist/bundle/game-server.mjs with
+ * node to skip yarn and tsx startup.
+ *
  * Protocol:
- *   → {"cmd": "new_game"}
+ *   ← {"type": "ready"}  (once, at startup)
+ *
+ *   → {"cmd": "new_game", "greedy_seats": [1], "random_seats": [3]}
  *   ← {"type": "turn", "state": <snapshot>, "player": 2, "valid_actions": [[cards]...], "can_pass": false}
  *
  *   → {"cmd": "step", "action_index": 5}
@@ -14,6 +20,84 @@
  *
  *   → {"cmd": "quit"}
  *   (process exits)
+ *
+ * Forced moves: with "auto_forced": true on new_game / new_tourney /
+ * next_game (or a step, which changes it for the rest of the game), moves
+ * with a single legal option — usually a pass with nothing playable — are
+ * also played server-side for the client's seats. Turn responses carry
+ * "forced", the number played since the previous response; with
+ * "auto_forced": "record" they also carry "forced_moves": [{"player",
+ * "can_pass", "cards": [values]}] in play order, so clients can keep
+ * per-turn bookkeeping exact. After {"cmd": "configure", "record_seats":
+ * true}, moves the server plays for random and model seats go in the same
+ * record, marked "seat": true (and not counted in "forced"), so clients can
+ * follow every turn except the greedy seats', with or without auto_forced.
+ * Moves played after the client's last turn come with the game_over
+ * response, which then carries "forced" and "forced_moves" as well.
+ *
+ * Projection: new_game / new_tourney / next_game accept "projection" to trim
+ * that game's turn responses to what the client reads:
+ *   {"hands": "own+sizes"}       only the acting player's hand (the others are
+ *                                empty), plus "handSizes" for every seat
+ *   {"valid_actions": "values"}  each valid action as a list of card values
+ *   {"no_combo_map": true}       no "handComboTypeMap"
+ * Server-encoded features are still computed from the full state. Binary
+ * frames flag the projection so the decoder skips the dropped fields.
+ *
+ * Multiplexing: any game command may carry a "game_id"; the server keeps an
+ * independent game (and tournament) per id. A batch runs several commands in
+ * one round trip and answers with their responses in order:
+ *   → {"cmd": "batch", "commands": [{"cmd": "step", "game_id": 3, "action_index": 0}, ...]}
+ *   ← {"type": "batch", "responses": [{"type": "turn", ...}, ...]}
+ *   → {"cmd": "close_game", "game_id": 3}
+ *   ← {"type": "closed"}
+ *
+ * Model seats: {"cmd": "load_model", "model_id": "average", "path": <onnx file>,
+ * "sample": true} loads (or hot-swaps) an ONNX policy into the server, run
+ * with RLBot via onnxruntime-node; new_game / new_tourney / next_game then
+ * accept "model_seats": {"2": "average"} and those seats are auto-played like
+ * greedy ones. Commands involving model seats complete asynchronously, but
+ * responses still arrive strictly in command order.
+ *
+ * Bulk simulation: {"cmd": "simulate", "seats": ["model:eval", "greedy",
+ * "greedy", "random"], "games": 1000, "seed": 7} plays whole games (or
+ * "tourneys" to "target_score") server-side with a fixed policy per slot —
+ * "greedy", "random" or "model:<model_id>" — and answers with aggregates
+ * only: {"type": "simulation", "positions": [[first, second, third, fourth]
+ * per slot], "ppg", "tourney_positions", "tourney_scores", ...}. Slots are
+ * shuffled across table seats unless "shuffle_seats" is false; "seed" makes
+ * deals, seating and random seats reproducible. See simulate.ts.
+ *
+ * Telemetry: {"cmd": "stats", "reset": true} returns cumulative per-command
+ * compute time, greedy auto-play, turn building and send time (see ServerStats).
+ *
+ * Binary responses: after {"cmd": "configure", "protocol": "binary"} (acked
+ * with a JSON line), responses are length-prefixed frames instead of JSON
+ * lines. Commands stay JSON lines. See bridge-frames.ts for the layout.
+ *
+ * Encoded features: after {"cmd": "configure", "encode": true}, turn responses
+ * also carry "state_features" (encodeState for the acting player) and
+ * "action_features" (encodeAction for each valid play, row-major) as raw
+ * little-endian float32 data — base64 strings in JSON mode, appended to the
+ * frame in binary mode.
+ *
+ * Delta turns: after {"cmd": "configure", "delta": true}, JSON turn responses
+ * carry their "game_id" and, once the client has a game's full state, arrive
+ * as {"type": "turn_delta"} with only the play log entries since the previous
+ * response ("events") plus the small per-turn fields, so their size no longer
+ * grows with game length. Binary frames are already fixed-size and unaffected.
+ *
+ * Prefetch: after {"cmd": "configure", "prefetch": true}, whenever a game
+ * ends the server deals the session's next game and auto-plays it up to the
+ * client's first turn while it would otherwise sit idle, with the same seats
+ * or those given as "next_seats": {"greedy_seats", "random_seats"} on
+ * new_game / new_tourney / next_game. The next game-starting command with
+ * matching seats and auto_forced takes that game; otherwise it is thrown
+ * away. Games with model seats are never prefetched.
+ *
+ * Shared memory: {"cmd": "configure", "transport": "shm", "path": <file>} is
+ * acked on stdout, after which commands and binary responses go through
+ * ring slots in the shared file instead of the pipes. See shm-transport.ts.
  */
 
 import { Card } from "../card.js";
@@ -21,62 +105,487 @@ import { GameState } from "../game-state.js";
 import { deal } from "../deck.js";
 import { evaluate, getAllPlays } from "../bot/hand-evaluator.js";
 import { choosePlay } from "../bot/bot-player.js";
-import type { CardData } from "../types.js";
+import { RLBot } from "../bot/rl-bot.js";
+import { Combo } from "../play.js";
+import type { CardData, GameStateSnapshot, TourneyContext } from "../types.js";
+import type { InferenceSession } from "onnxruntime-common";
+import { encodeFrame, encodePayload, type ForcedMove } from "./bridge-frames.js";
+import { openShm, serveShm } from "./shm-transport.js";
+import { encodeState } from "./state-encoder.js";
+import { encodeAction } from "./action-encoder.js";
+import { seededRandom, simulate, type SeatPolicy } from "./simulate.js";
+import { ACTION_SIZE } from "./constants.js";
 import { createInterface } from "node:readline";
 
 function cardsToData(cards: Card[]): CardData[] {
   return cards.map((c) => ({ rank: c.rank, suit: c.suit, value: c.value }));
 }
 
+/** Output protocol for responses; switched with the "configure" command. */
+let outputProtocol: "json" | "binary" = "json";
+
+/** Whether turn responses include encoded state/action features. */
+let encodeFeatures = false;
+
+/** Whether JSON turn responses after the first of a game are play-log deltas. */
+let deltaMode = false;
+
+/** Whether ended games get their successor dealt ahead of time ("prefetch"). */
+let prefetchGames = false;
+
+/** Whether random and model seat moves go in turn responses' move record. */
+let recordSeats = false;
+
+/** Where commands and responses travel; "shm" is entered once and never left. */
+let transport: "pipe" | "shm" = "pipe";
+
+/** JSON replacer sending typed feature arrays as base64 of their raw bytes. */
+function featuresToBase64(_key: string, value: unknown): unknown {
+  if (value instanceof Float32Array) {
+    return Buffer.from(value.buffer, value.byteOffset, value.byteLength).toString("base64");
+  }
+  return value;
+}
+
+/** Cumulative server-side timings, reported (and optionally reset) by "stats". */
+interface ServerStats {
+  /** Per command: count and total time in runCommand (a batch includes its sub-commands) */
+  commands: Record<string, { count: number; compute_ms: number }>;
+  /** Greedy and random seat auto-play in advancePastGreedy */
+  greedy_ms: number;
+  greedy_moves: number;
+  /** Single-option moves played under auto_forced (also counted in greedy_moves) */
+  forced_moves: number;
+  /** Model seat inference (RLBot) */
+  model_ms: number;
+  model_moves: number;
+  /** Building turn responses: move generation, snapshot, combo map, features */
+  turn_ms: number;
+  /** Serializing and writing responses */
+  send_ms: number;
+  /** Dealing and auto-playing prefetched games while idle */
+  prefetch_ms: number;
+  prefetched: number;
+  /** Games started from a prefetched deal */
+  prefetch_hits: number;
+}
+
+function newServerStats(): ServerStats {
+  return {
+    commands: {},
+    greedy_ms: 0,
+    greedy_moves: 0,
+    forced_moves: 0,
+    model_ms: 0,
+    model_moves: 0,
+    turn_ms: 0,
+    send_ms: 0,
+    prefetch_ms: 0,
+    prefetched: 0,
+    prefetch_hits: 0,
+  };
+}
+
+let serverStats = newServerStats();
+
+function elapsedMs(start: bigint): number {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
 function send(obj: unknown) {
-  process.stdout.write(JSON.stringify(obj) + "\n");
+  const start = process.hrtime.bigint();
+  if (outputProtocol === "binary") {
+    process.stdout.write(encodeFrame(obj));
+  } else {
+    process.stdout.write(JSON.stringify(obj, featuresToBase64) + "\n");
+  }
+  serverStats.send_ms += elapsedMs(start);
+}
+
+function encodeActions(actions: CardData[][]): Float32Array {
+  const out = new Float32Array(actions.length * ACTION_SIZE);
+  for (let i = 0; i < actions.length; i++) {
+    out.set(encodeAction(actions[i]), i * ACTION_SIZE);
+  }
+  return out;
+}
+
+/** A player's combo-type map, kept until their hand changes. */
+interface HandCache {
+  /** Hand as a card-value bitmask (sum of 2^value, exact below 2^53) */
+  mask: number;
+  comboTypeMap: number[];
+}
+
+interface Session {
+  id: string;
+  game: GameState | null;
+  /** Per-player combo-type maps; a hand only changes when its player plays */
+  handCache: (HandCache | undefined)[];
+  /** Valid plays sent in the last turn response, reused by the step answering it */
+  turnPlays: { logLength: number; plays: Card[][] } | null;
+  greedySeats: Set<number>;
+  /** Seats auto-played with a uniformly random legal move (pass included) */
+  randomSeats: Set<number>;
+  /** Seats auto-played by a loaded ONNX model, by model_id */
+  modelSeats: Map<number, string>;
+  /** Play single-option moves for the remaining seats too ("record" also lists them) */
+  autoForced: boolean | "record";
+  /** Forced (and, with recordSeats, random and model seat) moves since the last turn response */
+  forcedMoves: ForcedMove[];
+  /** Fields trimmed from this game's turn responses */
+  projection: Projection;
+  tourneyScores: number[];
+  tourneyGameNumber: number;
+  tourneyTargetScore: number;
+  tourneyMode: boolean;
+  /** playLog length the client has seen, or -1 if it needs a full snapshot (delta mode) */
+  logCursor: number;
+  /** Seat options for the game expected to follow this one */
+  nextSeats: SeatOptions | null;
+  /** That game, dealt and auto-played up to the client's first turn */
+  prefetched: PrefetchedGame | null;
+}
+
+/** The options that shape auto-play, as sent on game-starting commands. */
+type SeatOptions = Pick<Command, "greedy_seats" | "random_seats" | "model_seats" | "auto_forced">;
+
+interface PrefetchedGame {
+  /** seatKey() of the options it was played with */
+  key: string;
+  game: GameState;
+  handCache: (HandCache | undefined)[];
+  turnPlays: Session["turnPlays"];
+  forcedMoves: ForcedMove[];
+}
+
+/** Turn response trimming for a game ("projection" on new_game and co.). */
+interface Projection {
+  hands?: "all" | "own+sizes";
+  valid_actions?: "cards" | "values";
+  no_combo_map?: boolean;
+}
+
+interface Command {
+  cmd: string;
+  game_id?: number | string;
+  action_index?: number;
+  greedy_seats?: number[];
+  random_seats?: number[];
+  model_seats?: Record<string, string>;
+  auto_forced?: boolean | "record";
+  projection?: Projection;
+  next_seats?: Pick<Command, "greedy_seats" | "random_seats" | "model_seats">;
+  model_id?: string;
+  sample?: boolean;
+  target_score?: number;
+  win_order?: number[];
+  commands?: Command[];
+  protocol?: string;
+  encode?: boolean;
+  delta?: boolean;
+  prefetch?: boolean;
+  record_seats?: boolean;
+  transport?: string;
+  path?: string;
+  reset?: boolean;
+  seats?: string[];
+  games?: number;
+  tourneys?: number;
+  seed?: number;
+  shuffle_seats?: boolean;
 }
 
-let game: GameState | null = null;
-let greedySeats: Set<number> = new Set();
+/** Concurrent games keyed by game_id. Commands without a game_id share one default session. */
+const sessions = new Map<string, Session>();
 
-let tourneyScores: number[] = [0, 0, 0, 0];
-let tourneyGameNumber = 0;
-let tourneyTargetScore = 21;
-let tourneyMode = false;
+/** ONNX opponents for model seats, keyed by model_id ("load_model"). */
+const models = new Map<string, { bot: RLBot; session: InferenceSession }>();
 
 /**
- * Auto-play greedy seats until it's a non-greedy player's turn or game over.
- * Returns the response for the next non-greedy turn (or game_over).
+ * Load an ONNX model under model_id, replacing (and releasing) any model
+ * already loaded there; games in progress pick up the new weights on their
+ * next model move. onnxruntime-node is imported on first use so runs
+ * without model seats don't need its native binaries.
  */
-function advancePastGreedy() {
+async function loadModel(msg: Command) {
+  if (!msg.model_id || !msg.path) {
+    return { type: "error", message: "load_model needs model_id and path" };
+  }
+  try {
+    const ort = await import("onnxruntime-node");
+    const session = await ort.InferenceSession.create(msg.path);
+    const previous = models.get(msg.model_id);
+    models.set(msg.model_id, { bot: new RLBot(session, msg.sample ?? false), session });
+    await previous?.session.release();
+  } catch (err) {
+    return { type: "error", message: `Cannot load model: ${(err as Error).message}` };
+  }
+  return { type: "model_loaded", model_id: msg.model_id };
+}
+
+async function playModelSeat(session: Session, player: number): Promise<void> {
+  const game = session.game!;
+  const { bot } = models.get(session.modelSeats.get(player)!)!;
+  const start = process.hrtime.bigint();
+  const hand = game.getHand(player);
+  const comboTypeMap = handComboTypeMap(session, player);
+  const snapshot = turnSnapshot(game, comboTypeMap, getTourneyContext(session));
+  const cardsToPlay = await bot.choosePlay(hand, game.lastPlay, snapshot, player);
+  recordSeatMove(session, player, cardsToPlay);
+  if (cardsToPlay.length > 0) {
+    game.playCards(player, cardsToPlay);
+  } else {
+    game.passTurn(player);
+  }
+  serverStats.model_ms += elapsedMs(start);
+  serverStats.model_moves++;
+}
+
+function getSession(gameId: number | string | undefined): Session {
+  const key = String(gameId ?? "default");
+  let session = sessions.get(key);
+  if (!session) {
+    session = {
+      id: key,
+      game: null,
+      handCache: [],
+      turnPlays: null,
+      greedySeats: new Set(),
+      randomSeats: new Set(),
+      modelSeats: new Map(),
+      autoForced: false,
+      forcedMoves: [],
+      projection: {},
+      tourneyScores: [0, 0, 0, 0],
+      tourneyGameNumber: 0,
+      tourneyTargetScore: 21,
+      tourneyMode: false,
+      logCursor: -1,
+      nextSeats: null,
+      prefetched: null,
+    };
+    sessions.set(key, session);
+  }
+  return session;
+}
+
+/**
+ * Deal a new game for the session, dropping per-game caches, and play up to
+ * the client's first turn. A prefetched game with the same seat options is
+ * taken instead of dealing; any other is discarded.
+ */
+function startGame(session: Session, msg: Command): unknown {
+  const prefetched = session.prefetched;
+  session.prefetched = null;
+  session.logCursor = -1;
+  setAutoSeats(session, msg);
+  session.nextSeats = msg.next_seats ? { ...msg.next_seats, auto_forced: msg.auto_forced } : msg;
+  if (prefetched && prefetched.key === seatKey(msg)) {
+    session.game = prefetched.game;
+    session.handCache = prefetched.handCache;
+    session.forcedMoves = prefetched.forcedMoves;
+    serverStats.prefetch_hits++;
+    return turnResponse(session, prefetched.turnPlays?.plays);
+  }
+  session.game = new GameState(deal());
+  session.handCache = [];
+  session.turnPlays = null;
+  return advancePastGreedy(session);
+}
+
+/**
+ * Identity of a game's seat options, to match a prefetched game to its
+ * command. Seat lists are sets: order and a missing list don't matter.
+ */
+function seatKey(options: SeatOptions): string {
+  const seats = (list: number[] | undefined) => [...new Set(list ?? [])].sort((a, b) => a - b);
+  const models = Object.entries(options.model_seats ?? {})
+    .map(([seat, id]): [number, string] => [Number(seat), id])
+    .sort((a, b) => a[0] - b[0]);
+  return JSON.stringify([
+    seats(options.greedy_seats),
+    seats(options.random_seats),
+    models,
+    options.auto_forced ?? false,
+  ]);
+}
+
+/** Sessions whose next game is still to be prefetched, in the order their games ended. */
+const prefetchQueue = new Set<Session>();
+
+function schedulePrefetch(session: Session): void {
+  if (session.prefetched || !session.nextSeats) return;
+  // Over pipes the event loop is idle between commands; serveShm polls runPrefetch itself
+  if (prefetchQueue.size === 0 && transport === "pipe") setImmediate(runPrefetch);
+  prefetchQueue.add(session);
+}
+
+/** Prefetch one queued session's next game; false if the queue was empty. */
+function runPrefetch(): boolean {
+  const [session] = prefetchQueue;
+  if (!session) return false;
+  prefetchQueue.delete(session);
+  if (sessions.get(session.id) === session) prefetchGame(session);
+  if (prefetchQueue.size > 0 && transport === "pipe") setImmediate(runPrefetch);
+  return true;
+}
+
+/** Deal the session's next game and auto-play it up to the client's first turn. */
+function prefetchGame(session: Session): void {
+  const seats = session.nextSeats!;
+  // Model moves are async, and the model may be swapped before the game starts
+  if (Object.keys(seats.model_seats ?? {}).length > 0) return;
+  const start = process.hrtime.bigint();
+  const next: Session = {
+    ...session,
+    game: new GameState(deal()),
+    handCache: [],
+    turnPlays: null,
+  };
+  setAutoSeats(next, seats);
+  const game = next.game!;
+  const plays = autoPlaySeats(next) as Card[][] | undefined;
+  if (!game.isGameOver()) {
+    const player = game.currentPlayer;
+    next.turnPlays = {
+      logLength: game.playLog.length,
+      plays: plays ?? getAllPlays(evaluate(game.getHand(player), game.lastPlay)),
+    };
+    handComboTypeMap(next, player);
+  }
+  session.prefetched = {
+    key: seatKey(seats),
+    game,
+    handCache: next.handCache,
+    turnPlays: next.turnPlays,
+    forcedMoves: next.forcedMoves,
+  };
+  serverStats.prefetch_ms += elapsedMs(start);
+  serverStats.prefetched++;
+}
+
+/** Seat assignments (plus auto_forced and projection) for a game that is starting. */
+function setAutoSeats(session: Session, msg: SeatOptions & Pick<Command, "projection">): void {
+  session.autoForced = msg.auto_forced ?? false;
+  session.forcedMoves = [];
+  session.projection = msg.projection ?? {};
+  session.greedySeats = new Set(msg.greedy_seats ?? []);
+  session.randomSeats = new Set(msg.random_seats ?? []);
+  session.modelSeats = new Map(
+    Object.entries(msg.model_seats ?? {}).map(([seat, id]) => [Number(seat), id]),
+  );
+}
+
+/**
+ * Error response if the command assigns seats to a model that isn't loaded
+ * or asks for an unknown projection.
+ */
+function checkGameOptions(msg: Command): { type: string; message: string } | null {
+  for (const id of Object.values(msg.model_seats ?? {})) {
+    if (!models.has(id)) return { type: "error", message: `Unknown model: ${id}` };
+  }
+  const { hands = "all", valid_actions = "cards" } = msg.projection ?? {};
+  if (hands !== "all" && hands !== "own+sizes") {
+    return { type: "error", message: `Unknown hands projection: ${hands}` };
+  }
+  if (valid_actions !== "cards" && valid_actions !== "values") {
+    return { type: "error", message: `Unknown valid_actions projection: ${valid_actions}` };
+  }
+  return null;
+}
+
+/** Uniformly random legal move, counting pass as one option; [] means pass. */
+function randomPlay(game: GameState, player: number, random: () => number = Math.random): Card[] {
+  const validPlays = getAllPlays(evaluate(game.getHand(player), game.lastPlay));
+  const options = validPlays.length + (game.lastPlay !== null ? 1 : 0);
+  const choice = Math.floor(random() * options);
+  return choice < validPlays.length ? validPlays[choice] : [];
+}
+
+/**
+ * Auto-play greedy, random and model seats (and, with auto_forced, any
+ * single-option move) until it's another player's turn or game over.
+ * Returns the response for that turn (or game_over), as a promise if a model
+ * seat had to move.
+ */
+function advancePastGreedy(session: Session): unknown {
+  const greedyStart = process.hrtime.bigint();
+  const stop = autoPlaySeats(session);
+  serverStats.greedy_ms += elapsedMs(greedyStart);
+  if (typeof stop === "number") {
+    // Inference is async: finish this seat's move, then keep advancing
+    return playModelSeat(session, stop).then(() => advancePastGreedy(session));
+  }
+  return turnResponse(session, stop);
+}
+
+/**
+ * The auto-play loop of advancePastGreedy. Returns the acting seat's plays
+ * if auto_forced already generated them, or the model seat to move next.
+ */
+function autoPlaySeats(session: Session): Card[][] | number | undefined {
+  const { game, greedySeats, randomSeats } = session;
   const SAFETY_CAP = 500;
   for (let i = 0; i < SAFETY_CAP && game && !game.isGameOver(); i++) {
     const player = game.currentPlayer;
-    if (!greedySeats.has(player)) break;
+    let cardsToPlay: Card[];
+    if (greedySeats.has(player)) {
+      cardsToPlay = choosePlay(game.getHand(player), game.lastPlay);
+    } else if (randomSeats.has(player)) {
+      cardsToPlay = randomPlay(game, player);
+      recordSeatMove(session, player, cardsToPlay);
+    } else if (session.modelSeats.has(player)) {
+      return player;
+    } else if (session.autoForced) {
+      const plays = getAllPlays(evaluate(game.getHand(player), game.lastPlay));
+      const canPass = game.lastPlay !== null;
+      if (plays.length + (canPass ? 1 : 0) !== 1) return plays;
+      cardsToPlay = canPass ? [] : plays[0];
+      session.forcedMoves.push({
+        player,
+        can_pass: canPass,
+        cards: cardsToPlay.map((c) => c.value),
+      });
+      serverStats.forced_moves++;
+    } else {
+      break;
+    }
 
-    const hand = game.getHand(player);
-    const cardsToPlay = choosePlay(hand, game.lastPlay);
     if (cardsToPlay.length > 0) {
       game.playCards(player, cardsToPlay);
     } else {
       game.passTurn(player);
     }
+    serverStats.greedy_moves++;
   }
-  return getTurnResponse();
+  return undefined;
 }
 
-function getTurnResponse() {
-  if (!game || game.isGameOver()) {
-    return { type: "game_over", win_order: game ? [...game.winOrder] : [] };
-  }
+/** Add a random or model seat's move to the session's move record (recordSeats). */
+function recordSeatMove(session: Session, player: number, cards: Card[]): void {
+  if (!recordSeats) return;
+  session.forcedMoves.push({
+    player,
+    can_pass: session.game!.lastPlay !== null,
+    cards: cards.map((c) => c.value),
+    seat: true,
+  });
+}
 
-  const player = game.currentPlayer;
-  const hand = game.getHand(player);
-  const snapshot = game.toSnapshot();
-  const evaluation = evaluate(hand, game.lastPlay);
-  const validPlays = getAllPlays(evaluation);
-  const canPass = game.lastPlay !== null;
+/** getTurnResponse, timed as turn building. */
+function turnResponse(session: Session, validPlays: Card[][] | undefined): unknown {
+  const turnStart = process.hrtime.bigint();
+  const response = getTurnResponse(session, validPlays);
+  serverStats.turn_ms += elapsedMs(turnStart);
+  return response;
+}
 
-  // ⚠️  SYNC WARNING: This must match packages/training/python/features.py encode_state().
-  // Per-card combo type breakdown: 52×7 flat array.
-  // For each card, tracks how many combos of each type (SINGLE=0..BOMB=5, INVALID=6) it appears in.
-  // Encodes both card versatility AND combo strength — a card in a bomb is very different from one only in singles.
+// ⚠️  SYNC WARNING: This must match packages/training/python/features.py encode_state().
+// Per-card combo type breakdown: 52×7 flat array.
+// For each card, tracks how many combos of each type (SINGLE=0..BOMB=5, INVALID=6) it appears in.
+// Encodes both card versatility AND combo strength — a card in a bomb is very different from one only in singles.
+function computeComboTypeMap(hand: Card[]): number[] {
   const potential = evaluate(hand, null);
   const comboTypeMap = new Array(52 * 7).fill(0);
   const comboGroups: [string, Card[][]][] = [
@@ -95,105 +604,291 @@ function getTurnResponse() {
       }
     }
   }
-  snapshot.handComboTypeMap = comboTypeMap;
-
-  if (tourneyMode) {
-    // Estimate expected total games: target_score / avg_ppg_per_game
-    // Average PPG per player = 7/4 = 1.75, so ~12 games to reach 21
-    const expectedTotal = Math.ceil(tourneyTargetScore / 1.75);
-    snapshot.tourneyContext = {
-      scores: [...tourneyScores],
-      targetScore: tourneyTargetScore,
-      gameNumber: tourneyGameNumber,
-      expectedTotalGames: expectedTotal,
-    };
+  return comboTypeMap;
+}
+
+function handMask(hand: Card[]): number {
+  let mask = 0;
+  for (const card of hand) mask += 2 ** card.value;
+  return mask;
+}
+
+/** computeComboTypeMap for a player's current hand, reusing the session cache. */
+function handComboTypeMap(session: Session, player: number): number[] {
+  const hand = session.game!.getHand(player);
+  const mask = handMask(hand);
+  let cached = session.handCache[player];
+  if (!cached || cached.mask !== mask) {
+    cached = { mask, comboTypeMap: computeComboTypeMap(hand) };
+    session.handCache[player] = cached;
   }
+  return cached.comboTypeMap;
+}
 
+function getTourneyContext(session: Session): TourneyContext | undefined {
+  if (!session.tourneyMode) return undefined;
+  // Estimate expected total games: target_score / avg_ppg_per_game
+  // Average PPG per player = 7/4 = 1.75, so ~12 games to reach 21
+  const expectedTotal = Math.ceil(session.tourneyTargetScore / 1.75);
   return {
-    type: "turn",
-    state: snapshot,
-    player,
-    valid_actions: validPlays.map(cardsToData),
-    can_pass: canPass,
+    scores: [...session.tourneyScores],
+    targetScore: session.tourneyTargetScore,
+    gameNumber: session.tourneyGameNumber,
+    expectedTotalGames: expectedTotal,
   };
 }
 
-function handleCommand(line: string) {
-  let msg: { cmd: string; action_index?: number; greedy_seats?: number[]; target_score?: number; win_order?: number[] };
-  try {
-    msg = JSON.parse(line);
-  } catch {
-    send({ type: "error", message: "Invalid JSON" });
-    return;
+/** Play log entries since the client's last turn, as JSON-friendly events. */
+function logEvents(game: GameState, from: number): unknown[] {
+  return game.playLog.slice(from).map((entry) => {
+    if (entry === "round_reset" || entry.play === "pass") return entry;
+    return {
+      player: entry.player,
+      play: {
+        combo: Combo[entry.play.combo],
+        cards: cardsToData(entry.play.cards),
+        suited: entry.play.suited,
+      },
+    };
+  });
+}
+
+/** Full snapshot of a game with the acting hand's combo map and tourney context. */
+function turnSnapshot(
+  game: GameState,
+  comboTypeMap: number[] | undefined,
+  tourneyContext: TourneyContext | undefined,
+): GameStateSnapshot {
+  const snapshot = game.toSnapshot();
+  if (comboTypeMap) snapshot.handComboTypeMap = comboTypeMap;
+  if (tourneyContext) snapshot.tourneyContext = tourneyContext;
+  return snapshot;
+}
+
+/** A turn snapshot trimmed to the session's projection (a new object; shared parts untouched). */
+function projectSnapshot(
+  snapshot: GameStateSnapshot,
+  player: number,
+  projection: Projection,
+): GameStateSnapshot {
+  const projected = { ...snapshot };
+  if (projection.hands === "own+sizes") {
+    projected.hands = snapshot.hands.map((hand, p) => (p === player ? hand : []));
+    projected.handSizes = snapshot.hands.map((hand) => hand.length);
+  }
+  if (projection.no_combo_map) delete projected.handComboTypeMap;
+  return projected;
+}
+
+/** Forced moves in a move record, leaving out random and model seat moves. */
+function countForced(moves: ForcedMove[]): number {
+  return moves.filter((move) => !move.seat).length;
+}
+
+function getTurnResponse(session: Session, knownPlays?: Card[][]) {
+  const { game } = session;
+  if (!game || game.isGameOver()) {
+    const response: Record<string, unknown> = {
+      type: "game_over",
+      win_order: game ? [...game.winOrder] : [],
+    };
+    if (session.autoForced === "record" || recordSeats) {
+      response.forced = countForced(session.forcedMoves);
+      response.forced_moves = session.forcedMoves;
+    }
+    session.forcedMoves = [];
+    if (prefetchGames && game) schedulePrefetch(session);
+    return response;
+  }
+
+  const player = game.currentPlayer;
+  const hand = game.getHand(player);
+  const validPlays = knownPlays ?? getAllPlays(evaluate(hand, game.lastPlay));
+  session.turnPlays = { logLength: game.playLog.length, plays: validPlays };
+  const canPass = game.lastPlay !== null;
+  const { projection } = session;
+  // The encoder reads the combo map even when the client doesn't
+  const comboTypeMap =
+    projection.no_combo_map && !encodeFeatures ? undefined : handComboTypeMap(session, player);
+  const tourneyContext = getTourneyContext(session);
+
+  // Deltas only go to JSON clients that already hold this game's full state
+  const useDelta = deltaMode && outputProtocol === "json";
+  const sendDelta = useDelta && session.logCursor >= 0;
+
+  let snapshot: GameStateSnapshot | null = null;
+  if (!sendDelta || encodeFeatures) {
+    snapshot = turnSnapshot(game, comboTypeMap, tourneyContext);
+  }
+
+  let response: Record<string, unknown>;
+  if (sendDelta) {
+    response = {
+      type: "turn_delta",
+      events: logEvents(game, session.logCursor),
+      passed_players: game.playersInRound.map((inRound) => !inRound),
+      win_order: [...game.winOrder],
+      players_in_game: [...game.playersInGame],
+      tourney_context: tourneyContext ?? null,
+    };
+    if (!projection.no_combo_map) response.hand_combo_type_map = comboTypeMap;
+    if (projection.hands === "own+sizes") {
+      response.hand = cardsToData(hand);
+      response.hand_sizes = game.hands.map((h) => h.length);
+    }
+  } else {
+    response = { type: "turn", state: projectSnapshot(snapshot!, player, projection) };
+  }
+  response.player = player;
+  response.valid_actions =
+    projection.valid_actions === "values"
+      ? validPlays.map((play) => play.map((c) => c.value))
+      : validPlays.map(cardsToData);
+  response.can_pass = canPass;
+  if (session.autoForced) response.forced = countForced(session.forcedMoves);
+  if (session.autoForced === "record" || recordSeats) {
+    response.forced_moves = session.forcedMoves;
+  }
+  session.forcedMoves = [];
+  if (useDelta) response.game_id = session.id;
+  session.logCursor = useDelta ? game.playLog.length : -1;
+
+  if (encodeFeatures) {
+    response.state_features = encodeState(snapshot!, player);
+    response.action_features = encodeActions(validPlays);
+  }
+  return response;
+}
+
+const BATCH_DISALLOWED = new Set(["batch", "quit", "load_model", "simulate"]);
+
+/** Seat policy for a "simulate" seat spec, or an error message. */
+function seatPolicy(spec: string, random: () => number): SeatPolicy | string {
+  if (spec === "greedy") {
+    return (game, player) => choosePlay(game.getHand(player), game.lastPlay);
   }
+  if (spec === "random") {
+    return (game, player) => randomPlay(game, player, random);
+  }
+  if (spec.startsWith("model:")) {
+    const entry = models.get(spec.slice("model:".length));
+    if (!entry) return `Unknown model: ${spec.slice("model:".length)}`;
+    return (game, player, tourney) => {
+      const hand = game.getHand(player);
+      const snapshot = turnSnapshot(game, computeComboTypeMap(hand), tourney);
+      return entry.bot.choosePlay(hand, game.lastPlay, snapshot, player);
+    };
+  }
+  return `Unknown seat policy: ${spec}`;
+}
+
+function runSimulation(msg: Command) {
+  const seats = msg.seats ?? [];
+  if (seats.length !== 4) {
+    return { type: "error", message: "simulate needs 4 seats" };
+  }
+  const random = msg.seed !== undefined ? seededRandom(msg.seed) : Math.random;
+  const policies: SeatPolicy[] = [];
+  for (const spec of seats) {
+    const policy = seatPolicy(spec, random);
+    if (typeof policy === "string") return { type: "error", message: policy };
+    policies.push(policy);
+  }
+  return simulate({
+    policies,
+    games: msg.games,
+    tourneys: msg.tourneys,
+    targetScore: msg.target_score,
+    shuffleSeats: msg.shuffle_seats ?? true,
+    random,
+  });
+}
 
+/** Run one command; the response is a promise if a model seat had to move. */
+function runCommand(msg: Command): unknown {
+  const start = process.hrtime.bigint();
+  const record = () => {
+    const entry = (serverStats.commands[msg.cmd] ??= { count: 0, compute_ms: 0 });
+    entry.count++;
+    entry.compute_ms += elapsedMs(start);
+  };
+  const response = executeCommand(msg);
+  if (response instanceof Promise) {
+    return response.finally(record);
+  }
+  record();
+  return response;
+}
+
+function executeCommand(msg: Command): unknown {
   switch (msg.cmd) {
     case "new_game": {
-      tourneyMode = false;
-      const hands = deal();
-      game = new GameState(hands);
-      greedySeats = new Set(msg.greedy_seats ?? []);
-      send(advancePastGreedy());
-      break;
+      const optionsError = checkGameOptions(msg);
+      if (optionsError) return optionsError;
+      const session = getSession(msg.game_id);
+      session.tourneyMode = false;
+      return startGame(session, msg);
     }
 
     case "new_tourney": {
-      tourneyMode = true;
-      tourneyScores = [0, 0, 0, 0];
-      tourneyGameNumber = 0;
-      tourneyTargetScore = msg.target_score ?? 21;
+      const optionsError = checkGameOptions(msg);
+      if (optionsError) return optionsError;
+      const session = getSession(msg.game_id);
+      session.tourneyMode = true;
+      session.tourneyScores = [0, 0, 0, 0];
+      session.tourneyTargetScore = msg.target_score ?? 21;
       // Start first game
-      const hands = deal();
-      game = new GameState(hands);
-      greedySeats = new Set(msg.greedy_seats ?? []);
-      tourneyGameNumber = 1;
-      send(advancePastGreedy());
-      break;
+      session.tourneyGameNumber = 1;
+      return startGame(session, msg);
     }
 
     case "next_game": {
-      if (!tourneyMode) {
-        send({ type: "error", message: "Not in tournament mode" });
-        break;
+      const session = getSession(msg.game_id);
+      if (!session.tourneyMode) {
+        return { type: "error", message: "Not in tournament mode" };
       }
+      const optionsError = checkGameOptions(msg);
+      if (optionsError) return optionsError;
       // Update scores from the win order of the previous game
       const winOrder: number[] = msg.win_order!;
       const points = [4, 2, 1, 0];
       for (let i = 0; i < winOrder.length; i++) {
-        tourneyScores[winOrder[i]] += points[i];
+        session.tourneyScores[winOrder[i]] += points[i];
       }
 
       // Check if tournament is over
-      const maxScore = Math.max(...tourneyScores);
-      if (maxScore >= tourneyTargetScore) {
-        send({
+      const maxScore = Math.max(...session.tourneyScores);
+      if (maxScore >= session.tourneyTargetScore) {
+        session.tourneyMode = false;
+        return {
           type: "tourney_over",
-          scores: [...tourneyScores],
-          games_played: tourneyGameNumber,
-        });
-        tourneyMode = false;
-        break;
+          scores: [...session.tourneyScores],
+          games_played: session.tourneyGameNumber,
+        };
       }
 
       // Start next game
-      const hands = deal();
-      game = new GameState(hands);
-      greedySeats = new Set(msg.greedy_seats ?? []);
-      tourneyGameNumber++;
-      send(advancePastGreedy());
-      break;
+      session.tourneyGameNumber++;
+      return startGame(session, msg);
     }
 
     case "step": {
+      const session = getSession(msg.game_id);
+      const { game } = session;
       if (!game || game.isGameOver()) {
-        send({ type: "error", message: "No active game" });
-        break;
+        return { type: "error", message: "No active game" };
       }
 
+      if (msg.auto_forced !== undefined) session.autoForced = msg.auto_forced;
+
+      // The plays this step indexes into were generated for the last turn response
       const player = game.currentPlayer;
-      const hand = game.getHand(player);
-      const evaluation = evaluate(hand, game.lastPlay);
-      const validPlays = getAllPlays(evaluation);
+      const cached = session.turnPlays;
+      const validPlays =
+        cached && cached.logLength === game.playLog.length
+          ? cached.plays
+          : getAllPlays(evaluate(game.getHand(player), game.lastPlay));
+      session.turnPlays = null;
       const canPass = game.lastPlay !== null;
       const actionIndex = msg.action_index ?? 0;
 
@@ -203,27 +898,173 @@ function handleCommand(line: string) {
       } else if (actionIndex >= 0 && actionIndex < validPlays.length) {
         game.playCards(player, validPlays[actionIndex]);
       } else {
-        send({
+        return {
           type: "error",
           message: `Invalid action_index ${actionIndex} (${validPlays.length} plays, canPass=${canPass})`,
-        });
-        break;
+        };
       }
 
-      // After the model's move, auto-play any greedy seats before responding
-      send(advancePastGreedy());
-      break;
+      // After the model's move, auto-play any greedy/random seats before responding
+      return advancePastGreedy(session);
+    }
+
+    case "close_game": {
+      sessions.delete(String(msg.game_id ?? "default"));
+      return { type: "closed" };
     }
 
-    case "quit": {
-      process.exit(0);
+    case "stats": {
+      const stats = { type: "stats", ...serverStats };
+      if (msg.reset) serverStats = newServerStats();
+      return stats;
+    }
+
+    case "load_model":
+      return loadModel(msg);
+
+    case "simulate":
+      return runSimulation(msg);
+
+    case "batch": {
+      // Run many commands (typically one per game_id) in a single round trip.
+      // Sub-commands waiting on model seats run concurrently.
+      const responses = (msg.commands ?? []).map((sub) =>
+        BATCH_DISALLOWED.has(sub.cmd)
+          ? { type: "error", message: `Command not allowed in batch: ${sub.cmd}` }
+          : runCommand(sub),
+      );
+      if (responses.some((r) => r instanceof Promise)) {
+        return Promise.all(responses).then((all) => ({ type: "batch", responses: all }));
+      }
+      return { type: "batch", responses };
     }
 
     default:
-      send({ type: "error", message: `Unknown command: ${msg.cmd}` });
+      return { type: "error", message: `Unknown command: ${msg.cmd}` };
+  }
+}
+
+function configure(msg: Command): { type: string; [key: string]: unknown } {
+  const protocol = msg.protocol ?? outputProtocol;
+  if (protocol !== "json" && protocol !== "binary") {
+    return { type: "error", message: `Unknown protocol: ${protocol}` };
+  }
+  const nextTransport = msg.transport ?? transport;
+  if (nextTransport !== "pipe" && nextTransport !== "shm") {
+    return { type: "error", message: `Unknown transport: ${nextTransport}` };
+  }
+  if (transport === "shm" && (nextTransport !== "shm" || protocol !== "binary")) {
+    return { type: "error", message: "The shm transport only supports binary responses" };
+  }
+  if (transport === "pipe" && nextTransport === "shm" && !msg.path) {
+    return { type: "error", message: "The shm transport needs a path" };
+  }
+  encodeFeatures = msg.encode ?? encodeFeatures;
+  deltaMode = msg.delta ?? deltaMode;
+  prefetchGames = msg.prefetch ?? prefetchGames;
+  recordSeats = msg.record_seats ?? recordSeats;
+  return {
+    type: "configured",
+    protocol: nextTransport === "shm" ? "binary" : protocol,
+    encode: encodeFeatures,
+    delta: deltaMode,
+    prefetch: prefetchGames,
+    record_seats: recordSeats,
+    transport: nextTransport,
+  };
+}
+
+/** Error response for a command whose async work failed (e.g. inference). */
+function failure(err: unknown) {
+  return { type: "error", message: (err as Error).message ?? String(err) };
+}
+
+function handleCommand(line: string): void | Promise<void> {
+  let msg: Command;
+  try {
+    msg = JSON.parse(line);
+  } catch {
+    send({ type: "error", message: "Invalid JSON" });
+    return;
+  }
+
+  if (msg.cmd === "quit") {
+    process.exit(0);
+  }
+  if (msg.cmd === "configure") {
+    let ack = configure(msg);
+    let shmFd = -1;
+    if (ack.type === "configured" && ack.transport === "shm") {
+      try {
+        shmFd = openShm(msg.path!);
+      } catch (err) {
+        ack = { type: "error", message: `Cannot open shm file: ${(err as Error).message}` };
+      }
+    }
+    // Acknowledge in the current protocol so the client can find the switch point
+    send(ack);
+    if (ack.type === "configured") {
+      outputProtocol = ack.protocol as "json" | "binary";
+      if (shmFd >= 0) {
+        transport = "shm";
+        // Serves for the rest of the process; stdin is no longer read
+        rl.off("line", onLine);
+        void serveShm(shmFd, handleShmCommand, runPrefetch);
+      }
+    }
+    return;
+  }
+  const response = runCommand(msg);
+  if (response instanceof Promise) {
+    return response.then(send, (err) => send(failure(err)));
+  }
+  send(response);
+}
+
+function encodeResponse(response: unknown): Uint8Array {
+  const start = process.hrtime.bigint();
+  const payload = encodePayload(response);
+  serverStats.send_ms += elapsedMs(start);
+  return payload;
+}
+
+function handleShmCommand(line: string): Uint8Array | Promise<Uint8Array> {
+  let msg: Command;
+  try {
+    msg = JSON.parse(line);
+  } catch {
+    return encodePayload({ type: "error", message: "Invalid JSON" });
+  }
+
+  if (msg.cmd === "quit") {
+    process.exit(0);
+  }
+  if (msg.cmd === "configure") {
+    return encodePayload(configure(msg));
+  }
+  const response = runCommand(msg);
+  if (response instanceof Promise) {
+    return response.then(encodeResponse, (err) => encodeResponse(failure(err)));
+  }
+  return encodeResponse(response);
+}
+
+/** Tail of the commands still completing asynchronously; later lines queue behind it. */
+let pending: Promise<void> | null = null;
+
+function onLine(line: string) {
+  const result = pending ? pending.then(() => handleCommand(line)) : handleCommand(line);
+  if (result instanceof Promise) {
+    const tail: Promise<void> = result.finally(() => {
+      if (pending === tail) pending = null;
+    });
+    pending = tail;
   }
 }
 
 const rl = createInterface({ input: process.stdin });
-rl.on("line", handleCommand);
+rl.on("line", onLine);
 rl.on("close", () => process.exit(0));
+
+// Lets clients time startup and know everything before this line is noise
+send({ type: "ready" });
@@ -0,0 +1,120 @@
+/**
+ * Shared-memory ring transport for the game-server bridge.
+ *
+ * Opt-in alternative to the stdin/stdout pipes, enabled with
+ * {"cmd": "configure", "transport": "shm", "path": <file>}.
+ * Python creates and memory-maps the file (normally under /dev/shm) and
+ * reads responses straight out of the mapping; Node has no mmap, so this
+ * side uses positional reads/writes on the same tmpfs pages.
+ *
+ * ⚠️  SYNC WARNING: The layout here must match _ShmChannel in
+ * packages/training/python/game_bridge.py. Any change must be made in both.
+ *
+ * Layout (all u32 little-endian):
+ *   0    magic (SHM_MAGIC)
+ *   4    slots (K)
+ *   8    slot_size (S)
+ *   12   request seq — count of requests written by Python
+ *   16   response seq — count of responses written by the server
+ *   64   K request slots of S bytes, then K response slots of S bytes
+ *
+ * Request n lives in slot n % K as (u32 length, UTF-8 JSON command);
+ * response n goes to response slot n % K as (u32 length, binary payload
+ * from encodePayload). Each side writes the slot before bumping its seq.
+ * Waiting spins briefly, then sleeps in short Atomics.wait intervals.
+ */
+
+import { closeSync, openSync, readSync, writeSync } from "node:fs";
+import { encodePayload } from "./bridge-frames.js";
+
+export const SHM_MAGIC = 0x4d534854; // "THSM"
+export const SHM_HEADER_SIZE = 64;
+
+const REQUEST_SEQ = 12;
+const RESPONSE_SEQ = 16;
+const SPIN_ITERATIONS = 2000;
+const SLEEP_MS = 0.05;
+
+/**
+ * Open the shared file. Done before acknowledging the switch, since the
+ * client unlinks the file once it has the ack.
+ */
+export function openShm(path: string): number {
+  const fd = openSync(path, "r+");
+  const magic = Buffer.alloc(4);
+  readSync(fd, magic, 0, 4, 0);
+  if (magic.readUInt32LE(0) !== SHM_MAGIC) {
+    closeSync(fd);
+    throw new Error(`Not a bridge shared-memory file: ${path}`);
+  }
+  return fd;
+}
+
+/**
+ * Serve requests from the shared file (opened with openShm) forever.
+ * `handle` maps one JSON command to a binary response payload, or a promise
+ * of one (requests are still answered one at a time, in order). While no
+ * request is waiting, `idleWork` is called before spinning; it runs one
+ * small unit of background work and returns false once there is none.
+ * Exits when the parent process goes away; "quit" is expected to be handled
+ * by `handle` (process.exit).
+ */
+export async function serveShm(
+  fd: number,
+  handle: (command: string) => Uint8Array | Promise<Uint8Array>,
+  idleWork: () => boolean = () => false,
+): Promise<never> {
+  const word = Buffer.alloc(4);
+  const readWord = (offset: number): number => {
+    readSync(fd, word, 0, 4, offset);
+    return word.readUInt32LE(0);
+  };
+  const writeWord = (offset: number, value: number): void => {
+    word.writeUInt32LE(value >>> 0, 0);
+    writeSync(fd, word, 0, 4, offset);
+  };
+
+  const slots = readWord(4);
+  const slotSize = readWord(8);
+  const requestBase = SHM_HEADER_SIZE;
+  const responseBase = SHM_HEADER_SIZE + slots * slotSize;
+
+  const request = Buffer.alloc(slotSize);
+  const sleeper = new Int32Array(new SharedArrayBuffer(4));
+  const parentPid = process.ppid;
+  let seq = readWord(RESPONSE_SEQ);
+  let idle = 0;
+
+  for (;;) {
+    if (readWord(REQUEST_SEQ) === seq) {
+      if (idle === 0 && idleWork()) continue;
+      if (++idle > SPIN_ITERATIONS) {
+        Atomics.wait(sleeper, 0, 0, SLEEP_MS);
+        // Reparented: the Python side is gone
+        if (process.ppid !== parentPid) process.exit(0);
+      }
+      continue;
+    }
+    idle = 0;
+
+    const slot = seq % slots;
+    const requestOffset = requestBase + slot * slotSize;
+    const length = Math.min(readWord(requestOffset), slotSize - 4);
+    readSync(fd, request, 0, length, requestOffset + 4);
+
+    const result = handle(request.toString("utf8", 0, length));
+    let payload = result instanceof Promise ? await result : result;
+    if (payload.length > slotSize - 4) {
+      payload = encodePayload({
+        type: "error",
+        message: `Response of ${payload.length} bytes exceeds shm slot size ${slotSize}`,
+      });
+    }
+
+    const responseOffset = responseBase + slot * slotSize;
+    writeWord(responseOffset, payload.length);
+    writeSync(fd, payload, 0, payload.length, responseOffset + 4);
+    seq = (seq + 1) >>> 0;
+    writeWord(RESPONSE_SEQ, seq);
+  }
+}
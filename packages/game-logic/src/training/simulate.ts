@@ -0,0 +1,159 @@
+/**
+ * Bulk simulation for the game server's "simulate" command: plays complete
+ * games and tournaments with fixed seat policies inside the server process
+ * and returns only aggregate results.
+ */
+
+import type { Card } from "../card.js";
+import { deal, shuffle } from "../deck.js";
+import { GameState } from "../game-state.js";
+import type { TourneyContext } from "../types.js";
+
+const NUM_PLAYERS = 4;
+const POINTS = [4, 2, 1, 0];
+const MOVE_CAP = 500;
+
+/** Picks a play for `player` ([] = pass); async for model-backed seats. */
+export type SeatPolicy = (
+  game: GameState,
+  player: number,
+  tourney: TourneyContext | undefined,
+) => Card[] | Promise<Card[]>;
+
+export interface SimulationOptions {
+  /** One policy per slot; results are reported per slot in this order */
+  policies: SeatPolicy[];
+  /** Independent games to play */
+  games?: number;
+  /** Tournaments to play, each until a seat reaches targetScore */
+  tourneys?: number;
+  targetScore?: number;
+  /** Randomly reassign slots to table seats for every game / tournament */
+  shuffleSeats?: boolean;
+  /** Source of randomness for deals and seat assignment */
+  random?: () => number;
+}
+
+export interface SimulationResult {
+  type: "simulation";
+  /** All games played, tournament games included */
+  games: number;
+  /** positions[slot][k]: games in which the slot finished (k+1)-th */
+  positions: number[][];
+  /** Average points per game (4/2/1/0) for each slot */
+  ppg: number[];
+  tourneys: number;
+  /** tourney_positions[slot][k]: tournaments with the slot (k+1)-th in the final standings */
+  tourney_positions: number[][];
+  /** Average final tournament score for each slot */
+  tourney_scores: number[];
+}
+
+/** Deterministic [0, 1) generator (mulberry32) for reproducible simulations. */
+export function seededRandom(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function zeros(rows: number, cols: number): number[][] {
+  return Array.from({ length: rows }, () => new Array(cols).fill(0));
+}
+
+/** Play one game; seating[tableSeat] is the slot whose policy plays it. */
+async function playGame(
+  policies: SeatPolicy[],
+  seating: number[],
+  random: () => number,
+  tourney?: () => TourneyContext,
+): Promise<number[]> {
+  const game = new GameState(deal(NUM_PLAYERS, random));
+  for (let i = 0; i < MOVE_CAP && !game.isGameOver(); i++) {
+    const player = game.currentPlayer;
+    const choice = policies[seating[player]](game, player, tourney?.());
+    const cardsToPlay = choice instanceof Promise ? await choice : choice;
+    if (cardsToPlay.length > 0) {
+      game.playCards(player, cardsToPlay);
+    } else {
+      game.passTurn(player);
+    }
+  }
+  return game.winOrder;
+}
+
+export async function simulate(options: SimulationOptions): Promise<SimulationResult> {
+  const { policies } = options;
+  const random = options.random ?? Math.random;
+  const targetScore = options.targetScore ?? 21;
+  const slots = policies.length;
+
+  const positions = zeros(slots, NUM_PLAYERS);
+  const points = new Array(slots).fill(0);
+  const tourneyPositions = zeros(slots, NUM_PLAYERS);
+  const tourneyScores = new Array(slots).fill(0);
+  let games = 0;
+
+  const nextSeating = (): number[] => {
+    const seating = Array.from({ length: NUM_PLAYERS }, (_, i) => i);
+    return options.shuffleSeats ? shuffle(seating, random) : seating;
+  };
+  const record = (winOrder: number[], seating: number[]) => {
+    for (let k = 0; k < winOrder.length; k++) {
+      const slot = seating[winOrder[k]];
+      positions[slot][k]++;
+      points[slot] += POINTS[k];
+    }
+    games++;
+  };
+
+  for (let g = 0; g < (options.games ?? 0); g++) {
+    const seating = nextSeating();
+    record(await playGame(policies, seating, random), seating);
+  }
+
+  const tourneys = options.tourneys ?? 0;
+  for (let t = 0; t < tourneys; t++) {
+    const seating = nextSeating();
+    const scores = [0, 0, 0, 0];
+    let gameNumber = 1;
+    // Same estimate as the server's tourney context
+    const expectedTotalGames = Math.ceil(targetScore / 1.75);
+    const context = (): TourneyContext => ({
+      scores: [...scores],
+      targetScore,
+      gameNumber,
+      expectedTotalGames,
+    });
+
+    for (;;) {
+      const winOrder = await playGame(policies, seating, random, context);
+      record(winOrder, seating);
+      for (let k = 0; k < winOrder.length; k++) scores[winOrder[k]] += POINTS[k];
+      if (Math.max(...scores) >= targetScore) break;
+      gameNumber++;
+    }
+
+    // Final standings by score; ties go to the lower table seat
+    const ranked = [0, 1, 2, 3].sort((a, b) => scores[b] - scores[a]);
+    for (let k = 0; k < ranked.length; k++) {
+      const slot = seating[ranked[k]];
+      tourneyPositions[slot][k]++;
+      tourneyScores[slot] += scores[ranked[k]];
+    }
+  }
+
+  return {
+    type: "simulation",
+    games,
+    positions,
+    ppg: points.map((p) => (games > 0 ? p / games : 0)),
+    tourneys,
+    tourney_positions: tourneyPositions,
+    tourney_scores: tourneyScores.map((s) => (tourneys > 0 ? s / tourneys : 0)),
+  };
+}
@@ -79,9 +79,11 @@ export function encodeState(
   }
 
   // Opponent hand sizes (3) — normalized by 13
+  // Projected snapshots only carry the acting hand, plus handSizes
+  const handSizes = snapshot.handSizes ?? snapshot.hands.map((hand) => hand.length);
   for (let rel = 1; rel <= NUM_OPPONENTS; rel++) {
     const abs = (playerIndex + rel) % NUM_PLAYERS;
-    out[offset++] = snapshot.hands[abs].length / 13;
+    out[offset++] = handSizes[abs] / 13;
   }
 
   // Last play cards (52)
@@ -153,7 +155,7 @@ export function encodeState(
   const mySize = snapshot.hands[playerIndex].length;
   for (let rel = 1; rel <= NUM_OPPONENTS; rel++) {
     const abs = (playerIndex + rel) % NUM_PLAYERS;
-    out[offset++] = (mySize - snapshot.hands[abs].length) / 13;
+    out[offset++] = (mySize - handSizes[abs]) / 13;
   }
 
   // Combo history (3 × 7 = 21) — per-opponent combo type counts, normalized
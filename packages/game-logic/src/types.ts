@@ -26,7 +26,10 @@ export interface TourneyContext {
 }
 
 export interface GameStateSnapshot {
+  /** Every hand, or only the acting player's (others empty) when handSizes is set */
   hands: CardData[][];
+  /** Card count per hand; set by the training server's "own+sizes" projection. */
+  handSizes?: number[];
   currentPlayer: number;
   lastPlay: PlayData | null;
   lastPlayBy: number;
@@ -0,0 +1,676 @@
+"""
+NumPy-batched Tiến Lên environment: B games advanced in lockstep.
+
+Game state lives in arrays — hands and played cards as uint64 card masks,
+lastPlay as combo / size / top card / suited, in-round and in-game flags, win
+order — so one step() moves every active game and one observe() writes the
+acting players' (B, STATE_SIZE) state features and padded
+(B, max_actions, ACTION_SIZE) action features into preallocated buffers,
+the layout train_ppo.encode_turn produces per turn and
+TrajectoryBuffer.to_tensors / TienLenNet.forward consume.
+
+Legal actions are each hand's full combo list (thirteen_engine.hand_combos
+order, generated in arrays for every changed hand at once) filtered against
+lastPlay with array predicates on combo, size, top card and suitedness;
+order and turn rules match thirteen_engine, and so game-state.ts and hand-evaluator.ts. Plays are
+truncated as in encode_turn, with pass in the slot after the last play.
+Features match features.encode_state for single games (the tournament block
+stays zero).
+
+Seats in greedy_seats are played by the env itself with greedy_policy
+(bot-player.ts choosePlay), as the game server's greedy_seats: after
+reset() and every step() / step_greedy(), greedy seats move until one of
+the caller's seats is to play or the game ends, so observe() only reports
+the caller's seats. The env-played moves aren't reported; step() returns
+only the rows whose game finished, whether on the caller's move or on a
+greedy seat's, and their win_order is final.
+
+It is a standalone building block: train_imitation.py --games labels its
+greedy self-play with it, while PPO collection (train_ppo.py) still plays
+through the game bridges, whose per-game opponent mix and move records it
+has no equivalent for. tests/test_batched_env.py checks every observation
+and greedy choice against thirteen_engine.GameState, choose_play and
+features.encode_state / encode_action.
+
+    python batched_env.py [--games 256] [--steps 500]
+
+reports throughput with seat 0 playing randomly against greedy seats.
+"""
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from features import (
+    ACTION_SIZE, DECK_SIZE, NUM_ACTION_COMBO_TYPES, NUM_PLAYERS, POWER_INDEX, STATE_SIZE,
+)
+from thirteen_engine import BOMB, QUAD, RUN, TWO, mask_values
+
+MAX_ACTIONS = 80  # train_ppo.MAX_ACTIONS
+_FULL_DECK = np.uint64((1 << DECK_SIZE) - 1)
+_SUIT_MASKS = np.array(
+    [sum(1 << (4 * r + suit) for r in range(13)) for suit in range(4)], dtype=np.uint64,
+)
+_OPPONENTS = np.arange(1, NUM_PLAYERS)
+_CLOCKWISE = np.arange(1, NUM_PLAYERS + 1)
+
+# ⚠️  SYNC WARNING: block offsets of features.encode_state.
+_COMBO_MAP = 0
+_PLAYED = _COMBO_MAP + DECK_SIZE * NUM_ACTION_COMBO_TYPES
+_OPP_PLAYED = _PLAYED + DECK_SIZE
+_OPP_SIZES = _OPP_PLAYED + 3 * DECK_SIZE
+_LAST_CARDS = _OPP_SIZES + 3
+_LAST_COMBO = _LAST_CARDS + DECK_SIZE
+_LAST_SUITED = _LAST_COMBO + 8
+_LAST_BY = _LAST_SUITED + 1
+_PASSED = _LAST_BY + NUM_PLAYERS
+_IN_GAME = _PASSED + 3
+_WIN_FILLED = _IN_GAME + 3
+_UNSEEN = _WIN_FILLED + 3
+_ADVANTAGE = _UNSEEN + DECK_SIZE
+_COMBO_HISTORY = _ADVANTAGE + 3
+# The tournament block (15) follows and is left zero
+
+# ⚠️  SYNC WARNING: offsets of features.encode_action.
+_ACTION_COMBO = DECK_SIZE
+_ACTION_SIZE_COL = _ACTION_COMBO + NUM_ACTION_COMBO_TYPES
+_ACTION_TOP = _ACTION_SIZE_COL + 1
+_ACTION_SUITED = _ACTION_TOP + 1
+_ACTION_PASS = ACTION_SIZE - 1
+
+
+def unpack_masks(masks: np.ndarray) -> np.ndarray:
+    """uint64 card masks (any shape) → their 52 card bits as uint8, (..., 52)."""
+    masks = np.ascontiguousarray(masks, dtype="<u8")
+    bits = np.unpackbits(masks.view(np.uint8).reshape(*masks.shape, 8), axis=-1, bitorder="little")
+    return bits[..., :DECK_SIZE]
+
+
+# ── Combo slots ──
+#
+# Every combo a hand can hold has a fixed slot, in hand_combos order: each
+# single, each pair / triple / quad of suits within a rank, each run by
+# length, start rank and start card, and each bomb by size and start rank.
+# Sets have fixed cards; runs add the lowest card of each following rank and
+# bombs the two lowest cards of each rank, as thirteen_engine's generators.
+
+# Singles, pairs, triples and quads: combo is the number of cards less one
+_SET_SLOTS = [
+    (sum(1 << (4 * r + s) for s in suits), k - 1)
+    for k in range(1, 5) for r in range(13) for suits in itertools.combinations(range(4), k)
+]
+_SET_MASKS = np.array([mask for mask, _ in _SET_SLOTS], dtype=np.uint64)
+_RUN_SLOTS = np.array(
+    [(n, r, 4 * r + s) for n in range(3, TWO + 1) for r in range(TWO - n + 1) for s in range(4)],
+    dtype=np.int64,
+).T
+_BOMB_SLOTS = np.array(
+    [(n, r) for n in range(3, TWO + 1) for r in range(TWO - n + 1)], dtype=np.int64,
+).T
+_SLOT_COMBOS = np.array(
+    [combo for _, combo in _SET_SLOTS] + [RUN] * _RUN_SLOTS.shape[1] + [BOMB] * _BOMB_SLOTS.shape[1],
+    dtype=np.int64,
+)
+_RANK_SHIFTS = np.arange(0, 4 * TWO, 4, dtype=np.uint64)
+
+
+def _lowest_bit(x: np.ndarray) -> np.ndarray:
+    return x & (~x + np.uint64(1))
+
+
+def _candidates(hands) -> tuple[np.ndarray, ...]:
+    """Every combo of each hand (hand_combos order) as (len(hands), C) arrays
+    padded with zeros: card mask, combo, size, top card, single-suit flag;
+    plus the number of combos per hand."""
+    hands = np.asarray(hands, dtype=np.uint64).reshape(-1, 1)
+    set_held = (hands & _SET_MASKS) == _SET_MASKS
+
+    # Per rank below the 2s: lowest card, two lowest cards, as masks
+    cards = hands & (np.uint64(15) << _RANK_SHIFTS)
+    low = _lowest_bit(cards)
+    pair = low | _lowest_bit(cards ^ low)
+    has_pair = pair != low
+
+    def prefix(x: np.ndarray) -> np.ndarray:
+        return np.concatenate([np.zeros_like(x[:, :1]), np.cumsum(x, axis=1, dtype=x.dtype)], axis=1)
+
+    # Masks are disjoint across ranks, so range sums are unions
+    low_sum, ranks_held = prefix(low), prefix((low != 0).astype(np.int64))
+    pair_sum, pairs_held = prefix(np.where(has_pair, pair, np.uint64(0))), prefix(has_pair.astype(np.int64))
+
+    n, r, card = _RUN_SLOTS
+    start = np.uint64(1) << card.astype(np.uint64)
+    run_mask = start | (low_sum[:, r + n] - low_sum[:, r + 1])
+    run_held = ((hands & start) != 0) & (ranks_held[:, r + n] - ranks_held[:, r + 1] == n - 1)
+
+    n, r = _BOMB_SLOTS
+    bomb_mask = pair_sum[:, r + n] - pair_sum[:, r]
+    bomb_held = pairs_held[:, r + n] - pairs_held[:, r] == n
+
+    slot_mask = np.concatenate([np.broadcast_to(_SET_MASKS, set_held.shape), run_mask, bomb_mask], axis=1)
+    held = np.concatenate([set_held, run_held, bomb_held], axis=1)
+    count = held.sum(axis=1)
+    width = max(int(count.max(initial=0)), 1)
+    order = np.argsort(~held, axis=1, kind="stable")[:, :width]
+    filled = np.arange(width) < count[:, None]
+    mask = np.where(filled, np.take_along_axis(slot_mask, order, axis=1), np.uint64(0))
+    combo = np.where(filled, _SLOT_COMBOS[order], 0)
+
+    size = np.bitwise_count(mask).astype(np.int64)
+    # Masks are below 2**52, so exact as floats: the exponent gives the top bit
+    top = np.frexp(mask.astype(np.float64))[1].astype(np.int64) - 1
+    suited = np.any((mask[..., None] & ~_SUIT_MASKS) == 0, axis=-1) & (size > 0)
+    return mask, combo, size, top, suited, count
+
+
+def _beats(
+    combo: np.ndarray, size: np.ndarray, top: np.ndarray, suited: np.ndarray,
+    last_combo: np.ndarray, last_size: np.ndarray, last_top: np.ndarray, last_suited: np.ndarray,
+) -> np.ndarray:
+    """Which combos are legal against each row's lastPlay (last_combo -1:
+    opening), as move-validator.ts validate. Candidates are (rows, C), lastPlay
+    fields (rows, 1)."""
+    same = (
+        (combo == last_combo)
+        & ((combo < RUN) | (size == last_size))
+        & (top > last_top)
+        & (~last_suited | suited)
+    )
+    # A quad chops a single 2; n + 2 consecutive pairs chop n 2s
+    twos = (last_combo >= 0) & (last_combo <= QUAD) & (last_top >> 2 == TWO)
+    chop = twos & (
+        ((last_size == 1) & (combo == QUAD))
+        | ((combo == BOMB) & (size == 2 * (last_size + 2)))
+    )
+    # Opening allows every combo but bombs
+    return np.where(last_combo < 0, combo != BOMB, same | chop)
+
+
+def _greedy_choice(
+    legal: np.ndarray, mask: np.ndarray, combo: np.ndarray, size: np.ndarray,
+    top: np.ndarray, hands: np.ndarray, opening: np.ndarray,
+) -> np.ndarray:
+    """Candidate index of bot-player.ts choosePlay's move per row, -1 to pass.
+
+    Opening: the largest non-bomb combo (quads count as bombs) holding the
+    hand's lowest card, then the lowest top card. Otherwise the legal combo
+    with the lowest top card. Ties go to the earliest combo, as choosePlay's
+    stable sort does.
+    """
+    capacity = legal.shape[1]
+    index = np.arange(capacity)
+    lowest = hands & (~hands + np.uint64(1))
+    with_lowest = legal & (combo != QUAD) & ((mask & lowest[:, None]) != 0)
+    unavailable = np.iinfo(np.int64).max
+    key = np.where(
+        opening[:, None],
+        np.where(with_lowest, ((DECK_SIZE - size) * DECK_SIZE + top) * capacity + index, unavailable),
+        np.where(legal, top * capacity + index, unavailable),
+    )
+    choice = key.argmin(axis=1)
+    return np.where(key[np.arange(choice.size), choice] < unavailable, choice, -1)
+
+
+def greedy_policy(hands, last_plays):
+    """bot-player.ts choosePlay, decided in arrays.
+
+    Takes one hand mask and its lastPlay (a thirteen_engine.Play, or None when
+    opening) and returns the play's card values, () to pass — or sequences of
+    each and returns a list of plays.
+    """
+    single = isinstance(hands, (int, np.integer))
+    if single:
+        hands, last_plays = [hands], [last_plays]
+    hands = [int(hand) for hand in hands]
+    mask, combo, size, top, suited, count = _candidates(hands)
+
+    def field(get, default) -> np.ndarray:
+        return np.array([default if p is None else get(p) for p in last_plays], dtype=np.int64)[:, None]
+
+    last_combo = field(lambda p: p.combo, -1)
+    legal = _beats(
+        combo, size, top, suited, last_combo, field(lambda p: len(p.cards), 0),
+        field(lambda p: p.value, -1), field(lambda p: p.suited, 0).astype(np.bool_),
+    ) & (np.arange(combo.shape[1]) < count[:, None])
+    choice = _greedy_choice(
+        legal, mask, combo, size, top, np.array(hands, dtype=np.uint64), last_combo[:, 0] < 0,
+    )
+    plays = [
+        tuple(mask_values(int(mask[i, c]))) if c >= 0 else ()
+        for i, c in enumerate(choice.tolist())
+    ]
+    return plays[0] if single else plays
+
+
+class BatchedGameEnv:
+    """B independent four-player games stepped together.
+
+    observe() fills and returns (states, action_features, action_mask,
+    num_actions) for the player to move in every active game (rows of
+    finished games are zero, num_actions 0); step(actions) then applies one
+    action index per game, in the same encoded action space (pass =
+    num_actions - 1 when passing is allowed). Finished games keep their
+    win_order until reset(rows) deals them a new game.
+
+    Seats in greedy_seats are played by the greedy bot (greedy_policy), as
+    the game server's greedy_seats: observe() only ever sees the other seats.
+    step_greedy() plays the greedy move for the seat to act, and
+    greedy_actions() labels the last observation with it.
+
+    The buffers returned by observe() are reused by the next call; copy
+    what has to outlive a step. State arrays (hands, current_player,
+    win_order, done, ...) are public and read-only.
+    """
+
+    def __init__(
+        self, num_games: int, seed: int | None = None, max_actions: int = MAX_ACTIONS,
+        greedy_seats: tuple[int, ...] = (),
+    ):
+        if num_games < 1:
+            raise ValueError(f"num_games must be >= 1, got {num_games}")
+        if not set(greedy_seats) <= set(range(NUM_PLAYERS)):
+            raise ValueError(f"greedy_seats must be seats 0-3, got {greedy_seats}")
+        self.num_games = num_games
+        self.max_actions = max_actions
+        self.greedy_seats = tuple(sorted(set(greedy_seats)))
+        self._rng = np.random.default_rng(seed)
+        b = num_games
+
+        self.hands = np.zeros((b, NUM_PLAYERS), dtype=np.uint64)
+        self.played = np.zeros((b, NUM_PLAYERS), dtype=np.uint64)
+        self.combos_played = np.zeros((b, NUM_PLAYERS, NUM_ACTION_COMBO_TYPES), dtype=np.int16)
+        self.current_player = np.zeros(b, dtype=np.int64)
+        self.last_mask = np.zeros(b, dtype=np.uint64)
+        # Combo index of lastPlay, -1 when the player to move has power
+        self.last_combo = np.full(b, -1, dtype=np.int64)
+        self.last_size = np.zeros(b, dtype=np.int64)
+        self.last_top = np.full(b, -1, dtype=np.int64)
+        self.last_suited = np.zeros(b, dtype=np.bool_)
+        self.last_by = np.full(b, -1, dtype=np.int64)
+        self.in_round = np.ones((b, NUM_PLAYERS), dtype=np.bool_)
+        self.in_game = np.ones((b, NUM_PLAYERS), dtype=np.bool_)
+        self.win_order = np.full((b, NUM_PLAYERS), -1, dtype=np.int64)
+        self.num_won = np.zeros(b, dtype=np.int64)
+        self.done = np.ones(b, dtype=np.bool_)
+
+        # Each hand's combos (hand_combos order), rebuilt when the hand changes
+        self._capacity = 64
+        self._cand_mask = np.zeros((b, NUM_PLAYERS, self._capacity), dtype=np.uint64)
+        self._cand_combo = np.zeros((b, NUM_PLAYERS, self._capacity), dtype=np.int64)
+        self._cand_size = np.zeros((b, NUM_PLAYERS, self._capacity), dtype=np.int64)
+        self._cand_top = np.zeros((b, NUM_PLAYERS, self._capacity), dtype=np.int64)
+        self._cand_suited = np.zeros((b, NUM_PLAYERS, self._capacity), dtype=np.bool_)
+        self._num_cand = np.zeros((b, NUM_PLAYERS), dtype=np.int64)
+        self._combo_map = np.zeros((b, NUM_PLAYERS, DECK_SIZE * NUM_ACTION_COMBO_TYPES), dtype=np.float32)
+        self._stale = np.ones((b, NUM_PLAYERS), dtype=np.bool_)
+        self._map_stale = np.ones((b, NUM_PLAYERS), dtype=np.bool_)
+
+        # The last observation's action slots: candidate index per play slot
+        self._slots = np.zeros((b, max_actions), dtype=np.int64)
+        self._num_plays = np.zeros(b, dtype=np.int64)
+        self._can_pass = np.zeros(b, dtype=np.bool_)
+        self._observed = False
+
+        self.states = np.zeros((b, STATE_SIZE), dtype=np.float32)
+        self.action_features = np.zeros((b, max_actions, ACTION_SIZE), dtype=np.float32)
+        self.action_mask = np.zeros((b, max_actions), dtype=np.bool_)
+        self.num_actions = np.zeros(b, dtype=np.int64)
+
+    # ── Dealing ──
+
+    def reset(self, rows: np.ndarray | None = None) -> None:
+        """Deal new games in `rows` (default: every game)."""
+        rows = np.arange(self.num_games) if rows is None else np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+        cards = np.argsort(self._rng.random((rows.size, DECK_SIZE)), axis=1)
+        cards = cards.reshape(rows.size, NUM_PLAYERS, 13).astype(np.uint64)
+        hands = np.bitwise_or.reduce(np.uint64(1) << cards, axis=2)
+        self.hands[rows] = hands
+        # The 3♠ (card 0) always starts
+        self.current_player[rows] = np.argmax(hands & np.uint64(1), axis=1)
+        self.played[rows] = 0
+        self.combos_played[rows] = 0
+        self._reset_round(rows)
+        self.in_game[rows] = True
+        self.in_round[rows] = True
+        self.win_order[rows] = -1
+        self.num_won[rows] = 0
+        self.done[rows] = False
+        self._stale[rows] = True
+        self._observed = False
+        self._auto_play()
+
+    # ── Observation ──
+
+    def observe(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Features and legal actions of the player to move in every active game."""
+        self.states.fill(0)
+        self.action_features.fill(0)
+        self.action_mask.fill(False)
+        self.num_actions.fill(0)
+        self._num_plays.fill(0)
+        self._can_pass.fill(False)
+        self._observed = True
+
+        rows = np.flatnonzero(~self.done)
+        if rows.size == 0:
+            return self.states, self.action_features, self.action_mask, self.num_actions
+        player = self.current_player[rows]
+        self._refresh(rows, player)
+
+        legal = self._legal(rows, player)
+        m = self.max_actions
+        can_pass = self.last_combo[rows] >= 0
+        order = np.argsort(~legal, axis=1, kind="stable")[:, :m]
+        slots = np.zeros((rows.size, m), dtype=np.int64)
+        slots[:, :order.shape[1]] = order
+        # Reserve a slot for pass so it's never truncated
+        num_plays = np.minimum(legal.sum(axis=1), np.where(can_pass, m - 1, m))
+        num_actions = num_plays + can_pass
+
+        self._slots[rows] = slots
+        self._num_plays[rows] = num_plays
+        self._can_pass[rows] = can_pass
+        self.num_actions[rows] = num_actions
+        self.action_mask[rows] = np.arange(m) < num_actions[:, None]
+        self.action_features[rows] = self._encode_actions(rows, player, slots, num_plays, can_pass)
+        self.states[rows] = self._encode_states(rows, player)
+        return self.states, self.action_features, self.action_mask, self.num_actions
+
+    def _refresh(self, rows: np.ndarray, player: np.ndarray) -> None:
+        """Rebuild the combo lists of stale acting hands."""
+        stale = self._stale[rows, player]
+        if not stale.any():
+            return
+        rows, player = rows[stale], player[stale]
+        mask, combo, size, top, suited, count = _candidates(self.hands[rows, player])
+        n = combo.shape[1]
+        if n > self._capacity:
+            self._grow(n)
+        for name, values in (
+            ("_cand_mask", mask), ("_cand_combo", combo), ("_cand_size", size),
+            ("_cand_top", top), ("_cand_suited", suited),
+        ):
+            cache = getattr(self, name)
+            cache[rows, player] = 0
+            cache[rows, player, :n] = values
+        self._num_cand[rows, player] = count
+        self._stale[rows, player] = False
+        self._map_stale[rows, player] = True
+
+    def _combo_maps(self, rows: np.ndarray, player: np.ndarray) -> np.ndarray:
+        """Per-card combo type counts over the acting hands' opening plays
+        (bombs excluded), as game-server.ts computeComboTypeMap."""
+        stale = self._map_stale[rows, player]
+        if stale.any():
+            b, p = rows[stale], player[stale]
+            n = int(self._num_cand[b, p].max())
+            combo = self._cand_combo[b, p, :n]
+            kinds = np.eye(NUM_ACTION_COMBO_TYPES, dtype=np.float32)[combo]
+            kinds[(combo == BOMB) | (np.arange(n) >= self._num_cand[b, p, None])] = 0
+            bits = unpack_masks(self._cand_mask[b, p, :n]).astype(np.float32)
+            combo_map = np.matmul(bits.transpose(0, 2, 1), kinds)
+            self._combo_map[b, p] = combo_map.reshape(b.size, -1)
+            self._map_stale[b, p] = False
+        return self._combo_map[rows, player]
+
+    def _grow(self, n: int) -> None:
+        pad = max(n, 2 * self._capacity) - self._capacity
+        for name in ("_cand_mask", "_cand_combo", "_cand_size", "_cand_top", "_cand_suited"):
+            setattr(self, name, np.pad(getattr(self, name), ((0, 0), (0, 0), (0, pad))))
+        self._capacity += pad
+
+    def _legal(self, rows: np.ndarray, player: np.ndarray) -> np.ndarray:
+        """(rows, capacity) mask of the acting hand's combos that beat lastPlay."""
+        legal = _beats(
+            self._cand_combo[rows, player], self._cand_size[rows, player],
+            self._cand_top[rows, player], self._cand_suited[rows, player],
+            self.last_combo[rows, None], self.last_size[rows, None],
+            self.last_top[rows, None], self.last_suited[rows, None],
+        )
+        return legal & (np.arange(self._capacity) < self._num_cand[rows, player, None])
+
+    def _greedy(self, rows: np.ndarray, player: np.ndarray) -> np.ndarray:
+        """Candidate index of the greedy bot's move in each row, -1 to pass."""
+        self._refresh(rows, player)
+        return _greedy_choice(
+            self._legal(rows, player), self._cand_mask[rows, player],
+            self._cand_combo[rows, player], self._cand_size[rows, player],
+            self._cand_top[rows, player], self.hands[rows, player], self.last_combo[rows] < 0,
+        )
+
+    def _encode_actions(
+        self, rows: np.ndarray, player: np.ndarray, slots: np.ndarray,
+        num_plays: np.ndarray, can_pass: np.ndarray,
+    ) -> np.ndarray:
+        """features.encode_action per play slot, then encode_pass_action."""
+        m = self.max_actions
+        is_play = np.arange(m) < num_plays[:, None]
+        player = player[:, None]
+        masks = np.where(is_play, self._cand_mask[rows[:, None], player, slots], np.uint64(0))
+        out = np.zeros((rows.size, m, ACTION_SIZE), dtype=np.float32)
+        out[..., :DECK_SIZE] = unpack_masks(masks)
+        r, s = np.nonzero(is_play)
+        combo = self._cand_combo[rows[r], player[r, 0], slots[r, s]]
+        out[r, s, _ACTION_COMBO + combo] = 1
+        out[r, s, _ACTION_SIZE_COL] = self._cand_size[rows[r], player[r, 0], slots[r, s]] / 13.0
+        out[r, s, _ACTION_TOP] = self._cand_top[rows[r], player[r, 0], slots[r, s]] / 51.0
+        out[r, s, _ACTION_SUITED] = self._cand_suited[rows[r], player[r, 0], slots[r, s]]
+        passing = np.flatnonzero(can_pass)
+        out[passing, num_plays[passing], _ACTION_PASS] = 1
+        return out
+
+    def _encode_states(self, rows: np.ndarray, player: np.ndarray) -> np.ndarray:
+        """features.encode_state for the acting player of each row."""
+        k = rows.size
+        out = np.zeros((k, STATE_SIZE), dtype=np.float32)
+        idx = np.arange(k)
+        opponents = (player[:, None] + _OPPONENTS) % NUM_PLAYERS
+
+        out[:, _COMBO_MAP:_PLAYED] = self._combo_maps(rows, player)
+        played = self.played[rows]
+        all_played = np.bitwise_or.reduce(played, axis=1)
+        out[:, _PLAYED:_OPP_PLAYED] = unpack_masks(all_played)
+        opp_played = np.take_along_axis(played, opponents, axis=1)
+        out[:, _OPP_PLAYED:_OPP_SIZES] = unpack_masks(opp_played).reshape(k, -1)
+
+        sizes = np.bitwise_count(self.hands[rows]).astype(np.int64)
+        opp_sizes = np.take_along_axis(sizes, opponents, axis=1)
+        out[:, _OPP_SIZES:_LAST_CARDS] = opp_sizes / 13.0
+
+        out[:, _LAST_CARDS:_LAST_COMBO] = unpack_masks(self.last_mask[rows])
+        last_combo = self.last_combo[rows]
+        has_last = last_combo >= 0
+        out[idx, _LAST_COMBO + np.where(has_last, last_combo, POWER_INDEX)] = 1
+        out[:, _LAST_SUITED] = self.last_suited[rows] & has_last
+        rel = (self.last_by[rows] - player) % NUM_PLAYERS
+        out[idx[has_last], _LAST_BY + rel[has_last]] = 1
+
+        out[:, _PASSED:_IN_GAME] = np.take_along_axis(~self.in_round[rows], opponents, axis=1)
+        out[:, _IN_GAME:_WIN_FILLED] = np.take_along_axis(self.in_game[rows], opponents, axis=1)
+        out[:, _WIN_FILLED:_UNSEEN] = np.arange(3) < self.num_won[rows, None]
+
+        own = self.hands[rows, player]
+        out[:, _UNSEEN:_ADVANTAGE] = unpack_masks(~(own | all_played) & _FULL_DECK)
+        out[:, _ADVANTAGE:_COMBO_HISTORY] = (sizes[idx, player][:, None] - opp_sizes) / 13.0
+        history = np.take_along_axis(self.combos_played[rows], opponents[:, :, None], axis=1)
+        out[:, _COMBO_HISTORY:_COMBO_HISTORY + 3 * NUM_ACTION_COMBO_TYPES] = (
+            history.reshape(k, -1) / 5.0
+        )
+        return out
+
+    # ── Stepping ──
+
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        """Apply one encoded action index per active game (others are ignored).
+
+        Returns the rows whose game finished on this step.
+        """
+        if not self._observed:
+            raise RuntimeError("step() needs an observe() since the last step or reset")
+        self._observed = False
+        rows = np.flatnonzero(~self.done)
+        actions = np.asarray(actions, dtype=np.int64)[rows]
+        if np.any((actions < 0) | (actions >= self.num_actions[rows])):
+            bad = rows[(actions < 0) | (actions >= self.num_actions[rows])][0]
+            raise ValueError(f"Invalid action for game {bad}: {actions[rows == bad][0]}")
+
+        passing = self._can_pass[rows] & (actions == self._num_plays[rows])
+        playing = rows[~passing]
+        self._play(playing, self._slots[playing, actions[~passing]])
+        self._pass(rows[passing])
+        self._auto_play()
+        return rows[self.done[rows]]
+
+    def step_greedy(self) -> np.ndarray:
+        """Play the greedy bot's move in every active game; returns the rows
+        whose game finished. Needs no observe() and isn't limited to the
+        max_actions encoded slots."""
+        self._observed = False
+        rows = np.flatnonzero(~self.done)
+        self._greedy_move(rows)
+        self._auto_play()
+        return rows[self.done[rows]]
+
+    def greedy_actions(self) -> np.ndarray:
+        """The greedy bot's move as an action index into the last observation,
+        per game: -1 for finished games and where the move was truncated."""
+        if not self._observed:
+            raise RuntimeError("greedy_actions() needs an observe() since the last step or reset")
+        actions = np.full(self.num_games, -1, dtype=np.int64)
+        rows = np.flatnonzero(~self.done)
+        choice = self._greedy(rows, self.current_player[rows])
+        num_plays = self._num_plays[rows]
+        slot = np.argmax(self._slots[rows] == choice[:, None], axis=1)
+        shown = (self._slots[rows, slot] == choice) & (slot < num_plays)
+        actions[rows] = np.where(choice < 0, num_plays, np.where(shown, slot, -1))
+        return actions
+
+    def _greedy_move(self, rows: np.ndarray) -> None:
+        choice = self._greedy(rows, self.current_player[rows])
+        self._play(rows[choice >= 0], choice[choice >= 0])
+        self._pass(rows[choice < 0])
+
+    def _auto_play(self) -> None:
+        """Greedy seats move until another seat is to play (or the game ends)."""
+        if not self.greedy_seats:
+            return
+        seats = np.array(self.greedy_seats)
+        while True:
+            rows = np.flatnonzero(~self.done & np.isin(self.current_player, seats))
+            if rows.size == 0:
+                return
+            self._greedy_move(rows)
+
+    def _play(self, rows: np.ndarray, cand: np.ndarray) -> None:
+        """Play each row's candidate `cand` of the acting hand."""
+        player = self.current_player[rows]
+        mask = self._cand_mask[rows, player, cand]
+        combo = self._cand_combo[rows, player, cand]
+        # A run stays suited only as the answer to a suited run (or when opened suited)
+        suited = (combo == RUN) & np.where(
+            self.last_combo[rows] >= 0, self.last_suited[rows], self._cand_suited[rows, player, cand],
+        )
+        self.hands[rows, player] &= ~mask
+        self.played[rows, player] |= mask
+        self.combos_played[rows, player, combo] += 1
+        self._stale[rows, player] = True
+        self.last_mask[rows] = mask
+        self.last_combo[rows] = combo
+        self.last_size[rows] = self._cand_size[rows, player, cand]
+        self.last_top[rows] = self._cand_top[rows, player, cand]
+        self.last_suited[rows] = suited
+        self.last_by[rows] = player
+
+        won = self.hands[rows, player] == 0
+        self._player_wins(rows[won])
+        rows = rows[~won]
+        self._advance_turn(rows)
+        self._reset_round(rows[self.current_player[rows] == self.last_by[rows]])
+
+    def _pass(self, rows: np.ndarray) -> None:
+        self.in_round[rows, self.current_player[rows]] = False
+        over = self._round_over(rows)
+        # Power goes to the trick winner, or the next player still in the game
+        won_trick = rows[over]
+        self.current_player[won_trick] = self.last_by[won_trick]
+        out = won_trick[~self.in_game[won_trick, self.current_player[won_trick]]]
+        self._next_in_game(out)
+        self._reset_round(won_trick)
+        rows = rows[~over]
+        self._advance_turn(rows)
+        self._reset_round(rows[self.current_player[rows] == self.last_by[rows]])
+
+    def _player_wins(self, rows: np.ndarray) -> None:
+        player = self.current_player[rows]
+        self.in_game[rows, player] = False
+        self.in_round[rows, player] = False
+        self.win_order[rows, self.num_won[rows]] = player
+        self.num_won[rows] += 1
+        last_one = self.in_game[rows].sum(axis=1) == 1
+        over = rows[last_one]
+        self.win_order[over, self.num_won[over]] = np.argmax(self.in_game[over], axis=1)
+        self.num_won[over] += 1
+        self.done[over] = True
+        # Power passes to the left of the winner
+        rows = rows[~last_one]
+        self._advance_turn(rows)
+        self._reset_round(rows[self._round_over(rows)])
+
+    def _round_over(self, rows: np.ndarray) -> np.ndarray:
+        return ~np.any(self.in_game[rows] & self.in_round[rows], axis=1)
+
+    def _reset_round(self, rows: np.ndarray) -> None:
+        self.last_mask[rows] = 0
+        self.last_combo[rows] = -1
+        self.last_size[rows] = 0
+        self.last_top[rows] = -1
+        self.last_suited[rows] = False
+        self.last_by[rows] = -1
+        self.in_round[rows] = self.in_game[rows]
+
+    def _advance_turn(self, rows: np.ndarray) -> None:
+        """Clockwise to the next player still in the round; a full circle resets it."""
+        seats = (self.current_player[rows, None] + _CLOCKWISE) % NUM_PLAYERS
+        active = self.in_game[rows] & self.in_round[rows]
+        eligible = np.take_along_axis(active, seats, axis=1)
+        found = eligible.any(axis=1)
+        moved = rows[found]
+        self.current_player[moved] = seats[found, np.argmax(eligible[found], axis=1)]
+        circled = rows[~found]
+        self._reset_round(circled)
+        # The player who circled back may have won already
+        self._next_in_game(circled[~self.in_game[circled, self.current_player[circled]]])
+
+    def _next_in_game(self, rows: np.ndarray) -> None:
+        seats = (self.current_player[rows, None] + _CLOCKWISE) % NUM_PLAYERS
+        in_game = np.take_along_axis(self.in_game[rows], seats, axis=1)
+        found = in_game.any(axis=1)
+        self.current_player[rows[found]] = seats[found, np.argmax(in_game[found], axis=1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BatchedGameEnv")
+    parser.add_argument("--games", type=int, default=256)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env = BatchedGameEnv(args.games, seed=args.seed, greedy_seats=(1, 2, 3))
+    rng = np.random.default_rng(args.seed)
+    env.reset()
+    decisions = finished = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, _, num_actions = env.observe()
+        actions = (rng.random(args.games) * num_actions).astype(np.int64)
+        decisions += int(np.count_nonzero(num_actions))
+        done = env.step(actions)
+        finished += done.size
+        env.reset(done)
+    elapsed = time.perf_counter() - start
+    print(f"{decisions / elapsed:,.0f} decisions/s, {finished / elapsed:,.0f} games/s "
+          f"({args.games} games in lockstep, random seat 0 vs greedy)")
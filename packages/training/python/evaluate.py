@@ -6,6 +6,10 @@ Two modes:
                  and average finish position (model controls all 4 seats).
   --data FILE    Replay JSONL data and compare model choices to greedy bot.
 
+With --server-side, the --vs-greedy and --vs-greedy-tourney evaluations load
+the model into the game server and play every game there (bulk "simulate"
+command), returning only aggregates instead of one round trip per move.
+
 Usage:
     python evaluate.py --model bot.onnx --self-play [--games 1000]
     python evaluate.py --model bot.onnx --data greedy-10k.jsonl [--games 1000]
@@ -15,6 +19,7 @@ import argparse
 import json
 import random
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 import numpy as np
@@ -58,14 +63,51 @@ class OnnxBot:
         return int(np.argmax(scores[:num_actions]))
 
 
+def _turn_features(turn) -> tuple[np.ndarray, list[np.ndarray]]:
+    """State features and per-action features (pass last) for the acting player."""
+    if turn.state_features is not None:
+        state = turn.state_features
+        action_list = list(turn.action_features)
+    else:
+        state = encode_state(turn.state, turn.player)
+        action_list = [encode_action(cards) for cards in turn.valid_actions]
+    if turn.can_pass:
+        action_list.append(encode_pass_action())
+    return state, action_list
+
+
+@contextmanager
+def _eval_bridge(pool=None, engine: str = "node"):
+    """Borrow a warm bridge from a game_bridge.BridgePool, or start a fresh one.
+
+    engine="python" plays on the in-process thirteen_engine instead.
+    """
+    from game_bridge import GameBridge
+
+    if engine == "python":
+        from thirteen_engine import EngineBridge
+
+        with EngineBridge() as bridge:
+            yield bridge
+    elif pool is not None:
+        with pool.bridge() as bridge:
+            yield bridge
+    else:
+        with GameBridge(encode_features=True) as bridge:
+            yield bridge
+
+
 def _run_eval(bridge, bot, games: int, num_model_seats: int, opponent: str = "greedy"):
     """Play games with randomized seat assignments and collect model finish positions.
 
-    opponent: "greedy" (handled by bridge) or "random" (handled in Python).
+    opponent: "greedy" or "random"; either way the bridge plays the opponent
+    seats, so every turn returned here is a model decision.
     """
     import random
-    from game_bridge import GameOver
+    from game_bridge import GameOver, encoder_projection
 
+    # Turns carry only what _turn_features reads
+    projection = encoder_projection(bridge.encode_features)
     all_positions: list[int] = []  # 1-indexed finish positions for model seats
 
     for g in range(games):
@@ -73,30 +115,26 @@ def _run_eval(bridge, bot, games: int, num_model_seats: int, opponent: str = "gr
         random.shuffle(seats)
         model_seats = set(seats[:num_model_seats])
 
+        opponent_seats = [s for s in range(4) if s not in model_seats]
+        # Single-option model moves are played by the server (auto_forced)
         if opponent == "greedy":
-            greedy_seats = [s for s in range(4) if s not in model_seats]
-            result = bridge.new_game(greedy_seats=greedy_seats)
+            result = bridge.new_game(
+                greedy_seats=opponent_seats, auto_forced=True, projection=projection,
+            )
         else:
-            # All seats handled in Python (model + random)
-            result = bridge.new_game()
+            result = bridge.new_game(
+                random_seats=opponent_seats, auto_forced=True, projection=projection,
+            )
 
         while not isinstance(result, GameOver):
             turn = result
-            num_actions = len(turn.valid_actions) + (1 if turn.can_pass else 0)
+            num_actions = turn.num_actions + (1 if turn.can_pass else 0)
 
             if num_actions == 0:
                 break
 
-            if turn.player in model_seats:
-                state = encode_state(turn.state, turn.player)
-                action_list = [encode_action(cards) for cards in turn.valid_actions]
-                if turn.can_pass:
-                    action_list.append(encode_pass_action())
-                choice = bot.choose_action_index(state, action_list)
-            else:
-                # Random opponent: uniform random action
-                choice = random.randrange(num_actions)
-
+            state, action_list = _turn_features(turn)
+            choice = bot.choose_action_index(state, action_list)
             result = bridge.step(choice)
 
         if isinstance(result, GameOver):
@@ -111,6 +149,16 @@ def _run_eval(bridge, bot, games: int, num_model_seats: int, opponent: str = "gr
     return all_positions
 
 
+def _simulated_positions(result, num_model_seats: int) -> list[int]:
+    """1-indexed finish positions of the model slots from a SimulationResult."""
+    return [
+        rank + 1
+        for slot in range(num_model_seats)
+        for rank, count in enumerate(result.positions[slot])
+        for _ in range(count)
+    ]
+
+
 def _print_eval_results(label: str, all_positions: list[int], games: int):
     """Print evaluation results for a configuration."""
     n = len(all_positions)
@@ -125,14 +173,18 @@ def _print_eval_results(label: str, all_positions: list[int], games: int):
     print(f"    1st: {pos_counts[0]:4d} ({pos_counts[0]/n:.1%})  2nd: {pos_counts[1]:4d} ({pos_counts[1]/n:.1%})  3rd: {pos_counts[2]:4d} ({pos_counts[2]/n:.1%})  4th: {pos_counts[3]:4d} ({pos_counts[3]/n:.1%})")
 
 
-def evaluate_vs_greedy(model_path: str, games: int = 1000):
+def evaluate_vs_greedy(
+    model_path: str, games: int = 1000, pool=None, server_side: bool = False,
+    engine: str = "node",
+):
     """
     Evaluate ONNX model against greedy and random bots
-    with randomized seat assignments each game.
+    with randomized seat assignments each game. Pass a BridgePool to reuse a
+    warm game server instead of starting one. server_side plays the model in
+    the game server (needs onnxruntime-node there) via bridge.simulate.
+    engine="python" plays on thirteen_engine (not with server_side).
     """
-    from game_bridge import GameBridge
-
-    bot = OnnxBot(model_path)
+    bot = None if server_side else OnnxBot(model_path)
 
     configs = [
         ("1 model vs 3 greedy", 1, "greedy"),
@@ -143,10 +195,17 @@ def evaluate_vs_greedy(model_path: str, games: int = 1000):
 
     print(f"Evaluating model ({games} games per config)...")
 
-    with GameBridge() as bridge:
+    with _eval_bridge(pool, engine) as bridge:
+        if server_side:
+            bridge.load_model("eval", model_path)
         for label, num_model_seats, opponent in configs:
             print(f"\n  Running: {label}...", file=sys.stderr)
-            positions = _run_eval(bridge, bot, games, num_model_seats, opponent)
+            if server_side:
+                seats = ["model:eval"] * num_model_seats + [opponent] * (4 - num_model_seats)
+                result = bridge.simulate(seats, games=games)
+                positions = _simulated_positions(result, num_model_seats)
+            else:
+                positions = _run_eval(bridge, bot, games, num_model_seats, opponent)
             _print_eval_results(label, positions, games)
 
 
@@ -223,32 +282,55 @@ def evaluate_replay(model_path: str, data_path: str, games: int = 1000):
     print(f"  (1.0 = perfect clone of greedy bot)")
 
 
-def evaluate_tourney(model_path: str, tourneys: int = 100, target_score: int = 21):
+def evaluate_tourney(
+    model_path: str,
+    tourneys: int = 100,
+    target_score: int = 21,
+    pool=None,
+    server_side: bool = False,
+    engine: str = "node",
+):
     """Run full tournaments: 1 model seat vs 3 greedy bots.
 
     Reports: tournament win rate, average finish position, score distribution.
+    server_side plays whole tournaments in the game server via bridge.simulate.
+    engine="python" plays on thirteen_engine (not with server_side).
     """
-    from game_bridge import GameBridge, GameOver, TourneyOver
+    from game_bridge import GameOver, TourneyOver, encoder_projection
 
-    bot = OnnxBot(model_path)
+    bot = None if server_side else OnnxBot(model_path)
     tourney_wins = 0
     tourney_positions = []  # 1=1st, 2=2nd, etc. in final standings
 
-    with GameBridge() as bridge:
-        for t in range(tourneys):
+    with _eval_bridge(pool, engine) as bridge:
+        if server_side:
+            bridge.load_model("eval", model_path)
+            result = bridge.simulate(
+                ["model:eval", "greedy", "greedy", "greedy"],
+                tourneys=tourneys, target_score=target_score,
+            )
+            tourney_positions = [
+                rank + 1
+                for rank, count in enumerate(result.tourney_positions[0])
+                for _ in range(count)
+            ]
+            tourney_wins = result.tourney_positions[0][0]
+
+        projection = encoder_projection(bridge.encode_features)
+        for t in range(0 if server_side else tourneys):
             model_seat = random.randrange(4)
             greedy_seats = [s for s in range(4) if s != model_seat]
 
-            result = bridge.new_tourney(greedy_seats=greedy_seats, target_score=target_score)
+            result = bridge.new_tourney(
+                greedy_seats=greedy_seats, target_score=target_score, auto_forced=True,
+                projection=projection,
+            )
 
             while True:
                 # Play one game
                 while not isinstance(result, GameOver):
                     turn = result
-                    state = encode_state(turn.state, turn.player)
-                    action_list = [encode_action(cards) for cards in turn.valid_actions]
-                    if turn.can_pass:
-                        action_list.append(encode_pass_action())
+                    state, action_list = _turn_features(turn)
 
                     if not action_list:
                         break
@@ -258,7 +340,10 @@ def evaluate_tourney(model_path: str, tourneys: int = 100, target_score: int = 2
 
                 if isinstance(result, GameOver):
                     win_order = result.win_order
-                    result = bridge.next_game(win_order=win_order, greedy_seats=greedy_seats)
+                    result = bridge.next_game(
+                        win_order=win_order, greedy_seats=greedy_seats, auto_forced=True,
+                        projection=projection,
+                    )
 
                 if isinstance(result, TourneyOver):
                     # Determine model's final position
@@ -296,12 +381,22 @@ if __name__ == "__main__":
                         help="Number of tournaments to play")
     parser.add_argument("--target-score", type=int, default=21,
                         help="Tournament target score")
+    parser.add_argument("--server-side", action="store_true",
+                        help="Play the model inside the game server (bulk simulate)")
+    parser.add_argument("--engine", choices=["node", "python"], default="node",
+                        help="Game engine: the TS game server (node) or the in-process "
+                             "Python port (thirteen_engine)")
     args = parser.parse_args()
+    if args.engine == "python" and args.server_side:
+        parser.error("--server-side needs the node engine")
 
     if args.vs_greedy:
-        evaluate_vs_greedy(args.model, args.games)
+        evaluate_vs_greedy(args.model, args.games, server_side=args.server_side, engine=args.engine)
     elif args.vs_greedy_tourney:
-        evaluate_tourney(args.model, args.tourneys, args.target_score)
+        evaluate_tourney(
+            args.model, args.tourneys, args.target_score,
+            server_side=args.server_side, engine=args.engine,
+        )
     elif args.data:
         evaluate_replay(args.model, args.data, args.games)
     else:
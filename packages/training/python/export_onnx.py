@@ -17,17 +17,19 @@ from features import STATE_SIZE, ACTION_SIZE
 from model import TienLenNet
 
 
-def export(model_path: str, output_path: str, max_actions: int = 80):
-    # Load model
-    model = TienLenNet()
-    model.load_state_dict(torch.load(model_path, weights_only=True))
-    model.eval()
+def export_module(
+    model: TienLenNet,
+    output_path: str,
+    max_actions: int = 80,
+    dummy_state: torch.Tensor | None = None,
+    dummy_actions: torch.Tensor | None = None,
+) -> None:
+    """Export an in-memory CPU model (in eval mode) to a self-contained ONNX file."""
+    if dummy_state is None:
+        dummy_state = torch.randn(1, STATE_SIZE)
+    if dummy_actions is None:
+        dummy_actions = torch.randn(1, max_actions, ACTION_SIZE)
 
-    # Dummy inputs matching inference shapes
-    dummy_state = torch.randn(1, STATE_SIZE)
-    dummy_actions = torch.randn(1, max_actions, ACTION_SIZE)
-
-    # Export
     torch.onnx.export(
         model,
         (dummy_state, dummy_actions),
@@ -41,15 +43,27 @@ def export(model_path: str, output_path: str, max_actions: int = 80):
         },
         opset_version=17,
     )
-    print(f"Exported ONNX model to {output_path}")
 
-    # Validate
+    # Validate, then re-save with weights inline — avoids .data sidecar file
+    # which onnxruntime-web can't load
     onnx_model = onnx.load(output_path)
     onnx.checker.check_model(onnx_model)
-    print("ONNX model validation passed")
-
-    # Re-save with weights inline — avoids .data sidecar file which onnxruntime-web can't load
     onnx.save(onnx_model, output_path, save_as_external_data=False)
+
+
+def export(model_path: str, output_path: str, max_actions: int = 80):
+    # Load model
+    model = TienLenNet()
+    model.load_state_dict(torch.load(model_path, weights_only=True))
+    model.eval()
+
+    # Dummy inputs matching inference shapes
+    dummy_state = torch.randn(1, STATE_SIZE)
+    dummy_actions = torch.randn(1, max_actions, ACTION_SIZE)
+
+    export_module(model, output_path, max_actions, dummy_state, dummy_actions)
+    print(f"Exported ONNX model to {output_path}")
+    print("ONNX model validation passed")
     print("Saved with inline weights (no external data file)")
 
     # Test inference
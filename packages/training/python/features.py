@@ -49,10 +49,15 @@ def encode_state(snapshot: dict, player_index: int) -> np.ndarray:
 
     # Hand combo type map (52 × 7 = 364) — per-card combo type breakdown
     # For each card: [single_count, pair_count, triple_count, quad_count, run_count, bomb_count, 0]
+    # Only the game server sends it: compute it for JSONL replays and other snapshots
     combo_type_map = snapshot.get("handComboTypeMap")
-    if combo_type_map:
-        for i in range(DECK_SIZE * NUM_ACTION_COMBO_TYPES):
-            out[offset + i] = combo_type_map[i]
+    if combo_type_map is None:
+        from thirteen_engine import compute_combo_type_map
+
+        combo_type_map = compute_combo_type_map(
+            sum(1 << card["value"] for card in hands[player_index])
+        )
+    out[offset:offset + DECK_SIZE * NUM_ACTION_COMBO_TYPES] = combo_type_map
     offset += DECK_SIZE * NUM_ACTION_COMBO_TYPES
 
     # Cards played total (52)
@@ -71,9 +76,11 @@ def encode_state(snapshot: dict, player_index: int) -> np.ndarray:
         offset += DECK_SIZE
 
     # Opponent hand sizes (3)
+    # Projected snapshots only carry the acting hand, plus handSizes
+    hand_sizes = snapshot.get("handSizes") or [len(h) for h in hands]
     for rel in range(1, NUM_OPPONENTS + 1):
         abs_p = (player_index + rel) % NUM_PLAYERS
-        out[offset] = len(hands[abs_p]) / 13.0
+        out[offset] = hand_sizes[abs_p] / 13.0
         offset += 1
 
     # Last play cards (52)
@@ -132,7 +139,7 @@ def encode_state(snapshot: dict, player_index: int) -> np.ndarray:
     my_size = len(hands[player_index])
     for rel in range(1, NUM_OPPONENTS + 1):
         abs_p = (player_index + rel) % NUM_PLAYERS
-        out[offset] = (my_size - len(hands[abs_p])) / 13.0
+        out[offset] = (my_size - hand_sizes[abs_p]) / 13.0
         offset += 1
 
     # Combo history (3 × 7 = 21) — per-opponent combo type counts, normalized
@@ -1,28 +1,523 @@
 """
 Bridge to the TypeScript game engine via stdin/stdout JSON-line protocol.
 
-Spawns a persistent Node.js subprocess running the game server.
-Python sends commands, receives game state responses.
+Spawns a persistent Node.js subprocess running the game server: the prebuilt
+bundle (`yarn workspace @thirteen/game-logic build:game-server`) straight
+with node when it is up to date, otherwise the TS source via yarn + tsx.
+Python sends commands, receives game state responses. BridgePool keeps warm
+server processes ready to hand out. One process can host
+many concurrent games via GameSession handles (see GameBridge.session).
+
+Responses can optionally use length-prefixed binary frames instead of JSON
+lines (GameBridge(protocol="binary")); the layout is documented in
+packages/game-logic/src/training/bridge-frames.ts. A binary TurnInfo is a
+lazy view over its frame: state, valid_actions and the rest decode on first
+access, and num_actions, win_order, hand_mask() and action_masks() read the
+frame without building card dicts.
+
+With GameBridge(encode_features=True) the server also runs the TS state and
+action encoders and ships the float32 tensors; TurnInfo.state_features and
+TurnInfo.action_features are then zero-copy numpy views over the response.
+
+With GameBridge(delta=True) JSON turns after the first of each game carry only
+the new play log entries; a SnapshotTracker per game rebuilds the full state.
+
+AsyncGameBridge is the asyncio counterpart for driving many in-flight games
+from one event loop.
+
+GameBridge(transport="shm") moves commands and (binary) responses off the
+pipes into ring slots of a memory-mapped file; see shm-transport.ts.
+
+GameBridge.load_model() loads an ONNX policy into the server; seats given as
+model_seats={seat: model_id} are then played server-side like greedy seats.
+
+GameBridge.simulate() plays whole games or tournaments server-side with fixed
+seat policies ("greedy", "random", "model:<model_id>") and returns only the
+aggregate finishing positions and points (SimulationResult).
+
+new_game(auto_forced=True) has the server also play moves that have a single
+legal option (usually a pass with nothing playable) for the remaining seats;
+TurnInfo.forced counts them and auto_forced="record" lists them, so reward
+bookkeeping can replay what it did not see. GameBridge(record_seats=True) adds
+the moves the server plays for random and model seats to the same list
+(TurnInfo.forced_moves, marked "seat": True), with or without auto_forced.
+Moves played after the caller's last turn arrive on GameOver the same way.
+
+new_game(projection={...}) trims that game's turn responses to the fields the
+caller reads: {"hands": "own+sizes"} keeps only the acting player's hand in
+TurnInfo.state (with state["handSizes"] for every seat), {"valid_actions":
+"values"} gives each valid action as a list of card values, and
+{"no_combo_map": True} drops state["handComboTypeMap"].
+
+RecordingBridge(path, ...) writes a GameBridge's commands and raw responses to
+a transcript file; ReplayBridge(path) serves them back through the same API
+without a server, checking each command, for Node-free profiling and
+benchmarks of the Python side.
+
+GameBridge(prefetch=True) has the server deal and auto-play a session's next
+game as soon as the current one ends, while it would otherwise wait on the
+client; the next new_game / new_tourney / next_game with the same seats (or
+those announced with new_game(..., next_seats={...})) gets that game's first
+turn without the deal and auto-play latency.
+
+GameBridge.stats() reports per-command round-trip latency histograms and
+payload sizes, split into write / wait / decode time, alongside the server's
+own compute time (the "stats" command).
 """
 
+import asyncio
+import base64
+import functools
 import json
+import mmap
+import os
+import shutil
+import struct
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 
+import numpy as np
+
+from features import ACTION_SIZE, STATE_SIZE
+
+COMBO_NAMES = ["SINGLE", "PAIR", "TRIPLE", "QUAD", "RUN", "BOMB", "INVALID"]
+
+# Shared CardData dicts indexed by card value — decoded frames reuse these
+# instead of allocating a dict per card. Treat them as read-only.
+CARD_DATA = [{"rank": v // 4, "suit": v % 4, "value": v} for v in range(52)]
+
+# Set bit positions for every byte value, for fast mask → card list decoding
+_BYTE_BITS = [tuple(i for i in range(8) if b >> i & 1) for b in range(256)]
+
+# ⚠️  SYNC WARNING: Must match the turn payload layout in bridge-frames.ts.
+_TURN_HEADER = struct.Struct("<BBBBbBBBB4sBH4Q4QQ28s364s4h3HHHH")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+FRAME_TURN = 0
+FRAME_GAME_OVER = 1
+FRAME_BATCH = 2
+FRAME_JSON = 255
+
+
+def mask_cards(mask: int) -> list[dict]:
+    """Card dicts (ascending by value) for the set bits of a 52-bit mask."""
+    cards = []
+    base = 0
+    while mask:
+        for bit in _BYTE_BITS[mask & 0xFF]:
+            cards.append(CARD_DATA[base + bit])
+        mask >>= 8
+        base += 8
+    return cards
+
+
+def _decode_state(payload: bytes | memoryview) -> dict:
+    """The GameStateSnapshot dict carried by a binary turn frame."""
+    (
+        _, player, flags, current_player, last_play_by, combo,
+        passed_bits, in_game_bits, win_len, win_bytes, projection, hand_sizes,
+        h0, h1, h2, h3, p0, p1, p2, p3, last_mask,
+        combo_counts, combo_map, s0, s1, s2, s3,
+        target_score, game_number, expected_total, _, _, _,
+    ) = _TURN_HEADER.unpack_from(payload)
+
+    if projection & 1:
+        hands = [[], [], [], []]
+        hands[player] = mask_cards((h0, h1, h2, h3)[player])
+    else:
+        hands = [mask_cards(h0), mask_cards(h1), mask_cards(h2), mask_cards(h3)]
+    state: dict = {
+        "hands": hands,
+        "currentPlayer": current_player,
+        "lastPlay": {
+            "combo": COMBO_NAMES[combo],
+            "cards": mask_cards(last_mask),
+            "suited": bool(flags & 4),
+        } if flags & 2 else None,
+        "lastPlayBy": last_play_by,
+        "passedPlayers": [bool(passed_bits >> p & 1) for p in range(4)],
+        "winOrder": list(win_bytes[:win_len]),
+        "playersInGame": [bool(in_game_bits >> p & 1) for p in range(4)],
+        "cardsPlayedByPlayer": [mask_cards(p0), mask_cards(p1), mask_cards(p2), mask_cards(p3)],
+        "combosPlayedByPlayer": [
+            {COMBO_NAMES[c]: n for c, n in enumerate(combo_counts[p * 7:p * 7 + 7]) if n}
+            for p in range(4)
+        ],
+    }
+    if projection & 1:
+        state["handSizes"] = [hand_sizes >> (p * 4) & 15 for p in range(4)]
+    if not projection & 2:
+        state["handComboTypeMap"] = list(combo_map)
+    if flags & 8:
+        state["tourneyContext"] = {
+            "scores": [s0, s1, s2, s3],
+            "targetScore": target_score,
+            "gameNumber": game_number,
+            "expectedTotalGames": expected_total,
+        }
+    return state
+
+
+def _decode_record(frame: bytes | memoryview, pos: int) -> tuple[list[dict], int]:
+    """Move record at pos (u16 count, then the entries), and the offset past it."""
+    (count,) = _U16.unpack_from(frame, pos)
+    pos += 2
+    moves = []
+    for _ in range(count):
+        info, n = frame[pos], frame[pos + 1]
+        move = {
+            "player": info & 3,
+            "can_pass": bool(info & 4),
+            "cards": list(frame[pos + 2:pos + 2 + n]),
+        }
+        if info & 8:
+            move["seat"] = True
+        moves.append(move)
+        pos += 2 + n
+    return moves, pos
+
+
+def _decode_payload(payload: bytes | memoryview) -> dict:
+    """Decode one binary frame payload into the equivalent JSON response dict.
+
+    Turn frames are left undecoded as {"type": "turn", "frame": payload}, for
+    TurnInfo to read lazily.
+    """
+    frame_type = payload[0]
+    if frame_type == FRAME_TURN:
+        return {"type": "turn", "frame": payload}
+    if frame_type == FRAME_GAME_OVER:
+        end = 2 + payload[1]
+        resp = {"type": "game_over", "win_order": list(payload[2:end])}
+        if len(payload) > end:
+            (resp["forced"],) = _U16.unpack_from(payload, end)
+            resp["forced_moves"] = _decode_record(payload, end + 2)[0]
+        return resp
+    if frame_type == FRAME_BATCH:
+        (count,) = _U16.unpack_from(payload, 1)
+        view = memoryview(payload)  # sub-payloads share the frame buffer
+        responses = []
+        pos = 3
+        for _ in range(count):
+            (n,) = _U32.unpack_from(payload, pos)
+            responses.append(_decode_payload(view[pos + 4:pos + 4 + n]))
+            pos += 4 + n
+        return {"type": "batch", "responses": responses}
+    if frame_type == FRAME_JSON:
+        return json.loads(bytes(payload[1:]))
+    raise RuntimeError(f"Unknown frame type: {frame_type}")
+
+
+def encoder_projection(server_encoded: bool) -> dict:
+    """The smallest turn projection that encode_state / encode_action callers need.
+
+    They read the acting hand in full but only the sizes of the others; with
+    server-encoded features (server_encoded) the valid actions are only
+    counted and the combo map goes unused.
+    """
+    if server_encoded:
+        return {"hands": "own+sizes", "valid_actions": "values", "no_combo_map": True}
+    return {"hands": "own+sizes"}
+
+
+def _features_array(data: str | np.ndarray, shape: tuple[int, ...]) -> np.ndarray:
+    """Features arrive as numpy views (binary frames) or base64 strings (JSON)."""
+    if isinstance(data, str):
+        data = np.frombuffer(base64.b64decode(data), dtype="<f4")
+    return data.reshape(shape)
+
+
+class SnapshotTracker:
+    """Rebuilds full game snapshots from the server's delta turn responses.
+
+    Seeded with the full state of a game's first turn; apply() folds in each
+    "turn_delta" and returns a new state dict. Earlier states are never
+    mutated (unchanged lists are shared between them), so callers may keep
+    references to past TurnInfo.state objects.
+    """
+
+    def __init__(self, state: dict):
+        self.state = state
+
+    def apply(self, resp: dict) -> dict:
+        prev = self.state
+        hands = list(prev["hands"])
+        played = list(prev["cardsPlayedByPlayer"])
+        combos = list(prev["combosPlayedByPlayer"])
+        last_play = prev["lastPlay"]
+        last_play_by = prev["lastPlayBy"]
+
+        if "hand" in resp:
+            # "own+sizes" projection: only the acting hand is tracked
+            hands = [[], [], [], []]
+            hands[resp["player"]] = resp["hand"]
+
+        for event in resp["events"]:
+            if event == "round_reset":
+                last_play = None
+                last_play_by = -1
+                continue
+            play = event["play"]
+            if play == "pass":
+                continue
+            p = event["player"]
+            values = {c["value"] for c in play["cards"]}
+            hands[p] = [c for c in hands[p] if c["value"] not in values]
+            played[p] = played[p] + play["cards"]
+            combos[p] = {**combos[p], play["combo"]: combos[p].get(play["combo"], 0) + 1}
+            last_play = play
+            last_play_by = p
+
+        state = {
+            "hands": hands,
+            "currentPlayer": resp["player"],
+            "lastPlay": last_play,
+            "lastPlayBy": last_play_by,
+            "passedPlayers": resp["passed_players"],
+            "winOrder": resp["win_order"],
+            "playersInGame": resp["players_in_game"],
+            "cardsPlayedByPlayer": played,
+            "combosPlayedByPlayer": combos,
+        }
+        if "hand_sizes" in resp:
+            state["handSizes"] = resp["hand_sizes"]
+        if "hand_combo_type_map" in resp:
+            state["handComboTypeMap"] = resp["hand_combo_type_map"]
+        if resp["tourney_context"] is not None:
+            state["tourneyContext"] = resp["tourney_context"]
+        self.state = state
+        return state
+
+
+_UNSET = object()
+
+# Header fields read up front from turn frames
+_FRAME_PLAYER = 1
+_FRAME_FLAGS = 2
+_FRAME_WIN_ORDER = 8
+_FRAME_PROJECTION = 13
+_FRAME_HANDS = 16
+_FRAME_FORCED = 494
+_FRAME_NUM_ACTIONS = 496
+_U64 = struct.Struct("<Q")
+
 
-@dataclass
 class TurnInfo:
-    state: dict
-    player: int
-    valid_actions: list[list[dict]]
-    can_pass: bool
+    """A turn awaiting a decision from `player`.
+
+    Built from a JSON turn response, or lazily over a binary turn frame:
+    only player, can_pass and forced are read up front, and state,
+    valid_actions, forced_moves and the feature arrays are decoded on first
+    access. Seats that only need num_actions / can_pass (random seats,
+    forced moves) then cost almost nothing. num_actions, win_order,
+    hand_mask(), action_masks() and action_values() read straight from the
+    frame without building card dicts.
+
+    Decoded fields are cached; treat them as read-only. Over the shm
+    transport the frame starts out as a view of its ring slot; the turn
+    copies it only if it is still alive when the bridge sends its next
+    request. Feature arrays are views of the frame, so copy any taken from
+    an shm turn before then (train_ppo.encode_turn does).
+    """
+
+    __slots__ = (
+        "player", "can_pass", "forced",
+        "_frame", "_state", "_valid_actions", "_forced_moves",
+        "_state_features", "_action_features", "__weakref__",
+    )
+
+    def __init__(
+        self,
+        state: dict,
+        player: int,
+        # Card dicts per action, or card values under the "values" projection
+        valid_actions: list[list[dict]] | list[list[int]],
+        can_pass: bool,
+        # Server-encoded features (encode_features=True), read-only float32
+        # arrays: state (STATE_SIZE,) for `player`, and one ACTION_SIZE row
+        # per valid action (the pass action is not included). Base64 strings
+        # from JSON responses are decoded on first access.
+        state_features: np.ndarray | str | None = None,
+        action_features: np.ndarray | str | None = None,
+        # auto_forced: moves with a single legal option that the server
+        # played since the previous response, and with auto_forced="record"
+        # the moves themselves in order: {"player", "can_pass", "cards":
+        # [card values]} ([] = pass). With record_seats the list also holds
+        # the random and model seats' moves, with "seat": True.
+        forced: int = 0,
+        forced_moves: list[dict] | None = None,
+    ):
+        self.player = player
+        self.can_pass = can_pass
+        self.forced = forced
+        self._frame = None
+        self._state = state
+        self._valid_actions = valid_actions
+        self._forced_moves = forced_moves
+        self._state_features = state_features
+        self._action_features = action_features
+
+    @classmethod
+    def from_frame(cls, frame: bytes | memoryview) -> "TurnInfo":
+        """View over a binary turn payload (see bridge-frames.ts); the buffer must not change."""
+        turn = cls.__new__(cls)
+        turn.player = frame[_FRAME_PLAYER]
+        turn.can_pass = bool(frame[_FRAME_FLAGS] & 1)
+        (turn.forced,) = _U16.unpack_from(frame, _FRAME_FORCED)
+        turn._frame = frame
+        turn._state = None
+        turn._valid_actions = None
+        turn._forced_moves = _UNSET
+        turn._state_features = _UNSET
+        turn._action_features = _UNSET
+        return turn
+
+    def _detach(self) -> None:
+        """Copy the frame out of a buffer that is about to be reused."""
+        if not isinstance(self._frame, memoryview):
+            return
+        self._frame = bytes(self._frame)
+        if self._state_features is not None:
+            # Decoded again, over the copy, on next access
+            self._state_features = self._action_features = _UNSET
+
+    def __repr__(self) -> str:
+        return (
+            f"TurnInfo(player={self.player}, num_actions={self.num_actions}, "
+            f"can_pass={self.can_pass}, forced={self.forced})"
+        )
+
+    @property
+    def state(self) -> dict:
+        if self._state is None:
+            self._state = _decode_state(self._frame)
+        return self._state
+
+    @property
+    def valid_actions(self) -> list[list[dict]] | list[list[int]]:
+        if self._valid_actions is None:
+            frame = self._frame
+            values = frame[_FRAME_PROJECTION] & 4
+            self._valid_actions = [
+                list(cards) if values else [CARD_DATA[v] for v in cards]
+                for cards in self.action_values()
+            ]
+        return self._valid_actions
+
+    @property
+    def num_actions(self) -> int:
+        """Number of valid plays (pass not included)."""
+        if self._frame is None or self._valid_actions is not None:
+            return len(self.valid_actions)
+        return _U16.unpack_from(self._frame, _FRAME_NUM_ACTIONS)[0]
+
+    @property
+    def win_order(self) -> list[int]:
+        """Seats that have finished so far, in order."""
+        if self._frame is None or self._state is not None:
+            return self.state["winOrder"]
+        frame = self._frame
+        n = frame[_FRAME_WIN_ORDER]
+        return list(frame[_FRAME_WIN_ORDER + 1:_FRAME_WIN_ORDER + 1 + n])
+
+    def hand_mask(self, player: int) -> int:
+        """A player's hand as a card-value bitmask (0 for hands left out by the projection)."""
+        if self._frame is None:
+            return sum(1 << c["value"] for c in self.state["hands"][player])
+        return _U64.unpack_from(self._frame, _FRAME_HANDS + 8 * player)[0]
+
+    def action_values(self) -> list[bytes] | list[tuple[int, ...]]:
+        """Card values of each valid play (bytes for frames, tuples otherwise)."""
+        frame = self._frame
+        if frame is None:
+            return [
+                tuple(c if isinstance(c, int) else c["value"] for c in cards)
+                for cards in self._valid_actions
+            ]
+        num_actions = _U16.unpack_from(frame, _FRAME_NUM_ACTIONS)[0]
+        pos = _TURN_HEADER.size + num_actions
+        actions = []
+        for n in frame[_TURN_HEADER.size:_TURN_HEADER.size + num_actions]:
+            actions.append(bytes(frame[pos:pos + n]))
+            pos += n
+        return actions
+
+    def action_masks(self) -> list[int]:
+        """Each valid play as a card-value bitmask."""
+        masks = []
+        for cards in self.action_values():
+            mask = 0
+            for v in cards:
+                mask |= 1 << v
+            masks.append(mask)
+        return masks
+
+    @property
+    def forced_moves(self) -> list[dict] | None:
+        if self._forced_moves is _UNSET:
+            self._forced_moves = self._decode_forced_moves()[0]
+        return self._forced_moves
+
+    @property
+    def state_features(self) -> np.ndarray | None:
+        if self._state_features is _UNSET:
+            self._decode_features()
+        elif isinstance(self._state_features, str):
+            self._state_features = _features_array(self._state_features, (STATE_SIZE,))
+        return self._state_features
+
+    @property
+    def action_features(self) -> np.ndarray | None:
+        if self._action_features is _UNSET:
+            self._decode_features()
+        elif isinstance(self._action_features, str):
+            self._action_features = _features_array(
+                self._action_features, (self.num_actions, ACTION_SIZE),
+            )
+        return self._action_features
+
+    def _decode_forced_moves(self) -> tuple[list[dict] | None, int]:
+        """Forced-move record of a frame, and the offset just past it."""
+        frame = self._frame
+        num_actions, card_count = struct.unpack_from("<HH", frame, _FRAME_NUM_ACTIONS)
+        pos = _TURN_HEADER.size + num_actions + card_count
+        if not frame[_FRAME_FLAGS] & 32:
+            return None, pos
+        return _decode_record(frame, pos)
+
+    def _decode_features(self) -> None:
+        frame = self._frame
+        if not frame[_FRAME_FLAGS] & 16:
+            self._state_features = self._action_features = None
+            return
+        num_actions = _U16.unpack_from(frame, _FRAME_NUM_ACTIONS)[0]
+        offset = (self._decode_forced_moves()[1] + 3) & ~3
+        self._state_features = np.frombuffer(
+            frame, dtype="<f4", count=STATE_SIZE, offset=offset,
+        )
+        self._action_features = np.frombuffer(
+            frame, dtype="<f4", count=num_actions * ACTION_SIZE,
+            offset=offset + STATE_SIZE * 4,
+        ).reshape(num_actions, ACTION_SIZE)
 
 
 @dataclass
 class GameOver:
     win_order: list[int]
+    # Moves played after the client's last turn, as in TurnInfo (auto_forced
+    # "record" or record_seats)
+    forced: int = 0
+    forced_moves: list[dict] | None = None
 
 
 @dataclass
@@ -31,57 +526,380 @@ class TourneyOver:
     games_played: int
 
 
-class GameBridge:
-    """Manages a persistent TS game server subprocess."""
+@dataclass
+class SimulationResult:
+    """Aggregates from the server's "simulate" command, indexed by seat slot
+    (the order of the `seats` argument, not table position)."""
 
-    def __init__(self, repo_root: str | None = None):
-        if repo_root is None:
-            # Walk up from this file to find repo root
-            p = Path(__file__).resolve()
-            while p != p.parent:
-                if (p / ".git").exists():
-                    break
-                p = p.parent
-            repo_root = str(p)
+    games: int
+    # positions[slot][k]: games the slot finished (k+1)-th
+    positions: list[list[int]]
+    ppg: list[float]
+    tourneys: int = 0
+    # tourney_positions[slot][k]: tournaments the slot ended (k+1)-th
+    tourney_positions: list[list[int]] = field(default_factory=list)
+    # Average final tournament score per slot
+    tourney_scores: list[float] = field(default_factory=list)
 
-        self._proc = subprocess.Popen(
-            ["yarn", "workspace", "@thirteen/game-logic", "game-server"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            cwd=repo_root,
-            text=True,
-            bufsize=1,  # line-buffered
+    def win_rate(self, slot: int) -> float:
+        return self.positions[slot][0] / self.games if self.games else 0.0
+
+    def tourney_win_rate(self, slot: int) -> float:
+        return self.tourney_positions[slot][0] / self.tourneys if self.tourneys else 0.0
+
+    def merge(self, other: "SimulationResult") -> "SimulationResult":
+        """Combine two results over the same seats (e.g. from several bridges)."""
+        def weighted(a: list[float], na: int, b: list[float], nb: int) -> list[float]:
+            total = na + nb
+            return [(x * na + y * nb) / total if total else 0.0 for x, y in zip(a, b)]
+
+        def summed(a: list[list[int]], b: list[list[int]]) -> list[list[int]]:
+            return [[x + y for x, y in zip(ra, rb)] for ra, rb in zip(a, b)]
+
+        return SimulationResult(
+            games=self.games + other.games,
+            positions=summed(self.positions, other.positions),
+            ppg=weighted(self.ppg, self.games, other.ppg, other.games),
+            tourneys=self.tourneys + other.tourneys,
+            tourney_positions=summed(self.tourney_positions, other.tourney_positions),
+            tourney_scores=weighted(
+                self.tourney_scores, self.tourneys, other.tourney_scores, other.tourneys,
+            ),
         )
 
-    def _send(self, obj: dict) -> dict:
-        assert self._proc.stdin and self._proc.stdout
-        self._proc.stdin.write(json.dumps(obj) + "\n")
-        self._proc.stdin.flush()
 
-        # Read lines until we get valid JSON (skip yarn's non-JSON output)
-        while True:
-            line = self._proc.stdout.readline()
-            if not line:
-                raise RuntimeError("Game server process died")
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                return json.loads(line)
-            except json.JSONDecodeError:
-                continue  # skip non-JSON lines (yarn output)
+# Round trips are bucketed by bit length of their duration in µs: bucket b
+# holds [2^(b-1), 2^b) µs, so percentiles are upper bounds within 2x.
+_HIST_BUCKETS = 32
+
+
+@dataclass
+class CommandStats:
+    """Client-side counters for one command type."""
+
+    count: int = 0
+    total_s: float = 0.0  # write start → response decoded
+    write_s: float = 0.0  # serializing and writing the command
+    wait_s: float = 0.0  # waiting for and reading the response bytes (pipe + server)
+    decode_s: float = 0.0  # parsing the response
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    histogram: list[int] = field(default_factory=lambda: [0] * _HIST_BUCKETS)
+
+    def percentile_ms(self, q: float) -> float:
+        """Approximate q-th percentile (0-100) of the round trip, in ms."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.histogram):
+            seen += n
+            if seen >= rank and n:
+                return (1 << bucket) / 1000
+        return (1 << (_HIST_BUCKETS - 1)) / 1000
+
+    def merge(self, other: "CommandStats") -> None:
+        self.count += other.count
+        self.total_s += other.total_s
+        self.write_s += other.write_s
+        self.wait_s += other.wait_s
+        self.decode_s += other.decode_s
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        for i, n in enumerate(other.histogram):
+            self.histogram[i] += n
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_s": self.total_s,
+            "write_s": self.write_s,
+            "wait_s": self.wait_s,
+            "decode_s": self.decode_s,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "mean_ms": self.total_s / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile_ms(50),
+            "p99_ms": self.percentile_ms(99),
+            "histogram": list(self.histogram),
+        }
+
+
+class BridgeStats:
+    """Per-command round-trip telemetry, keyed by the command's "cmd"."""
+
+    def __init__(self):
+        self.commands: dict[str, CommandStats] = {}
+
+    def record(
+        self,
+        cmd: str,
+        write_s: float,
+        wait_s: float,
+        decode_s: float,
+        bytes_sent: int,
+        bytes_received: int,
+    ) -> None:
+        entry = self.commands.get(cmd)
+        if entry is None:
+            entry = self.commands[cmd] = CommandStats()
+        total = write_s + wait_s + decode_s
+        entry.count += 1
+        entry.total_s += total
+        entry.write_s += write_s
+        entry.wait_s += wait_s
+        entry.decode_s += decode_s
+        entry.bytes_sent += bytes_sent
+        entry.bytes_received += bytes_received
+        entry.histogram[min(int(total * 1e6).bit_length(), _HIST_BUCKETS - 1)] += 1
+
+    def merge(self, other: "BridgeStats") -> None:
+        for cmd, entry in other.commands.items():
+            self.commands.setdefault(cmd, CommandStats()).merge(entry)
+
+    def total(self) -> CommandStats:
+        """All commands combined."""
+        combined = CommandStats()
+        for entry in self.commands.values():
+            combined.merge(entry)
+        return combined
+
+    def as_dict(self) -> dict:
+        return {cmd: entry.as_dict() for cmd, entry in self.commands.items()}
+
+
+_SERVER_STATS_TOTALS = (
+    "greedy_ms", "greedy_moves", "forced_moves", "model_ms", "model_moves", "turn_ms", "send_ms",
+    "prefetch_ms", "prefetched", "prefetch_hits",
+)
+
+
+def _merge_server_stats(stats: list[dict]) -> dict:
+    """Sum "stats" command responses from several server processes."""
+    merged: dict = {"commands": {}, **{key: 0 for key in _SERVER_STATS_TOTALS}}
+    for s in stats:
+        for key in _SERVER_STATS_TOTALS:
+            merged[key] += s.get(key, 0)
+        for cmd, entry in s.get("commands", {}).items():
+            into = merged["commands"].setdefault(cmd, {"count": 0, "compute_ms": 0.0})
+            into["count"] += entry["count"]
+            into["compute_ms"] += entry["compute_ms"]
+    return merged
+
+
+# ⚠️  SYNC WARNING: Must match the layout in shm-transport.ts.
+_SHM_MAGIC = 0x4D534854
+_SHM_HEADER_SIZE = 64
+_SHM_REQUEST_SEQ = 12
+_SHM_RESPONSE_SEQ = 16
+_SHM_SPIN_ITERATIONS = 2000
+_SHM_SLEEP_S = 20e-6
+
+
+class _ShmChannel:
+    """Python end of the shared-memory ring: a mapped file under /dev/shm.
+
+    read() returns a view of the response slot, valid until the next request
+    on the channel (after which the server may reuse the slot). TurnInfo
+    decodes frames lazily, so turns built over a view are lent to the
+    channel; write() makes the ones still alive copy their frame first.
+    """
+
+    def __init__(self, slots: int, slot_size: int):
+        self.slots = slots
+        self.slot_size = slot_size
+        size = _SHM_HEADER_SIZE + 2 * slots * slot_size
+        shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, self.path = tempfile.mkstemp(prefix="thirteen-bridge-", dir=shm_dir)
+        try:
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        struct.pack_into("<III", self._mm, 0, _SHM_MAGIC, slots, slot_size)
+        self._view = memoryview(self._mm)
+        self._request_seq = 0
+        self._response_seq = 0
+        self._response_base = _SHM_HEADER_SIZE + slots * slot_size
+        self._borrowers: list[weakref.ref[TurnInfo]] = []
+
+    def lend(self, turn: TurnInfo) -> None:
+        """Have the turn copy its frame before its slot can be reused."""
+        self._borrowers.append(weakref.ref(turn))
+
+    def _detach_borrowers(self) -> None:
+        for ref in self._borrowers:
+            turn = ref()
+            if turn is not None:
+                turn._detach()
+        self._borrowers.clear()
+
+    def unlink(self) -> None:
+        """Remove the file name; both mappings stay valid."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def write(self, data: bytes) -> None:
+        if len(data) + 4 > self.slot_size:
+            raise ValueError(f"Command of {len(data)} bytes exceeds shm slot size {self.slot_size}")
+        if self._request_seq - self._response_seq >= self.slots:
+            raise RuntimeError("Too many outstanding shm requests")
+        self._detach_borrowers()
+        offset = _SHM_HEADER_SIZE + (self._request_seq % self.slots) * self.slot_size
+        _U32.pack_into(self._mm, offset, len(data))
+        self._mm[offset + 4:offset + 4 + len(data)] = data
+        self._request_seq += 1
+        _U32.pack_into(self._mm, _SHM_REQUEST_SEQ, self._request_seq & 0xFFFFFFFF)
+
+    def read(self, proc: subprocess.Popen) -> memoryview:
+        target = self._response_seq & 0xFFFFFFFF
+        mm = self._mm
+        spins = 0
+        while _U32.unpack_from(mm, _SHM_RESPONSE_SEQ)[0] == target:
+            spins += 1
+            if spins > _SHM_SPIN_ITERATIONS:
+                if proc.poll() is not None:
+                    raise RuntimeError("Game server process died")
+                time.sleep(_SHM_SLEEP_S)
+        offset = self._response_base + (self._response_seq % self.slots) * self.slot_size
+        self._response_seq += 1
+        (n,) = _U32.unpack_from(mm, offset)
+        return self._view[offset + 4:offset + 4 + n]
+
+    def close(self) -> None:
+        self.unlink()
+        self._detach_borrowers()
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # Feature arrays still view a slot; unmapped once they are gone
+
+
+def _find_repo_root(repo_root: str | None) -> str:
+    if repo_root is None:
+        # Walk up from this file to find repo root
+        p = Path(__file__).resolve()
+        while p != p.parent:
+            if (p / ".git").exists():
+                break
+            p = p.parent
+        repo_root = str(p)
+    return repo_root
+
+
+_YARN_SERVER_CMD = ("yarn", "workspace", "@thirteen/game-logic", "game-server")
+_SERVER_BUNDLE = Path("packages/game-logic/dist/bundle/game-server.mjs")
+_SERVER_SOURCES = Path("packages/game-logic/src")
+
+
+@functools.lru_cache(maxsize=None)
+def _server_cmd(repo_root: str) -> tuple[str, ...]:
+    """Run the bundled server with node if it is newer than every source file.
+
+    Skips yarn's and tsx's startup; falls back to them (with a warning when
+    the bundle is stale) so edits to the TS source are never silently ignored.
+    """
+    bundle = Path(repo_root) / _SERVER_BUNDLE
+    node = shutil.which("node")
+    if node and bundle.exists():
+        sources = (Path(repo_root) / _SERVER_SOURCES).rglob("*.ts")
+        newest = max((p.stat().st_mtime for p in sources), default=0.0)
+        if bundle.stat().st_mtime >= newest:
+            return (node, str(bundle))
+        print(
+            "game_bridge: server bundle is older than game-logic/src, using yarn "
+            "(rebuild with `yarn workspace @thirteen/game-logic build:game-server`)",
+            file=sys.stderr,
+        )
+    return _YARN_SERVER_CMD
+
+
+# asyncio's default 64 KiB line limit is too small for full JSON snapshots
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def _load_model_cmd(model_id: str, path: str, sample: bool) -> dict:
+    # The server runs in the repo root, so send an absolute path
+    return {
+        "cmd": "load_model", "model_id": model_id,
+        "path": os.path.abspath(path), "sample": sample,
+    }
+
+
+def _simulate_cmd(
+    seats: list[str],
+    games: int,
+    tourneys: int,
+    target_score: int,
+    seed: int | None,
+    shuffle_seats: bool,
+) -> dict:
+    if len(seats) != 4:
+        raise ValueError(f"simulate needs 4 seats, got {len(seats)}")
+    cmd: dict = {
+        "cmd": "simulate", "seats": list(seats), "games": games, "tourneys": tourneys,
+        "target_score": target_score, "shuffle_seats": shuffle_seats,
+    }
+    if seed is not None:
+        cmd["seed"] = seed
+    return cmd
+
+
+def _seat_options(
+    greedy_seats: list[int] | None = None,
+    random_seats: list[int] | None = None,
+    model_seats: dict[int, str] | None = None,
+    auto_forced: bool | str = False,
+) -> dict:
+    """Seat assignments in command form, for game-starting commands and next_seats."""
+    options: dict = {}
+    if greedy_seats:
+        options["greedy_seats"] = greedy_seats
+    if random_seats:
+        options["random_seats"] = random_seats
+    if model_seats:
+        options["model_seats"] = {str(seat): model for seat, model in model_seats.items()}
+    if auto_forced:
+        options["auto_forced"] = auto_forced
+    return options
+
+
+class _BridgeProtocol:
+    """Command builders and response parsing shared by the sync and async bridges."""
+
+    _trackers: dict[str, SnapshotTracker]
 
     def _parse_response(self, resp: dict) -> TurnInfo | GameOver:
-        if resp["type"] == "turn":
+        if resp["type"] == "turn_delta":
+            tracker = self._trackers.get(resp["game_id"])
+            if tracker is None:
+                raise RuntimeError(f"Delta turn for untracked game {resp['game_id']}")
+            resp["state"] = tracker.apply(resp)
+        elif resp["type"] == "turn" and "game_id" in resp:
+            self._trackers[resp["game_id"]] = SnapshotTracker(resp["state"])
+
+        if resp["type"] in ("turn", "turn_delta"):
+            if "frame" in resp:
+                return TurnInfo.from_frame(resp["frame"])
             return TurnInfo(
                 state=resp["state"],
                 player=resp["player"],
                 valid_actions=resp["valid_actions"],
                 can_pass=resp["can_pass"],
+                state_features=resp.get("state_features"),
+                action_features=resp.get("action_features"),
+                forced=resp.get("forced", 0),
+                forced_moves=resp.get("forced_moves"),
             )
         elif resp["type"] == "game_over":
-            return GameOver(win_order=resp["win_order"])
+            return GameOver(
+                win_order=resp["win_order"],
+                forced=resp.get("forced", 0),
+                forced_moves=resp.get("forced_moves"),
+            )
         elif resp["type"] == "error":
             raise RuntimeError(f"Game server error: {resp['message']}")
         else:
@@ -92,47 +910,927 @@ class GameBridge:
             return TourneyOver(scores=resp["scores"], games_played=resp["games_played"])
         return self._parse_response(resp)
 
-    def new_game(self, greedy_seats: list[int] | None = None) -> TurnInfo | GameOver:
+    @staticmethod
+    def _new_game_cmd(
+        greedy_seats: list[int] | None = None,
+        game_id: int | str | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+        next_seats: dict | None = None,
+    ) -> dict:
         cmd: dict = {"cmd": "new_game"}
-        if greedy_seats:
-            cmd["greedy_seats"] = greedy_seats
-        return self._parse_response(self._send(cmd))
+        cmd.update(_seat_options(greedy_seats, random_seats, model_seats, auto_forced))
+        if projection:
+            cmd["projection"] = projection
+        if next_seats is not None:
+            cmd["next_seats"] = _seat_options(**next_seats)
+        if game_id is not None:
+            cmd["game_id"] = game_id
+        return cmd
+
+    @staticmethod
+    def _new_tourney_cmd(
+        greedy_seats: list[int] | None = None,
+        target_score: int = 21,
+        game_id: int | str | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> dict:
+        cmd: dict = {"cmd": "new_tourney", "target_score": target_score}
+        cmd.update(_seat_options(greedy_seats, random_seats, model_seats, auto_forced))
+        if projection:
+            cmd["projection"] = projection
+        if game_id is not None:
+            cmd["game_id"] = game_id
+        return cmd
+
+    @staticmethod
+    def _next_game_cmd(
+        win_order: list[int],
+        greedy_seats: list[int] | None = None,
+        game_id: int | str | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> dict:
+        cmd: dict = {"cmd": "next_game", "win_order": win_order}
+        cmd.update(_seat_options(greedy_seats, random_seats, model_seats, auto_forced))
+        if projection:
+            cmd["projection"] = projection
+        if game_id is not None:
+            cmd["game_id"] = game_id
+        return cmd
+
+    def _check_loaded(self, resp: dict) -> dict:
+        if resp["type"] != "model_loaded":
+            self._parse_response(resp)  # raises on error responses
+            raise RuntimeError(f"Unexpected response type: {resp['type']}")
+        return resp
+
+    def _parse_simulation(self, resp: dict) -> SimulationResult:
+        if resp["type"] != "simulation":
+            self._parse_response(resp)  # raises on error responses
+            raise RuntimeError(f"Unexpected response type: {resp['type']}")
+        return SimulationResult(
+            games=resp["games"],
+            positions=resp["positions"],
+            ppg=resp["ppg"],
+            tourneys=resp["tourneys"],
+            tourney_positions=resp["tourney_positions"],
+            tourney_scores=resp["tourney_scores"],
+        )
+
+    @staticmethod
+    def _step_cmd(action_index: int, game_id: int | str | None = None) -> dict:
+        cmd: dict = {"cmd": "step", "action_index": action_index}
+        if game_id is not None:
+            cmd["game_id"] = game_id
+        return cmd
+
+
+class GameBridge(_BridgeProtocol):
+    """Manages a persistent TS game server subprocess.
+
+    protocol: "json" (default) for JSON-line responses, or "binary" for
+    length-prefixed frames, which are much cheaper to produce and parse.
+    encode_features: have the server attach encoded state/action tensors to
+    every turn (TurnInfo.state_features / action_features).
+    delta: have the server send play log deltas instead of full snapshots
+    (JSON protocol only); TurnInfo.state is still the full snapshot.
+    transport: "pipe" (default) or "shm" to exchange commands and binary
+    responses through a shared-memory ring (shm_slots slots of
+    shm_slot_size bytes each way) instead of stdin/stdout.
+    prefetch: have the server deal and auto-play each session's next game
+    while waiting for the command that starts it (see new_game's next_seats).
+    record_seats: list the moves the server plays for random and model seats
+    in TurnInfo.forced_moves.
+    """
+
+    def __init__(
+        self,
+        repo_root: str | None = None,
+        protocol: str = "json",
+        encode_features: bool = False,
+        delta: bool = False,
+        transport: str = "pipe",
+        shm_slots: int = 4,
+        shm_slot_size: int = 1 << 20,
+        prefetch: bool = False,
+        record_seats: bool = False,
+    ):
+        if protocol not in ("json", "binary"):
+            raise ValueError(f"Unknown protocol: {protocol}")
+        if transport not in ("pipe", "shm"):
+            raise ValueError(f"Unknown transport: {transport}")
+
+        repo_root = _find_repo_root(repo_root)
+        start = time.perf_counter()
+        self._proc = subprocess.Popen(
+            _server_cmd(repo_root),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=repo_root,
+        )
+        self._init_state()
+        try:
+            ready = self._read()
+        except BaseException:
+            self.close()
+            raise
+        if ready["type"] != "ready":
+            self.close()
+            raise RuntimeError(f"Expected ready from game server, got: {ready['type']}")
+        # Seconds from spawn until the server could take commands
+        self.startup_time = time.perf_counter() - start
+        if transport == "shm":
+            self._start_shm(shm_slots, shm_slot_size, encode_features, prefetch, record_seats)
+        elif protocol != "json" or encode_features or delta or prefetch or record_seats:
+            self.configure(
+                protocol=protocol, encode=encode_features, delta=delta, prefetch=prefetch,
+                record_seats=record_seats,
+            )
+
+    def _init_state(self) -> None:
+        """Client-side state for a bridge that hasn't configured anything yet.
+
+        Subclasses that answer commands without a server process call this
+        instead of GameBridge.__init__.
+        """
+        self._next_game_id = 0
+        self._protocol = "json"
+        # Whether turns carry server-encoded features (updated by configure)
+        self.encode_features = False
+        self._trackers: dict[str, SnapshotTracker] = {}
+        self._shm: _ShmChannel | None = None
+        self._stats = BridgeStats()
+        # (cmd, write seconds, bytes sent, write end) per command awaiting its response
+        self._in_flight: deque[tuple[str, float, int, float]] = deque()
+
+    def _start_shm(
+        self, slots: int, slot_size: int, encode_features: bool, prefetch: bool,
+        record_seats: bool,
+    ) -> None:
+        channel = _ShmChannel(slots, slot_size)
+        try:
+            self.configure(
+                transport="shm", path=channel.path, encode=encode_features, prefetch=prefetch,
+                record_seats=record_seats,
+            )
+        except BaseException:
+            channel.close()
+            raise
+        # The server has the file open; the name is no longer needed
+        channel.unlink()
+        self._shm = channel
+
+    def configure(self, **options) -> dict:
+        """Change server options; the ack arrives in the protocol active before the switch."""
+        resp = self._send({"cmd": "configure", **options})
+        if resp["type"] != "configured":
+            self._parse_response(resp)  # raises on error responses
+            raise RuntimeError(f"Unexpected response type: {resp['type']}")
+        self._protocol = resp["protocol"]
+        self.encode_features = resp["encode"]
+        return resp
+
+    def _parse_response(self, resp: dict) -> TurnInfo | GameOver:
+        turn = super()._parse_response(resp)
+        if self._shm is not None and isinstance(turn, TurnInfo):
+            self._shm.lend(turn)
+        return turn
+
+    def _send(self, obj: dict) -> dict:
+        self._write(obj)
+        return self._read()
+
+    def _write(self, obj: dict) -> None:
+        start = time.perf_counter()
+        data = json.dumps(obj).encode()
+        if self._shm is not None:
+            self._shm.write(data)
+        else:
+            assert self._proc.stdin
+            data += b"\n"
+            self._proc.stdin.write(data)
+            self._proc.stdin.flush()
+        end = time.perf_counter()
+        self._in_flight.append((obj["cmd"], end - start, len(data), end))
+
+    def _read(self) -> dict:
+        return self._read_raw()[1]
+
+    def _read_raw(self) -> tuple[bytes | memoryview, dict]:
+        """Next response as (JSON line or frame payload, decoded response).
+
+        Over shm the payload is a view of the ring slot (see _ShmChannel).
+        """
+        if self._shm is not None:
+            payload = self._shm.read(self._proc)
+        elif self._protocol == "binary":
+            payload = self._read_frame()
+        else:
+            return self._read_line()
+        received = time.perf_counter()
+        resp = _decode_payload(payload)
+        self._record(received, len(payload))
+        return payload, resp
+
+    def _read_frame(self) -> bytes:
+        assert self._proc.stdout
+        header = self._proc.stdout.read(4)
+        if len(header) < 4:
+            raise RuntimeError("Game server process died")
+        (n,) = _U32.unpack(header)
+        payload = self._proc.stdout.read(n)
+        if len(payload) < n:
+            raise RuntimeError("Game server process died")
+        return payload
+
+    def _read_line(self) -> tuple[bytes, dict]:
+        assert self._proc.stdout
+        # Read lines until we get valid JSON (skip yarn's non-JSON output)
+        while True:
+            line = self._proc.stdout.readline()
+            if not line:
+                raise RuntimeError("Game server process died")
+            received = time.perf_counter()
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                resp = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # skip non-JSON lines (yarn output)
+            self._record(received, len(line))
+            return line, resp
+
+    def _record(self, received: float, bytes_received: int) -> None:
+        """Attribute a decoded response to the oldest command in flight."""
+        if not self._in_flight:  # the ready line answers no command
+            return
+        cmd, write_s, bytes_sent, written = self._in_flight.popleft()
+        self._stats.record(
+            cmd, write_s, received - written, time.perf_counter() - received,
+            bytes_sent, bytes_received,
+        )
+
+    def stats(self, reset: bool = False, server: bool = True) -> dict:
+        """Round-trip telemetry since start (or the last reset).
+
+        "client" maps each command to CommandStats.as_dict(); "server" is the
+        server's own "stats" response (compute time per command, greedy
+        auto-play, turn building and send time, in ms). Fetching server stats
+        is itself a round trip and is not counted in the client stats.
+        """
+        result: dict = {"client": self._stats.as_dict()}
+        if server:
+            resp = self._send({"cmd": "stats", "reset": reset})
+            if resp["type"] != "stats":
+                self._parse_response(resp)  # raises on error responses
+                raise RuntimeError(f"Unexpected response type: {resp['type']}")
+            result["server"] = resp
+        self._stats.commands.pop("stats", None)
+        if reset:
+            self._stats = BridgeStats()
+        return result
+
+    def load_model(self, model_id: str, path: str, sample: bool = False) -> dict:
+        """Load (or hot-swap) an ONNX policy on the server for model_seats.
+
+        sample: draw moves from the softmax over the scores instead of argmax.
+        """
+        return self._check_loaded(self._send(_load_model_cmd(model_id, path, sample)))
+
+    def simulate(
+        self,
+        seats: list[str],
+        games: int = 0,
+        tourneys: int = 0,
+        target_score: int = 21,
+        seed: int | None = None,
+        shuffle_seats: bool = True,
+    ) -> SimulationResult:
+        """Play `games` games and/or `tourneys` tournaments entirely server-side.
+
+        seats: four policies, each "greedy", "random" or "model:<model_id>"
+        (loaded with load_model). Slots are reshuffled across table seats per
+        game / tournament unless shuffle_seats is False. A seed makes deals,
+        seating and random seats reproducible (model sampling is not seeded).
+        """
+        cmd = _simulate_cmd(seats, games, tourneys, target_score, seed, shuffle_seats)
+        return self._parse_simulation(self._send(cmd))
+
+    def new_game(
+        self,
+        greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+        next_seats: dict | None = None,
+    ) -> TurnInfo | GameOver:
+        """Start a game on the default session.
+
+        next_seats: greedy_seats / random_seats / model_seats of the game
+        expected to follow this one, for prefetch=True to deal ahead (by
+        default the same seats as this game).
+        """
+        return self._parse_response(
+            self._send(self._new_game_cmd(
+                greedy_seats, random_seats=random_seats, model_seats=model_seats,
+                auto_forced=auto_forced, projection=projection, next_seats=next_seats,
+            ))
+        )
 
     def new_tourney(
         self,
         greedy_seats: list[int] | None = None,
         target_score: int = 21,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
     ) -> TurnInfo | GameOver:
-        cmd: dict = {"cmd": "new_tourney", "target_score": target_score}
-        if greedy_seats:
-            cmd["greedy_seats"] = greedy_seats
-        return self._parse_response(self._send(cmd))
+        return self._parse_response(
+            self._send(self._new_tourney_cmd(
+                greedy_seats, target_score,
+                random_seats=random_seats, model_seats=model_seats,
+                auto_forced=auto_forced, projection=projection,
+            ))
+        )
 
     def next_game(
         self,
         win_order: list[int],
         greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
     ) -> TurnInfo | GameOver | TourneyOver:
-        cmd: dict = {"cmd": "next_game", "win_order": win_order}
-        if greedy_seats:
-            cmd["greedy_seats"] = greedy_seats
-        return self._parse_tourney_response(self._send(cmd))
+        return self._parse_tourney_response(
+            self._send(self._next_game_cmd(
+                win_order, greedy_seats,
+                random_seats=random_seats, model_seats=model_seats,
+                auto_forced=auto_forced, projection=projection,
+            ))
+        )
 
     def step(self, action_index: int) -> TurnInfo | GameOver:
-        return self._parse_response(
-            self._send({"cmd": "step", "action_index": action_index})
-        )
+        return self._parse_response(self._send(self._step_cmd(action_index)))
+
+    # ── Multiplexed sessions ──
+
+    def session(self, game_id: int | str | None = None) -> "GameSession":
+        """Open a handle on an independent game hosted by this server process."""
+        if game_id is None:
+            game_id = self._next_game_id
+            self._next_game_id += 1
+        return GameSession(self, game_id)
+
+    def batch(self, cmds: list[dict]) -> list[dict]:
+        """Run several commands in one round trip; returns raw responses in order.
+
+        In delta mode, turn responses must go through _parse_response (as in
+        new_games / step_many) to keep the per-game snapshots in sync. Over
+        shm, turn frames are views of the ring, valid until the next request.
+        """
+        resp = self._send({"cmd": "batch", "commands": cmds})
+        if resp["type"] != "batch":
+            self._parse_response(resp)  # raises on error responses
+            raise RuntimeError(f"Unexpected response type: {resp['type']}")
+        return resp["responses"]
+
+    def new_games(
+        self,
+        sessions: list["GameSession"],
+        greedy_seats: list[list[int] | None] | None = None,
+        random_seats: list[list[int] | None] | None = None,
+        model_seats: list[dict[int, str] | None] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> list[TurnInfo | GameOver]:
+        """Start a new game in every session with a single batched message.
+
+        greedy_seats / random_seats / model_seats: optional per-session seats.
+        """
+        cmds = [
+            self._new_game_cmd(
+                greedy_seats[i] if greedy_seats else None,
+                s.game_id,
+                random_seats[i] if random_seats else None,
+                model_seats[i] if model_seats else None,
+                auto_forced, projection,
+            )
+            for i, s in enumerate(sessions)
+        ]
+        return [self._parse_response(r) for r in self.batch(cmds)]
+
+    def step_many(
+        self, steps: list[tuple["GameSession", int]],
+    ) -> list[TurnInfo | GameOver]:
+        """Step many sessions with a single batched message."""
+        cmds = [self._step_cmd(action, s.game_id) for s, action in steps]
+        return [self._parse_response(r) for r in self.batch(cmds)]
 
     def close(self):
         if self._proc.poll() is None:
             try:
+                if self._shm is not None:
+                    self._shm.write(b'{"cmd":"quit"}')
                 assert self._proc.stdin
-                self._proc.stdin.write('{"cmd":"quit"}\n')
+                self._proc.stdin.write(b'{"cmd":"quit"}\n')
                 self._proc.stdin.flush()
                 self._proc.stdin.close()
-            except (BrokenPipeError, OSError):
+            except (BrokenPipeError, OSError, RuntimeError):
                 pass
             self._proc.wait(timeout=5)
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class GameSession:
+    """One of many concurrent games multiplexed on a single GameBridge process.
+
+    Mirrors the GameBridge game API; every command is tagged with this
+    session's game_id. Use GameBridge.new_games / step_many to advance many
+    sessions in one round trip.
+    """
+
+    def __init__(self, bridge: GameBridge, game_id: int | str):
+        self.bridge = bridge
+        self.game_id = game_id
+
+    def new_game(
+        self,
+        greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+        next_seats: dict | None = None,
+    ) -> TurnInfo | GameOver:
+        b = self.bridge
+        return b._parse_response(
+            b._send(b._new_game_cmd(
+                greedy_seats, self.game_id, random_seats, model_seats, auto_forced, projection,
+                next_seats,
+            ))
+        )
+
+    def new_tourney(
+        self,
+        greedy_seats: list[int] | None = None,
+        target_score: int = 21,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> TurnInfo | GameOver:
+        b = self.bridge
+        return b._parse_response(
+            b._send(b._new_tourney_cmd(
+                greedy_seats, target_score, self.game_id,
+                random_seats, model_seats, auto_forced, projection,
+            ))
+        )
+
+    def next_game(
+        self,
+        win_order: list[int],
+        greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> TurnInfo | GameOver | TourneyOver:
+        b = self.bridge
+        return b._parse_tourney_response(
+            b._send(b._next_game_cmd(
+                win_order, greedy_seats, self.game_id,
+                random_seats, model_seats, auto_forced, projection,
+            ))
+        )
+
+    def step(self, action_index: int) -> TurnInfo | GameOver:
+        b = self.bridge
+        return b._parse_response(b._send(b._step_cmd(action_index, self.game_id)))
+
+    def close(self):
+        """Free this game's state on the server."""
+        self.bridge._send({"cmd": "close_game", "game_id": self.game_id})
+        self.bridge._trackers.pop(str(self.game_id), None)
+
+
+# Transcript file: magic, then records of kind byte + u32 length + data
+_TRANSCRIPT_MAGIC = b"THTR\x01"
+_RECORD_HEADER = struct.Struct("<cI")
+_RECORD_COMMAND = b"C"  # command JSON as sent
+_RECORD_LINE = b"J"  # JSON response line
+_RECORD_FRAME = b"F"  # binary frame payload
+_RECORD_STARTED = b"S"  # end of the constructor's startup commands
+
+
+class RecordingBridge(GameBridge):
+    """GameBridge that writes every command and raw response to a transcript.
+
+    ReplayBridge serves a transcript back without a game server, so the
+    Python side (encoding, policies, logging) can be profiled and
+    benchmarked reproducibly. The code under test must issue the same
+    commands on replay: seed its RNGs, and record with the options
+    (protocol, encode_features, ...) it will be replayed with.
+    """
+
+    def __init__(self, path: str | os.PathLike, repo_root: str | None = None, **bridge_kwargs):
+        self._transcript = open(path, "wb")
+        self._transcript.write(_TRANSCRIPT_MAGIC)
+        try:
+            super().__init__(repo_root, **bridge_kwargs)
+        except BaseException:
+            self._transcript.close()
+            raise
+        self._log(_RECORD_STARTED, b"")
+
+    def _log(self, kind: bytes, data: bytes) -> None:
+        self._transcript.write(_RECORD_HEADER.pack(kind, len(data)))
+        self._transcript.write(data)
+
+    def _write(self, obj: dict) -> None:
+        super()._write(obj)
+        self._log(_RECORD_COMMAND, json.dumps(obj).encode())
+
+    def _read(self) -> dict:
+        kind = _RECORD_LINE if self._shm is None and self._protocol == "json" else _RECORD_FRAME
+        raw, resp = self._read_raw()
+        self._log(kind, raw)
+        return resp
+
+    def close(self):
+        super().close()
+        self._transcript.close()
+
+
+class ReplayBridge(GameBridge):
+    """Serves a RecordingBridge transcript back through the GameBridge API.
+
+    No server is started: each command is checked against the recorded one
+    (RuntimeError on the first divergence) and answered with the recorded
+    response, decoded exactly as GameBridge would. Stats then cover only
+    the Python-side write and decode time. The whole transcript is loaded up
+    front so file reads don't show up in measurements.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(_TRANSCRIPT_MAGIC):
+            raise ValueError(f"Not a bridge transcript: {path}")
+        commands: deque[bytes] = deque()
+        responses: deque[tuple[bytes, bytes]] = deque()
+        startup_commands = None
+        pos = len(_TRANSCRIPT_MAGIC)
+        while pos < len(data):
+            kind, n = _RECORD_HEADER.unpack_from(data, pos)
+            pos += _RECORD_HEADER.size
+            if kind == _RECORD_COMMAND:
+                commands.append(data[pos:pos + n])
+            elif kind == _RECORD_STARTED:
+                startup_commands = len(commands)
+            else:
+                responses.append((kind, data[pos:pos + n]))
+            pos += n
+        if startup_commands is None or not responses:
+            raise ValueError(f"Truncated bridge transcript: {path}")
+
+        self._commands = commands
+        self._responses = responses
+        self._commands_sent = 0
+        self._init_state()
+        start = time.perf_counter()
+        self._read()  # ready
+        # Repeat the recorded constructor's configure commands
+        for _ in range(startup_commands):
+            options = json.loads(commands[0])
+            del options["cmd"]
+            self.configure(**options)
+        self.startup_time = time.perf_counter() - start
+
+    def _write(self, obj: dict) -> None:
+        start = time.perf_counter()
+        data = json.dumps(obj).encode()
+        if not self._commands:
+            raise RuntimeError(f"Replay ran past the end of the transcript at {data!r}")
+        expected = self._commands.popleft()
+        if data != expected:
+            raise RuntimeError(
+                f"Replay diverged at command {self._commands_sent}: "
+                f"expected {expected!r}, got {data!r}"
+            )
+        self._commands_sent += 1
+        end = time.perf_counter()
+        self._in_flight.append((obj["cmd"], end - start, len(data), end))
+
+    def _read_raw(self) -> tuple[bytes, dict]:
+        if not self._responses:
+            raise RuntimeError("Replay ran past the end of the transcript")
+        kind, raw = self._responses.popleft()
+        received = time.perf_counter()
+        resp = json.loads(raw) if kind == _RECORD_LINE else _decode_payload(raw)
+        self._record(received, len(raw))
+        return raw, resp
+
+    def remaining(self) -> int:
+        """Recorded commands not yet replayed."""
+        return len(self._commands)
+
+    def close(self):
+        pass
+
+
+def spawn_bridges(n: int, **bridge_kwargs) -> list[GameBridge]:
+    """Start n GameBridges in parallel; startup cost is paid once, not n times."""
+    if n <= 0:
+        return []
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        futures = [executor.submit(GameBridge, **bridge_kwargs) for _ in range(n)]
+    bridges = []
+    error: BaseException | None = None
+    for fut in futures:
+        try:
+            bridges.append(fut.result())
+        except BaseException as e:
+            error = error or e
+    if error is not None:
+        for bridge in bridges:
+            bridge.close()
+        raise error
+    return bridges
+
+
+class BridgePool:
+    """Warm game server processes, started in parallel and handed out on demand.
+
+    acquire() returns an idle bridge (spawning one only if none is ready)
+    and tops the pool back up to `size` in the background; release() returns
+    a bridge for reuse. All bridges share the pool's GameBridge options.
+
+        with BridgePool(32, encode_features=True) as pool:
+            bridges = pool.acquire_many(32)
+            ...
+            for b in bridges:
+                pool.release(b)
+    """
+
+    def __init__(self, size: int, repo_root: str | None = None, **bridge_kwargs):
+        self.size = size
+        self._bridge_kwargs = {"repo_root": repo_root, **bridge_kwargs}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._refilling = 0
+        self._threads: list[threading.Thread] = []
+        self._idle: list[GameBridge] = spawn_bridges(size, **self._bridge_kwargs)
+
+    def acquire(self) -> GameBridge:
+        return self.acquire_many(1)[0]
+
+    def acquire_many(self, n: int) -> list[GameBridge]:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BridgePool is closed")
+            taken = self._idle[:n]
+            del self._idle[:n]
+        taken += spawn_bridges(n - len(taken), **self._bridge_kwargs)
+        self._refill()
+        return taken
+
+    def release(self, bridge: GameBridge) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size and bridge._proc.poll() is None:
+                self._idle.append(bridge)
+                return
+        bridge.close()
+
+    @contextmanager
+    def bridge(self):
+        """Borrow one bridge for the duration of a with-block."""
+        b = self.acquire()
+        try:
+            yield b
+        finally:
+            self.release(b)
+
+    def _refill(self) -> None:
+        with self._lock:
+            missing = self.size - len(self._idle) - self._refilling
+            if self._closed or missing <= 0:
+                return
+            self._refilling += missing
+            self._threads = [t for t in self._threads if t.is_alive()]
+
+        def spawn():
+            try:
+                bridge: GameBridge | None = GameBridge(**self._bridge_kwargs)
+            except Exception:
+                bridge = None
+            with self._lock:
+                self._refilling -= 1
+            if bridge is not None:
+                self.release(bridge)
+
+        for _ in range(missing):
+            t = threading.Thread(target=spawn, daemon=True)
+            t.start()
+            with self._lock:
+                self._threads.append(t)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            threads = list(self._threads)
+        for t in threads:
+            t.join()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for bridge in idle:
+            bridge.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class VecGameBridge:
+    """Drives N game server subprocesses in lockstep.
+
+    Each batch call writes its command to every pipe before reading any
+    response, so the N Node processes compute their turns concurrently and
+    a batch costs roughly one round trip instead of N. With a pool, the
+    bridges are borrowed from it and returned on close (the pool's options
+    apply instead of the ones given here). engine="python" runs the envs
+    in-process on thirteen_engine.EngineBridge instead, ignoring the server
+    options other than record_seats.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        repo_root: str | None = None,
+        protocol: str = "json",
+        encode_features: bool = False,
+        delta: bool = False,
+        transport: str = "pipe",
+        pool: BridgePool | None = None,
+        prefetch: bool = False,
+        engine: str = "node",
+        record_seats: bool = False,
+    ):
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be >= 1, got {num_envs}")
+        if engine not in ("node", "python"):
+            raise ValueError(f"Unknown engine: {engine}")
+        self._pool = pool if engine == "node" else None
+        if engine == "python":
+            from thirteen_engine import EngineBridge
+
+            self.bridges = [EngineBridge() for _ in range(num_envs)]
+            if record_seats:
+                for bridge in self.bridges:
+                    bridge.configure(record_seats=True)
+        elif pool is not None:
+            self.bridges = pool.acquire_many(num_envs)
+        else:
+            self.bridges = spawn_bridges(
+                num_envs, repo_root=repo_root, protocol=protocol,
+                encode_features=encode_features, delta=delta, transport=transport,
+                prefetch=prefetch, record_seats=record_seats,
+            )
+
+    @property
+    def num_envs(self) -> int:
+        return len(self.bridges)
+
+    def _broadcast(self, cmds: list[dict | None]) -> list[dict | None]:
+        """Send one command per env (None = skip), then collect responses."""
+        if len(cmds) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} commands, got {len(cmds)}")
+        for bridge, cmd in zip(self.bridges, cmds):
+            if cmd is not None:
+                bridge._write(cmd)
+        return [
+            bridge._read() if cmd is not None else None
+            for bridge, cmd in zip(self.bridges, cmds)
+        ]
+
+    def reset_all(
+        self,
+        greedy_seats: list[list[int] | None] | None = None,
+        envs: list[int] | None = None,
+        random_seats: list[list[int] | None] | None = None,
+        model_seats: list[dict[int, str] | None] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> list[TurnInfo | GameOver | None]:
+        """Start a new game in each env (or only those in `envs`).
+
+        greedy_seats / random_seats / model_seats: optional per-env seats,
+        indexed by env. Envs not being reset get None in the returned list.
+        """
+        targets = set(range(self.num_envs)) if envs is None else set(envs)
+        cmds = [
+            GameBridge._new_game_cmd(
+                greedy_seats[i] if greedy_seats else None,
+                random_seats=random_seats[i] if random_seats else None,
+                model_seats=model_seats[i] if model_seats else None,
+                auto_forced=auto_forced, projection=projection,
+            )
+            if i in targets else None
+            for i in range(self.num_envs)
+        ]
+        return [
+            bridge._parse_response(resp) if resp is not None else None
+            for bridge, resp in zip(self.bridges, self._broadcast(cmds))
+        ]
+
+    def step_all(self, actions: list[int | None]) -> list[TurnInfo | GameOver | None]:
+        """Apply one action per env. Envs with a None action are not stepped."""
+        cmds = [
+            {"cmd": "step", "action_index": a} if a is not None else None
+            for a in actions
+        ]
+        return [
+            bridge._parse_response(resp) if resp is not None else None
+            for bridge, resp in zip(self.bridges, self._broadcast(cmds))
+        ]
+
+    def load_model(self, model_id: str, path: str, sample: bool = False) -> None:
+        """GameBridge.load_model on every env, loading in parallel."""
+        cmd = _load_model_cmd(model_id, path, sample)
+        for bridge, resp in zip(self.bridges, self._broadcast([cmd] * self.num_envs)):
+            bridge._check_loaded(resp)
+
+    def simulate(
+        self,
+        seats: list[str],
+        games: int = 0,
+        tourneys: int = 0,
+        target_score: int = 21,
+        seed: int | None = None,
+        shuffle_seats: bool = True,
+    ) -> SimulationResult:
+        """GameBridge.simulate split across envs, which run their share in parallel.
+
+        Env i uses seed + i, so a seeded run is reproducible for a fixed num_envs.
+        """
+        n = self.num_envs
+        cmds = [
+            _simulate_cmd(
+                seats, games // n + (i < games % n), tourneys // n + (i < tourneys % n),
+                target_score, None if seed is None else seed + i, shuffle_seats,
+            )
+            for i in range(n)
+        ]
+        results = [
+            bridge._parse_simulation(resp)
+            for bridge, resp in zip(self.bridges, self._broadcast(cmds))
+        ]
+        return functools.reduce(SimulationResult.merge, results)
+
+    def stats(self, reset: bool = False, server: bool = True) -> dict:
+        """GameBridge.stats() summed over all envs."""
+        client = BridgeStats()
+        server_stats = []
+        for bridge in self.bridges:
+            client.merge(bridge._stats)
+            stats = bridge.stats(reset=reset, server=server)
+            if server:
+                server_stats.append(stats["server"])
+        result: dict = {"client": client.as_dict()}
+        if server:
+            result["server"] = _merge_server_stats(server_stats)
+        return result
+
+    def close(self):
+        for bridge in self.bridges:
+            if self._pool is not None:
+                self._pool.release(bridge)
+            else:
+                bridge.close()
+        self.bridges = []
 
     def __enter__(self):
         return self
@@ -141,6 +1839,296 @@ class GameBridge:
         self.close()
 
 
+class AsyncGameBridge(_BridgeProtocol):
+    """asyncio counterpart of GameBridge for many concurrently in-flight games.
+
+    Commands are pipelined: each call writes its command and awaits a future,
+    and a reader task resolves the futures in order as responses arrive (the
+    server answers strictly in command order). Give each concurrent game its
+    own session() so the games don't share state.
+
+    Create with `await AsyncGameBridge.start(...)`; options as for GameBridge.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self._proc = proc
+        self._next_game_id = 0
+        self._protocol = "json"
+        self.encode_features = False
+        self._trackers: dict[str, SnapshotTracker] = {}
+        self._pending: deque[asyncio.Future] = deque()
+        loop = asyncio.get_running_loop()
+        self._ready: asyncio.Future = loop.create_future()
+        self._reader = loop.create_task(self._read_loop())
+        self.startup_time = 0.0
+
+    @classmethod
+    async def start(
+        cls,
+        repo_root: str | None = None,
+        protocol: str = "json",
+        encode_features: bool = False,
+        delta: bool = False,
+        prefetch: bool = False,
+        record_seats: bool = False,
+    ) -> "AsyncGameBridge":
+        if protocol not in ("json", "binary"):
+            raise ValueError(f"Unknown protocol: {protocol}")
+        repo_root = _find_repo_root(repo_root)
+        start = time.perf_counter()
+        proc = await asyncio.create_subprocess_exec(
+            *_server_cmd(repo_root),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=repo_root,
+            limit=_STREAM_LIMIT,
+        )
+        bridge = cls(proc)
+        try:
+            await bridge._ready
+        except BaseException:
+            await bridge.close()
+            raise
+        bridge.startup_time = time.perf_counter() - start
+        if protocol != "json" or encode_features or delta or prefetch or record_seats:
+            await bridge.configure(
+                protocol=protocol, encode=encode_features, delta=delta, prefetch=prefetch,
+                record_seats=record_seats,
+            )
+        return bridge
+
+    async def configure(self, **options) -> dict:
+        """Change server options (the reader switches protocol at the ack)."""
+        resp = await self._send({"cmd": "configure", **options})
+        if resp["type"] != "configured":
+            self._parse_response(resp)  # raises on error responses
+            raise RuntimeError(f"Unexpected response type: {resp['type']}")
+        self.encode_features = resp["encode"]
+        return resp
+
+    async def _read(self) -> dict:
+        stdout = self._proc.stdout
+        assert stdout
+        if self._protocol == "binary":
+            (n,) = _U32.unpack(await stdout.readexactly(4))
+            return _decode_payload(await stdout.readexactly(n))
+
+        # Read lines until we get valid JSON (skip yarn's non-JSON output)
+        while True:
+            line = await stdout.readline()
+            if not line:
+                raise RuntimeError("Game server process died")
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                return json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # skip non-JSON lines (yarn output)
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                resp = await self._read()
+                if resp["type"] == "ready":
+                    self._ready.set_result(None)
+                    continue
+                if resp["type"] == "configured":
+                    # Everything after the ack uses the new protocol
+                    self._protocol = resp["protocol"]
+                if self._pending:
+                    self._pending.popleft().set_result(resp)
+        except (RuntimeError, asyncio.IncompleteReadError, ConnectionError):
+            if not self._ready.done():
+                self._ready.set_exception(RuntimeError("Game server process died"))
+            while self._pending:
+                fut = self._pending.popleft()
+                if not fut.done():
+                    fut.set_exception(RuntimeError("Game server process died"))
+
+    async def _send(self, obj: dict) -> dict:
+        if self._reader.done():
+            raise RuntimeError("Game server process died")
+        stdin = self._proc.stdin
+        assert stdin
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append(fut)
+        stdin.write(json.dumps(obj).encode() + b"\n")
+        await stdin.drain()
+        return await fut
+
+    async def new_game(
+        self,
+        greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+        next_seats: dict | None = None,
+    ) -> TurnInfo | GameOver:
+        return self._parse_response(
+            await self._send(self._new_game_cmd(
+                greedy_seats, random_seats=random_seats, model_seats=model_seats,
+                auto_forced=auto_forced, projection=projection, next_seats=next_seats,
+            ))
+        )
+
+    async def new_tourney(
+        self,
+        greedy_seats: list[int] | None = None,
+        target_score: int = 21,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> TurnInfo | GameOver:
+        return self._parse_response(
+            await self._send(self._new_tourney_cmd(
+                greedy_seats, target_score,
+                random_seats=random_seats, model_seats=model_seats,
+                auto_forced=auto_forced, projection=projection,
+            ))
+        )
+
+    async def next_game(
+        self,
+        win_order: list[int],
+        greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> TurnInfo | GameOver | TourneyOver:
+        return self._parse_tourney_response(
+            await self._send(self._next_game_cmd(
+                win_order, greedy_seats,
+                random_seats=random_seats, model_seats=model_seats,
+                auto_forced=auto_forced, projection=projection,
+            ))
+        )
+
+    async def step(self, action_index: int) -> TurnInfo | GameOver:
+        return self._parse_response(await self._send(self._step_cmd(action_index)))
+
+    async def load_model(self, model_id: str, path: str, sample: bool = False) -> dict:
+        """Load (or hot-swap) an ONNX policy on the server for model_seats."""
+        return self._check_loaded(await self._send(_load_model_cmd(model_id, path, sample)))
+
+    async def simulate(
+        self,
+        seats: list[str],
+        games: int = 0,
+        tourneys: int = 0,
+        target_score: int = 21,
+        seed: int | None = None,
+        shuffle_seats: bool = True,
+    ) -> SimulationResult:
+        """Play games / tournaments server-side; see GameBridge.simulate."""
+        cmd = _simulate_cmd(seats, games, tourneys, target_score, seed, shuffle_seats)
+        return self._parse_simulation(await self._send(cmd))
+
+    def session(self, game_id: int | str | None = None) -> "AsyncGameSession":
+        """Open a handle on an independent game hosted by this server process."""
+        if game_id is None:
+            game_id = self._next_game_id
+            self._next_game_id += 1
+        return AsyncGameSession(self, game_id)
+
+    async def close(self):
+        if self._proc.returncode is None:
+            stdin = self._proc.stdin
+            assert stdin
+            try:
+                stdin.write(b'{"cmd":"quit"}\n')
+                await stdin.drain()
+                stdin.close()
+            except (BrokenPipeError, ConnectionError):
+                pass
+            await asyncio.wait_for(self._proc.wait(), timeout=5)
+        self._reader.cancel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+class AsyncGameSession:
+    """One concurrent game on an AsyncGameBridge (async mirror of GameSession)."""
+
+    def __init__(self, bridge: AsyncGameBridge, game_id: int | str):
+        self.bridge = bridge
+        self.game_id = game_id
+
+    async def new_game(
+        self,
+        greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+        next_seats: dict | None = None,
+    ) -> TurnInfo | GameOver:
+        b = self.bridge
+        return b._parse_response(
+            await b._send(
+                b._new_game_cmd(
+                    greedy_seats, self.game_id, random_seats, model_seats, auto_forced, projection,
+                    next_seats,
+                )
+            )
+        )
+
+    async def new_tourney(
+        self,
+        greedy_seats: list[int] | None = None,
+        target_score: int = 21,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> TurnInfo | GameOver:
+        b = self.bridge
+        return b._parse_response(
+            await b._send(
+                b._new_tourney_cmd(
+                    greedy_seats, target_score, self.game_id,
+                    random_seats, model_seats, auto_forced, projection,
+                )
+            )
+        )
+
+    async def next_game(
+        self,
+        win_order: list[int],
+        greedy_seats: list[int] | None = None,
+        random_seats: list[int] | None = None,
+        model_seats: dict[int, str] | None = None,
+        auto_forced: bool | str = False,
+        projection: dict | None = None,
+    ) -> TurnInfo | GameOver | TourneyOver:
+        b = self.bridge
+        return b._parse_tourney_response(
+            await b._send(
+                b._next_game_cmd(
+                    win_order, greedy_seats, self.game_id,
+                    random_seats, model_seats, auto_forced, projection,
+                )
+            )
+        )
+
+    async def step(self, action_index: int) -> TurnInfo | GameOver:
+        b = self.bridge
+        return b._parse_response(await b._send(b._step_cmd(action_index, self.game_id)))
+
+    async def close(self):
+        """Free this game's state on the server."""
+        await self.bridge._send({"cmd": "close_game", "game_id": self.game_id})
+        self.bridge._trackers.pop(str(self.game_id), None)
+
+
 if __name__ == "__main__":
     """Quick test: play a game with random actions."""
     import random
@@ -150,7 +2138,7 @@ if __name__ == "__main__":
         moves = 0
 
         while True:
-            num_actions = len(turn.valid_actions) + (1 if turn.can_pass else 0)
+            num_actions = turn.num_actions + (1 if turn.can_pass else 0)
             action = random.randrange(num_actions)
             result = bridge.step(action)
             moves += 1
@@ -165,7 +2153,7 @@ if __name__ == "__main__":
             turn = bridge.new_game()
             game_moves = 0
             while True:
-                num_actions = len(turn.valid_actions) + (1 if turn.can_pass else 0)
+                num_actions = turn.num_actions + (1 if turn.can_pass else 0)
                 action = random.randrange(num_actions)
                 result = bridge.step(action)
                 game_moves += 1
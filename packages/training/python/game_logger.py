@@ -162,7 +162,7 @@ class GameLogger:
             model_confidence=round(model_confidence, 4),
             cards_to_beat=cards_to_beat,
             hand=list(hands[turn_player]),
-            opponent_hand_sizes=[len(hands[i]) for i in range(4)],
+            opponent_hand_sizes=turn_state.get("handSizes") or [len(h) for h in hands],
             passed_players=list(turn_state.get("passedPlayers", [])),
             players_in_game=list(turn_state.get("playersInGame", [])),
             last_play_by=turn_state.get("lastPlayBy"),
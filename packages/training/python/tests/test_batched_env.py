@@ -0,0 +1,106 @@
+"""BatchedGameEnv against thirteen_engine.GameState and features.py.
+
+Every game in the env is mirrored by a GameState stepped with the same
+random or greedy moves (greedy seats via choose_play); observations, legal
+actions, greedy choices and win orders must match at every decision.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from batched_env import BatchedGameEnv, greedy_policy
+from features import encode_action, encode_pass_action, encode_state
+from game_bridge import CARD_DATA
+from thirteen_engine import GameState, choose_play, evaluate, get_all_plays
+
+GAMES = 64
+STEPS = 300
+
+
+def _move(game: GameState, cards: tuple[int, ...]) -> None:
+    if cards:
+        game.play_cards(game.current_player, cards)
+    else:
+        game.pass_turn(game.current_player)
+
+
+def _play_greedy_seats(game: GameState, greedy_seats: tuple[int, ...]) -> None:
+    while not game.is_game_over() and game.current_player in greedy_seats:
+        _move(game, choose_play(game.hands[game.current_player], game.last_play))
+
+
+def _mirror(env: BatchedGameEnv, b: int) -> GameState:
+    """A GameState for game b, dealt the same hands."""
+    # Greedy seats have already moved: their cards are in env.played
+    game = GameState([int(h) for h in env.hands[b] | env.played[b]])
+    _play_greedy_seats(game, env.greedy_seats)
+    return game
+
+
+def _check_turn(env, observation, greedy, b: int, game: GameState) -> list[tuple[int, ...]]:
+    """Assert env's observation of game b; returns the actions it shows."""
+    states, action_features, _, num_actions = observation
+    player = game.current_player
+    assert env.current_player[b] == player
+    hand, last_play = game.hands[player], game.last_play
+    plays = get_all_plays(evaluate(hand, last_play))
+    can_pass = last_play is not None
+    num_plays = min(len(plays), env.max_actions - can_pass)
+    assert num_actions[b] == num_plays + can_pass
+
+    # encode_state computes the missing handComboTypeMap
+    assert np.array_equal(states[b], encode_state(game.to_snapshot(), player))
+    for i, play in enumerate(plays[:num_plays]):
+        expected = encode_action([CARD_DATA[v] for v in play])
+        assert np.array_equal(action_features[b, i], expected), i
+    if can_pass:
+        assert np.array_equal(action_features[b, num_plays], encode_pass_action())
+
+    shown = [*plays[:num_plays], ()] if can_pass else list(plays[:num_plays])
+    chosen = choose_play(hand, last_play)
+    assert greedy[b] == (shown.index(chosen) if chosen in shown else -1)
+    return shown
+
+
+@pytest.mark.parametrize("greedy_seats", [(), (1, 3)])
+def test_matches_thirteen_engine(greedy_seats):
+    env = BatchedGameEnv(GAMES, seed=0, greedy_seats=greedy_seats)
+    rng = random.Random(0)
+    env.reset()
+    games = [_mirror(env, b) for b in range(GAMES)]
+    checked = finished_games = 0
+    for _ in range(STEPS):
+        observation = env.observe()
+        greedy = env.greedy_actions()
+        use_greedy = rng.random() < 0.2
+        actions = np.zeros(GAMES, dtype=np.int64)
+        turns = []
+        for b, game in enumerate(games):
+            if env.done[b]:
+                continue
+            shown = _check_turn(env, observation, greedy, b, game)
+            player = game.current_player
+            chosen = choose_play(game.hands[player], game.last_play)
+            turns.append((game.hands[player], game.last_play, chosen))
+            actions[b] = rng.randrange(len(shown))
+            _move(game, chosen if use_greedy else shown[actions[b]])
+            checked += 1
+        hands, last_plays, chosen = zip(*turns)
+        assert greedy_policy(list(hands), last_plays) == list(chosen)
+        assert greedy_policy(hands[0], last_plays[0]) == chosen[0]
+
+        finished = env.step_greedy() if use_greedy else env.step(actions)
+        for game in games:
+            _play_greedy_seats(game, greedy_seats)
+        for b, game in enumerate(games):
+            assert env.done[b] == game.is_game_over(), b
+        for b in finished.tolist():
+            assert env.win_order[b].tolist() == games[b].win_order, b
+        env.reset(finished)
+        for b in finished.tolist():
+            games[b] = _mirror(env, b)
+        finished_games += finished.size
+    assert checked > GAMES * STEPS // 2
+    assert finished_games > GAMES
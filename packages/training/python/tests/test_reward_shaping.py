@@ -0,0 +1,97 @@
+"""EpisodeTracker rewards with random seats played by the server vs. stepped from Python.
+
+Before record_seats, random seats were stepped from Python and every one of
+their turns reached EpisodeTracker; with the server playing them, the
+tracker only sees them through the move record. Both must credit the same
+rewards.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from game_bridge import GameOver, TurnInfo  # noqa: E402
+from thirteen_engine import EngineBridge  # noqa: E402
+from train_ppo import EpisodeTracker  # noqa: E402
+
+GAMES = 300
+_EMPTY = np.empty(0, dtype=np.float32)
+
+
+def _act(turn: TurnInfo, tracker: EpisodeTracker, rng: random.Random) -> int:
+    """Seat 0's move: a random action, stored as a PPO step."""
+    tracker.player_bufs[0].add(_EMPTY, _EMPTY, _EMPTY, 0, 0.0, 0.0)
+    return rng.randrange(turn.num_actions + turn.can_pass)
+
+
+def _server_seats(seed: int, record_seats: bool):
+    """Seats 1-3 random on the server; returns the GameResult and their moves."""
+    with EngineBridge(seed) as bridge:
+        bridge.configure(record_seats=record_seats)
+        turn = bridge.new_game(random_seats=[1, 2, 3])
+        tracker = EpisodeTracker(turn, {0}, use_shaping=True)
+        rng = random.Random(seed)
+        seat_moves = [move["cards"] for move in turn.forced_moves or ()]
+        while True:
+            result = bridge.step(_act(turn, tracker, rng))
+            seat_moves += [move["cards"] for move in result.forced_moves or ()]
+            game_result = tracker.observe(result)
+            if game_result is not None:
+                return game_result, seat_moves
+            turn = result
+
+
+def _python_seats(seed: int, seat_moves: list[list[int]]):
+    """The same deal with seats 1-3 stepped from Python, replaying seat_moves."""
+    moves = iter(seat_moves)
+    with EngineBridge(seed) as bridge:
+        turn = bridge.new_game()
+        tracker = EpisodeTracker(turn, {0}, use_shaping=True)
+        rng = random.Random(seed)
+        while True:
+            if turn.player == 0:
+                action = _act(turn, tracker, rng)
+            else:
+                cards = sorted(next(moves))
+                plays = [sorted(values) for values in turn.action_values()]
+                action = plays.index(cards) if cards else turn.num_actions
+            result = bridge.step(action)
+            game_result = tracker.observe(result)
+            if game_result is not None:
+                assert next(moves, None) is None
+                return game_result
+            turn = result
+
+
+def test_shaped_rewards_match_python_played_random_seats():
+    tricks = 0
+    for seed in range(GAMES):
+        recorded, seat_moves = _server_seats(seed, record_seats=True)
+        played = _python_seats(seed, seat_moves)
+        assert played.win_order == recorded.win_order, seed
+        assert played.player_bufs[0].rewards == recorded.player_bufs[0].rewards, seed
+        tricks += sum(r > 0 for r in recorded.player_bufs[0].rewards[:-1])
+    # Power gain has to have fired for the comparison to mean anything
+    assert tricks > GAMES
+
+
+def test_record_seats_leaves_move_count_unchanged():
+    for seed in range(50):
+        with_record, _ = _server_seats(seed, record_seats=True)
+        without, _ = _server_seats(seed, record_seats=False)
+        assert with_record.win_order == without.win_order
+        assert with_record.moves == without.moves
+
+
+def test_game_over_carries_the_last_moves():
+    for seed in range(50):
+        with EngineBridge(seed) as bridge:
+            bridge.configure(record_seats=True)
+            result = bridge.new_game(random_seats=[1, 2, 3])
+            while not isinstance(result, GameOver):
+                result = bridge.step(0)
+            assert result.forced == 0
+            assert all(move["seat"] and move["player"] != 0 for move in result.forced_moves)
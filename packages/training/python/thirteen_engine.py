@@ -0,0 +1,961 @@
+"""
+Pure-Python Tiến Lên engine on 52-bit card masks.
+
+Mirrors the TypeScript game logic in packages/game-logic/src (deck.ts,
+play.ts, move-validator.ts, game-state.ts, bot/hand-evaluator.ts and the
+greedy bot's choosePlay) plus the game server's tournament scoring, so
+rollouts can run in-process instead of through a Node subprocess. Cards are
+values rank * 4 + suit (0..51), a hand is an int with bit v set for each card
+held, and a play is a tuple of card values.
+
+⚠️  SYNC WARNING: legal-action lists must come out in exactly the order of
+    hand-evaluator.ts evaluate() / getAllPlays(): action indices are
+    positions in that list. Replay TS-generated games to check:
+
+        yarn workspace @thirteen/game-logic generate-data --games=1000 --output=data/parity.jsonl
+        python thirteen_engine.py data/parity.jsonl
+
+EngineBridge is a GameBridge whose commands are answered in-process by
+EngineServer (a port of game-server.ts's game commands), so code written
+against GameBridge — sessions, batch, VecGameBridge — runs on either
+backend; train_ppo.py and evaluate.py select it with --engine python.
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from game_bridge import CARD_DATA, COMBO_NAMES, GameBridge, mask_cards
+
+NUM_PLAYERS = 4
+SINGLE, PAIR, TRIPLE, QUAD, RUN, BOMB, INVALID = range(7)
+# Rank of the 2s: highest, and never part of a run or bomb
+TWO = 12
+TOURNEY_POINTS = (4, 2, 1, 0)
+ROUND_RESET = "round_reset"
+_SAFETY_CAP = 500
+
+# Card values held in rank r's 4-bit nibble of a hand mask
+_RANK_CARDS = [
+    [tuple(r * 4 + s for s in range(4) if nibble >> s & 1) for nibble in range(16)]
+    for r in range(13)
+]
+
+
+def mask_of(cards) -> int:
+    """Hand mask of an iterable of card values."""
+    mask = 0
+    for v in cards:
+        mask |= 1 << v
+    return mask
+
+
+def by_rank(hand: int) -> list[tuple[int, ...]]:
+    """Card values held of each rank (13 entries, ascending within a rank)."""
+    return [_RANK_CARDS[r][hand >> (4 * r) & 15] for r in range(13)]
+
+
+def mask_values(hand: int) -> list[int]:
+    """Card values of a hand mask, ascending."""
+    values = []
+    for r in range(13):
+        values.extend(_RANK_CARDS[r][hand >> (4 * r) & 15])
+    return values
+
+
+# ── Plays and validation (play.ts, move-validator.ts) ─────────────────────────
+
+class Play:
+    """A validated play: cards ascending, value = highest card (for comparison)."""
+
+    __slots__ = ("combo", "cards", "suited", "value")
+
+    def __init__(self, combo: int, cards, suited: bool = False):
+        self.combo = combo
+        self.cards = tuple(sorted(cards))
+        self.suited = suited
+        self.value = self.cards[-1]
+
+    def __repr__(self) -> str:
+        return f"Play({COMBO_NAMES[self.combo]}, {list(self.cards)}, suited={self.suited})"
+
+    def to_data(self) -> dict:
+        """The snapshot's PlayData dict."""
+        return {
+            "combo": COMBO_NAMES[self.combo],
+            "cards": [CARD_DATA[v] for v in self.cards],
+            "suited": self.suited,
+        }
+
+
+class MoveResult(NamedTuple):
+    valid: bool
+    play: Play | None
+    error: str
+
+
+def _is_run(cards: tuple[int, ...]) -> bool:
+    """Sorted cards of 3+ consecutive ranks, no 2s."""
+    if len(cards) < 3 or cards[-1] >> 2 == TWO:
+        return False
+    return all((cards[i] >> 2) + 1 == cards[i + 1] >> 2 for i in range(len(cards) - 1))
+
+
+def _is_bomb(cards: tuple[int, ...]) -> bool:
+    """Sorted cards forming 3+ consecutive pairs."""
+    if len(cards) < 6 or len(cards) % 2:
+        return False
+    if any(cards[i] >> 2 != cards[i + 1] >> 2 for i in range(0, len(cards), 2)):
+        return False
+    return _is_run(cards[1::2])
+
+
+def _is_suited(cards: tuple[int, ...]) -> bool:
+    return len(cards) > 0 and all(v & 3 == cards[0] & 3 for v in cards)
+
+
+def _same_rank(cards: tuple[int, ...]) -> bool:
+    return all(v >> 2 == cards[0] >> 2 for v in cards)
+
+
+def determine_combo(cards: tuple[int, ...]) -> int:
+    """Combo of sorted card values (INVALID if none)."""
+    n = len(cards)
+    if n == 1:
+        return SINGLE
+    if 2 <= n <= 4 and _same_rank(cards):
+        return (PAIR, TRIPLE, QUAD)[n - 2]
+    if _is_run(cards):
+        return RUN
+    if _is_bomb(cards):
+        return BOMB
+    return INVALID
+
+
+def _matches_combo(play: Play, cards: tuple[int, ...]) -> bool:
+    if play.combo == RUN:
+        return len(cards) == len(play.cards) and _is_run(cards)
+    if play.combo == BOMB:
+        return len(cards) == len(play.cards) and _is_bomb(cards)
+    return play.combo != INVALID and determine_combo(cards) == play.combo
+
+
+def validate(last_play: Play | None, cards) -> MoveResult:
+    """Validate a move; last_play is None when the player has power (opening move)."""
+    cards = tuple(sorted(cards))
+    if last_play is None:
+        combo = determine_combo(cards)
+        if combo == INVALID:
+            return MoveResult(False, None, "That's not a valid hand")
+        if combo == BOMB:
+            return MoveResult(False, None, "Bombs can only be used to chop 2s")
+        return MoveResult(True, Play(combo, cards, combo == RUN and _is_suited(cards)), "")
+
+    if not _matches_combo(last_play, cards):
+        # Special case: chopping 2s
+        if last_play.cards[0] >> 2 == TWO:
+            combo = determine_combo(cards)
+            num_twos = len(last_play.cards)
+            if num_twos == 1 and combo == QUAD:
+                return MoveResult(True, Play(combo, cards), "")
+            if combo == BOMB and len(cards) == (num_twos + 2) * 2:
+                return MoveResult(True, Play(combo, cards), "")
+            return MoveResult(False, None, "You need to play a valid chop")
+        return MoveResult(False, None, f"You need to play a {COMBO_NAMES[last_play.combo]}")
+
+    if last_play.combo == RUN and last_play.suited and not _is_suited(cards):
+        return MoveResult(False, None, "You need to play a suited run")
+    attempt = Play(last_play.combo, cards, last_play.suited if last_play.combo == RUN else False)
+    if last_play.value >= attempt.value:
+        return MoveResult(False, None, "That doesn't beat the last play")
+    return MoveResult(True, attempt, "")
+
+
+# ── Move generation (bot/hand-evaluator.ts) ───────────────────────────────────
+#
+# Candidates are generated in hand-evaluator.ts order and always have the
+# shape validate() requires (its combo and length, or a chop), so the
+# validate() call there reduces to "top card above `floor`" (-1 = anything
+# goes) plus the suited-run rule.
+
+class Evaluation(NamedTuple):
+    singles: list[tuple[int, ...]]
+    pairs: list[tuple[int, ...]]
+    triples: list[tuple[int, ...]]
+    quads: list[tuple[int, ...]]
+    runs: list[tuple[int, ...]]
+    bombs: list[tuple[int, ...]]
+
+
+def get_all_plays(result: Evaluation) -> list[tuple[int, ...]]:
+    """The legal-action list: singles, pairs, triples, quads, runs, bombs."""
+    return [
+        *result.singles, *result.pairs, *result.triples,
+        *result.quads, *result.runs, *result.bombs,
+    ]
+
+
+# ── Move tables ──
+#
+# Which combos a hand holds depends only on its rank histogram, so the
+# structure is looked up instead of searched for: index tuples of the pairs
+# and triples within a rank of n cards, and for every set of ranks below the
+# 2s, the lowest ranks of its streaks of each length (runs take one card per
+# held rank, bombs two per paired rank). Cards and the filter against
+# lastPlay's top card are applied per hand.
+
+def _streak_starts(ranks: int) -> list[tuple[int, ...]]:
+    """Lowest ranks of every streak of n consecutive ranks set in `ranks`, by n."""
+    streak = [0] * (TWO + 1)
+    for r in range(TWO - 1, -1, -1):
+        streak[r] = streak[r + 1] + 1 if ranks >> r & 1 else 0
+    return [tuple(r for r in range(TWO) if streak[r] >= n) for n in range(TWO + 1)]
+
+
+_PAIR_PICKS = [list(itertools.combinations(range(n), 2)) for n in range(5)]
+_TRIPLE_PICKS = [list(itertools.combinations(range(n), 3)) for n in range(5)]
+# Indexed by the set of ranks (bit r for rank r < TWO), then by streak length
+_STREAK_STARTS = [_streak_starts(ranks) for ranks in range(1 << TWO)]
+
+
+def _rank_set(ranks: list[tuple[int, ...]], min_cards: int) -> int:
+    """Bit r set for each rank below the 2s with at least min_cards cards."""
+    return sum(1 << r for r in range(TWO) if len(ranks[r]) >= min_cards)
+
+
+def _singles(hand: int, floor: int) -> list[tuple[int, ...]]:
+    return [(v,) for v in mask_values(hand) if v > floor]
+
+
+def _pairs(ranks: list[tuple[int, ...]], floor: int) -> list[tuple[int, ...]]:
+    return [
+        (cards[i], cards[j])
+        for cards in ranks for i, j in _PAIR_PICKS[len(cards)] if cards[j] > floor
+    ]
+
+
+def _triples(ranks: list[tuple[int, ...]], floor: int) -> list[tuple[int, ...]]:
+    return [
+        (cards[i], cards[j], cards[k])
+        for cards in ranks for i, j, k in _TRIPLE_PICKS[len(cards)] if cards[k] > floor
+    ]
+
+
+def _quads(ranks: list[tuple[int, ...]], floor: int) -> list[tuple[int, ...]]:
+    return [cards for cards in ranks if len(cards) == 4 and cards[3] > floor]
+
+
+def _runs(
+    ranks: list[tuple[int, ...]], floor: int, suited: bool = False, length: int | None = None,
+) -> list[tuple[int, ...]]:
+    """Runs of `length` cards (or every length from 3 when opening), in order
+    of length then start card: any card of the lowest rank, then the lowest
+    card of each following rank."""
+    starts = _STREAK_STARTS[_rank_set(ranks, 1)]
+    valid = []
+    for n in range(3, TWO + 1) if length is None else (length,):
+        # No run of this length means none longer either
+        if not starts[n]:
+            break
+        for r in starts[n]:
+            rest = tuple(ranks[q][0] for q in range(r + 1, r + n))
+            # Every start card gives the same top card
+            if rest[-1] <= floor:
+                continue
+            for start in ranks[r]:
+                run = (start, *rest)
+                if not suited or _is_suited(run):
+                    valid.append(run)
+    return valid
+
+
+def _bombs(
+    ranks: list[tuple[int, ...]], floor: int, num_pairs: int | None = None,
+) -> list[tuple[int, ...]]:
+    """Bombs of `num_pairs` consecutive pairs (or every size from 3), in order
+    of size then lowest rank, from the first two cards held of each rank.
+    Pairs of 2s never make a bomb."""
+    starts = _STREAK_STARTS[_rank_set(ranks, 2)]
+    valid = []
+    for n in range(3, TWO + 1) if num_pairs is None else (num_pairs,):
+        if not starts[n]:
+            break
+        for r in starts[n]:
+            if ranks[r + n - 1][1] > floor:
+                valid.append(tuple(v for q in range(r, r + n) for v in ranks[q][:2]))
+    return valid
+
+
+def evaluate(hand: int, last_play: Play | None) -> Evaluation:
+    """All valid plays from a hand, by category (see hand-evaluator.ts evaluate).
+
+    Only categories that can beat last_play are generated: its own combo
+    (runs and bombs of its length), plus the chops when it is made of 2s.
+    Opening allows every combo except bombs.
+    """
+    ranks = by_rank(hand)
+    if last_play is None:
+        return Evaluation(
+            _singles(hand, -1), _pairs(ranks, -1), _triples(ranks, -1),
+            _quads(ranks, -1), _runs(ranks, -1), [],
+        )
+
+    combo = last_play.combo
+    size = len(last_play.cards)
+    floor = last_play.value
+    twos = last_play.cards[0] >> 2 == TWO
+    if combo == BOMB:
+        bombs = _bombs(ranks, floor, size // 2)
+    elif twos:
+        bombs = _bombs(ranks, -1, size + 2)
+    else:
+        bombs = []
+    if combo == QUAD:
+        quads = _quads(ranks, floor)
+    elif twos and size == 1:
+        quads = _quads(ranks, -1)
+    else:
+        quads = []
+    return Evaluation(
+        _singles(hand, floor) if combo == SINGLE else [],
+        _pairs(ranks, floor) if combo == PAIR else [],
+        _triples(ranks, floor) if combo == TRIPLE else [],
+        quads,
+        _runs(ranks, floor, last_play.suited, size) if combo == RUN else [],
+        bombs,
+    )
+
+
+def hand_combos(hand: int) -> Evaluation:
+    """Every combo in a hand, by category: the opening plays plus all bombs.
+
+    evaluate(hand, last_play) lists exactly the entries of
+    get_all_plays(hand_combos(hand)) that beat last_play, in the same order,
+    so a per-hand list can be filtered instead of regenerated.
+    """
+    return evaluate(hand, None)._replace(bombs=_bombs(by_rank(hand), -1))
+
+
+def choose_play(hand: int, last_play: Play | None) -> tuple[int, ...]:
+    """Greedy bot (bot-player.ts choosePlay); () means pass.
+
+    Opening: the largest non-bomb combo holding the lowest card, ties broken
+    by lowest top card. Otherwise the valid play with the lowest top card.
+    """
+    evaluation = evaluate(hand, last_play)
+    if last_play is None:
+        non_bomb = evaluation.singles + evaluation.pairs + evaluation.triples + evaluation.runs
+        if not non_bomb:
+            if evaluation.quads:
+                return evaluation.quads[0]
+            if evaluation.bombs:
+                return evaluation.bombs[0]
+            return tuple(mask_values(hand)[:1])
+        lowest = min(play[0] for play in non_bomb)
+        with_lowest = [play for play in non_bomb if lowest in play]
+        return min(with_lowest, key=lambda play: (-len(play), play[-1]))
+
+    plays = get_all_plays(evaluation)
+    if not plays:
+        return ()
+    return min(plays, key=lambda play: play[-1])
+
+
+def random_play(hand: int, last_play: Play | None, rng: random.Random) -> tuple[int, ...]:
+    """Uniformly random legal move, counting pass as one option; () means pass."""
+    plays = get_all_plays(evaluate(hand, last_play))
+    options = len(plays) + (last_play is not None)
+    choice = int(rng.random() * options)
+    return plays[choice] if choice < len(plays) else ()
+
+
+@functools.lru_cache(maxsize=8192)
+def compute_combo_type_map(hand: int) -> tuple[int, ...]:
+    """Per-card combo type counts (52 × 7), as game-server.ts computeComboTypeMap.
+
+    Memoized on the hand mask: a hand is encoded on each of its turns until
+    it plays. The map is shared between callers, hence a tuple.
+    """
+    combo_type_map = [0] * (52 * 7)
+    for combo_idx, plays in enumerate(evaluate(hand, None)):
+        for play in plays:
+            for v in play:
+                combo_type_map[v * 7 + combo_idx] += 1
+    return tuple(combo_type_map)
+
+
+# ── Dealing and game state (deck.ts, game-state.ts) ───────────────────────────
+
+def deal(rng: random.Random | None = None) -> list[int]:
+    """Fisher-Yates shuffle, 13 cards to each of the 4 players, as hand masks."""
+    rng = rng or random
+    cards = list(range(52))
+    for i in range(51, 0, -1):
+        j = int(rng.random() * (i + 1))
+        cards[i], cards[j] = cards[j], cards[i]
+    return [mask_of(cards[p * 13:(p + 1) * 13]) for p in range(NUM_PLAYERS)]
+
+
+def find_starting_player(hands: list[int]) -> int:
+    """The player with 3♠ (value 0); fallback: the player with the lowest card."""
+    for p, hand in enumerate(hands):
+        if hand & 1:
+            return p
+    lowest_value = 52
+    lowest_player = 0
+    for p, hand in enumerate(hands):
+        if hand and (hand & -hand).bit_length() - 1 < lowest_value:
+            lowest_value = (hand & -hand).bit_length() - 1
+            lowest_player = p
+    return lowest_player
+
+
+class GameState:
+    """One game, as game-state.ts GameState; hands are card masks.
+
+    play_log holds (player, Play), (player, None) for a pass, or ROUND_RESET.
+    """
+
+    def __init__(self, hands: list[int]):
+        self.hands = list(hands)
+        self.last_play: Play | None = None
+        self.last_play_by = -1
+        self.current_player = find_starting_player(self.hands)
+        self.players_in_round = [True] * NUM_PLAYERS
+        self.players_in_game = [True] * NUM_PLAYERS
+        self.win_order: list[int] = []
+        self.play_log: list = []
+        # Snapshot aggregates; per-player entries are replaced rather than
+        # mutated, so snapshots share them until that player plays again
+        self._cards_played: list[list[dict]] = [[] for _ in range(NUM_PLAYERS)]
+        self._combos_played: list[dict[str, int]] = [{} for _ in range(NUM_PLAYERS)]
+
+    def can_play(self, player: int, cards) -> MoveResult:
+        if player != self.current_player:
+            return MoveResult(False, None, "Not your turn")
+        if not self.players_in_game[player]:
+            return MoveResult(False, None, "You already won")
+        result = validate(self.last_play, cards)
+        if result.valid and mask_of(cards) & ~self.hands[player]:
+            return MoveResult(False, None, "You don't have that card")
+        return result
+
+    def play_cards(self, player: int, cards) -> MoveResult:
+        result = self.can_play(player, cards)
+        if not result.valid:
+            return result
+        play = result.play
+        self.hands[player] &= ~mask_of(play.cards)
+        self.last_play = play
+        self.last_play_by = player
+        self.play_log.append((player, play))
+        self._cards_played[player] = self._cards_played[player] + [CARD_DATA[v] for v in play.cards]
+        combos = self._combos_played[player]
+        name = COMBO_NAMES[play.combo]
+        self._combos_played[player] = {**combos, name: combos.get(name, 0) + 1}
+
+        if not self.hands[player]:
+            self._player_wins(player)
+        else:
+            self._advance_turn()
+            if self.current_player == self.last_play_by:
+                self._reset_round()
+        return result
+
+    def pass_turn(self, player: int) -> bool:
+        if player != self.current_player or not self.players_in_game[player]:
+            return False
+        if self.last_play is None:  # Can't pass with power
+            return False
+
+        self.players_in_round[player] = False
+        self.play_log.append((player, None))
+        if self._round_over():
+            # Power goes to the trick winner, or the next player still in the game
+            self.current_player = self.last_play_by
+            if not self.players_in_game[self.current_player]:
+                start = self.current_player
+                while True:
+                    self.current_player = (self.current_player + 1) % NUM_PLAYERS
+                    if self.players_in_game[self.current_player] or self.current_player == start:
+                        break
+            self._reset_round()
+        else:
+            self._advance_turn()
+            if self.current_player == self.last_play_by:
+                self._reset_round()
+        return True
+
+    def _player_wins(self, player: int) -> None:
+        self.players_in_game[player] = False
+        self.players_in_round[player] = False
+        self.win_order.append(player)
+        remaining = [p for p in range(NUM_PLAYERS) if self.players_in_game[p]]
+        if len(remaining) == 1:
+            self.win_order.append(remaining[0])
+        else:
+            # Power passes to the left of the winner
+            self._advance_turn()
+            if self._round_over():
+                self._reset_round()
+
+    def _round_over(self) -> bool:
+        return not any(
+            in_game and in_round
+            for in_game, in_round in zip(self.players_in_game, self.players_in_round)
+        )
+
+    def _reset_round(self) -> None:
+        self.last_play = None
+        self.last_play_by = -1
+        self.players_in_round = list(self.players_in_game)
+        self.play_log.append(ROUND_RESET)
+
+    def _advance_turn(self) -> None:
+        start = self.current_player
+        while True:
+            self.current_player = (self.current_player + 1) % NUM_PLAYERS
+            p = self.current_player
+            if self.players_in_game[p] and self.players_in_round[p]:
+                return
+            if p == start:
+                self._reset_round()
+                # After the reset, find the next active player (start may have won)
+                if not self.players_in_game[p]:
+                    for i in range(1, NUM_PLAYERS):
+                        if self.players_in_game[(p + i) % NUM_PLAYERS]:
+                            self.current_player = (p + i) % NUM_PLAYERS
+                            break
+                return
+
+    def is_game_over(self) -> bool:
+        return len(self.win_order) >= NUM_PLAYERS - 1
+
+    def has_power(self) -> bool:
+        return self.last_play is None
+
+    def to_snapshot(self) -> dict:
+        """The GameStateSnapshot dict the TS server sends; treat it as read-only."""
+        return {
+            "hands": [mask_cards(hand) for hand in self.hands],
+            "currentPlayer": self.current_player,
+            "lastPlay": self.last_play.to_data() if self.last_play else None,
+            "lastPlayBy": self.last_play_by,
+            "passedPlayers": [not in_round for in_round in self.players_in_round],
+            "winOrder": list(self.win_order),
+            "playersInGame": list(self.players_in_game),
+            "cardsPlayedByPlayer": list(self._cards_played),
+            "combosPlayedByPlayer": list(self._combos_played),
+        }
+
+
+def tourney_context(scores: list[int], target_score: int, game_number: int) -> dict:
+    """The snapshot's tourneyContext; ~1.75 points per player per game sets the expected length."""
+    return {
+        "scores": list(scores),
+        "targetScore": target_score,
+        "gameNumber": game_number,
+        "expectedTotalGames": math.ceil(target_score / 1.75),
+    }
+
+
+# ── In-process game server (training/game-server.ts) ─────────────────────────
+
+@dataclass
+class _Session:
+    game: GameState | None = None
+    # (play log length, plays) of the last turn response, for the next step
+    turn_plays: tuple[int, list] | None = None
+    greedy_seats: frozenset = frozenset()
+    random_seats: frozenset = frozenset()
+    auto_forced: bool | str = False
+    forced_moves: list = field(default_factory=list)
+    projection: dict = field(default_factory=dict)
+    tourney_scores: list = field(default_factory=lambda: [0] * NUM_PLAYERS)
+    tourney_game_number: int = 0
+    tourney_target_score: int = 21
+    tourney_mode: bool = False
+
+
+def _new_server_stats() -> dict:
+    return {
+        "commands": {}, "greedy_ms": 0.0, "greedy_moves": 0, "forced_moves": 0,
+        "model_ms": 0.0, "model_moves": 0, "turn_ms": 0.0, "send_ms": 0.0,
+        "prefetch_ms": 0.0, "prefetched": 0, "prefetch_hits": 0,
+    }
+
+
+_BATCH_DISALLOWED = {"batch", "quit", "load_model", "simulate"}
+
+
+def _count_forced(moves: list[dict]) -> int:
+    """Forced moves in a move record, leaving out random seat moves."""
+    return sum(1 for move in moves if "seat" not in move)
+
+
+class EngineServer:
+    """game-server.ts's command handling on the Python engine.
+
+    handle() takes a command dict and returns the JSON-protocol response
+    dict: new_game / new_tourney / next_game / step with greedy, random and
+    auto_forced seats and projections, multiplexed by game_id, plus batch,
+    close_game and stats. configure takes record_seats; encoded features,
+    deltas, prefetch and the binary protocol are TS server features, which
+    it acknowledges as off.
+    There are no model seats, load_model or simulate.
+    """
+
+    def __init__(self, seed: int | None = None):
+        self._rng = random.Random(seed)
+        self._sessions: dict[str, _Session] = {}
+        self._stats = _new_server_stats()
+        # Random seat moves go in turn responses' move record
+        self._record_seats = False
+
+    def handle(self, msg: dict) -> dict:
+        if msg["cmd"] == "configure":
+            return self._configure(msg)
+        start = time.perf_counter()
+        response = self._execute(msg)
+        entry = self._stats["commands"].setdefault(msg["cmd"], {"count": 0, "compute_ms": 0.0})
+        entry["count"] += 1
+        entry["compute_ms"] += (time.perf_counter() - start) * 1000
+        return response
+
+    def _configure(self, msg: dict) -> dict:
+        protocol = msg.get("protocol", "json")
+        if protocol not in ("json", "binary"):
+            return {"type": "error", "message": f"Unknown protocol: {protocol}"}
+        if msg.get("transport", "pipe") != "pipe":
+            return {"type": "error", "message": "The Python engine has no shm transport"}
+        self._record_seats = msg.get("record_seats", self._record_seats)
+        return {
+            "type": "configured", "protocol": "json", "encode": False,
+            "delta": False, "prefetch": False, "record_seats": self._record_seats,
+            "transport": "pipe",
+        }
+
+    def _session(self, game_id) -> _Session:
+        key = str("default" if game_id is None else game_id)
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = _Session()
+        return session
+
+    def _execute(self, msg: dict) -> dict:
+        cmd = msg["cmd"]
+        if cmd in ("new_game", "new_tourney"):
+            error = self._check_options(msg)
+            if error:
+                return error
+            session = self._session(msg.get("game_id"))
+            session.tourney_mode = cmd == "new_tourney"
+            if session.tourney_mode:
+                session.tourney_scores = [0] * NUM_PLAYERS
+                session.tourney_target_score = msg.get("target_score", 21)
+                session.tourney_game_number = 1
+            return self._start_game(session, msg)
+
+        if cmd == "next_game":
+            session = self._session(msg.get("game_id"))
+            if not session.tourney_mode:
+                return {"type": "error", "message": "Not in tournament mode"}
+            error = self._check_options(msg)
+            if error:
+                return error
+            for points, player in zip(TOURNEY_POINTS, msg["win_order"]):
+                session.tourney_scores[player] += points
+            if max(session.tourney_scores) >= session.tourney_target_score:
+                session.tourney_mode = False
+                return {
+                    "type": "tourney_over",
+                    "scores": list(session.tourney_scores),
+                    "games_played": session.tourney_game_number,
+                }
+            session.tourney_game_number += 1
+            return self._start_game(session, msg)
+
+        if cmd == "step":
+            return self._step(self._session(msg.get("game_id")), msg)
+
+        if cmd == "close_game":
+            self._sessions.pop(str(msg.get("game_id", "default")), None)
+            return {"type": "closed"}
+
+        if cmd == "stats":
+            stats = {"type": "stats", **self._stats}
+            if msg.get("reset"):
+                self._stats = _new_server_stats()
+            return stats
+
+        if cmd == "batch":
+            return {
+                "type": "batch",
+                "responses": [
+                    {"type": "error", "message": f"Command not allowed in batch: {sub['cmd']}"}
+                    if sub["cmd"] in _BATCH_DISALLOWED else self.handle(sub)
+                    for sub in msg.get("commands", [])
+                ],
+            }
+
+        if cmd in ("load_model", "simulate"):
+            return {"type": "error", "message": f"Not supported by the Python engine: {cmd}"}
+        return {"type": "error", "message": f"Unknown command: {cmd}"}
+
+    @staticmethod
+    def _check_options(msg: dict) -> dict | None:
+        # No model can be loaded here, so any model seat is unknown
+        for model_id in (msg.get("model_seats") or {}).values():
+            return {"type": "error", "message": f"Unknown model: {model_id}"}
+        projection = msg.get("projection") or {}
+        hands = projection.get("hands", "all")
+        if hands not in ("all", "own+sizes"):
+            return {"type": "error", "message": f"Unknown hands projection: {hands}"}
+        valid_actions = projection.get("valid_actions", "cards")
+        if valid_actions not in ("cards", "values"):
+            return {"type": "error", "message": f"Unknown valid_actions projection: {valid_actions}"}
+        return None
+
+    def _start_game(self, session: _Session, msg: dict) -> dict:
+        session.auto_forced = msg.get("auto_forced", False)
+        session.forced_moves = []
+        session.projection = msg.get("projection") or {}
+        session.greedy_seats = frozenset(msg.get("greedy_seats") or ())
+        session.random_seats = frozenset(msg.get("random_seats") or ())
+        session.game = GameState(deal(self._rng))
+        session.turn_plays = None
+        return self._advance(session)
+
+    def _step(self, session: _Session, msg: dict) -> dict:
+        game = session.game
+        if game is None or game.is_game_over():
+            return {"type": "error", "message": "No active game"}
+        if msg.get("auto_forced") is not None:
+            session.auto_forced = msg["auto_forced"]
+
+        # The plays this step indexes into were generated for the last turn response
+        player = game.current_player
+        cached = session.turn_plays
+        if cached and cached[0] == len(game.play_log):
+            plays = cached[1]
+        else:
+            plays = get_all_plays(evaluate(game.hands[player], game.last_play))
+        session.turn_plays = None
+        can_pass = game.last_play is not None
+        action_index = msg.get("action_index", 0)
+
+        # action_index == len(plays) means pass (when can_pass)
+        if can_pass and action_index == len(plays):
+            game.pass_turn(player)
+        elif 0 <= action_index < len(plays):
+            game.play_cards(player, plays[action_index])
+        else:
+            return {
+                "type": "error",
+                "message": f"Invalid action_index {action_index} ({len(plays)} plays, "
+                           f"canPass={'true' if can_pass else 'false'})",
+            }
+        return self._advance(session)
+
+    def _advance(self, session: _Session) -> dict:
+        """Auto-play greedy, random and forced moves, then the response for the next turn."""
+        start = time.perf_counter()
+        plays = self._auto_play(session)
+        turn_start = time.perf_counter()
+        self._stats["greedy_ms"] += (turn_start - start) * 1000
+        response = self._turn_response(session, plays)
+        self._stats["turn_ms"] += (time.perf_counter() - turn_start) * 1000
+        return response
+
+    def _auto_play(self, session: _Session) -> list | None:
+        """Returns the acting seat's plays if auto_forced already generated them."""
+        game = session.game
+        for _ in range(_SAFETY_CAP):
+            if game.is_game_over():
+                break
+            player = game.current_player
+            hand = game.hands[player]
+            if player in session.greedy_seats:
+                cards = choose_play(hand, game.last_play)
+            elif player in session.random_seats:
+                cards = random_play(hand, game.last_play, self._rng)
+                if self._record_seats:
+                    session.forced_moves.append({
+                        "player": player, "can_pass": game.last_play is not None,
+                        "cards": list(cards), "seat": True,
+                    })
+            elif session.auto_forced:
+                plays = get_all_plays(evaluate(hand, game.last_play))
+                can_pass = game.last_play is not None
+                if len(plays) + can_pass != 1:
+                    return plays
+                cards = () if can_pass else plays[0]
+                session.forced_moves.append(
+                    {"player": player, "can_pass": can_pass, "cards": list(cards)}
+                )
+                self._stats["forced_moves"] += 1
+            else:
+                break
+
+            if cards:
+                game.play_cards(player, cards)
+            else:
+                game.pass_turn(player)
+            self._stats["greedy_moves"] += 1
+        return None
+
+    def _turn_response(self, session: _Session, plays: list | None) -> dict:
+        game = session.game
+        if game.is_game_over():
+            response = {"type": "game_over", "win_order": list(game.win_order)}
+            if session.auto_forced == "record" or self._record_seats:
+                response["forced"] = _count_forced(session.forced_moves)
+                response["forced_moves"] = session.forced_moves
+            session.forced_moves = []
+            return response
+
+        player = game.current_player
+        if plays is None:
+            plays = get_all_plays(evaluate(game.hands[player], game.last_play))
+        session.turn_plays = (len(game.play_log), plays)
+        projection = session.projection
+
+        state = game.to_snapshot()
+        if not projection.get("no_combo_map"):
+            state["handComboTypeMap"] = compute_combo_type_map(game.hands[player])
+        if session.tourney_mode:
+            state["tourneyContext"] = tourney_context(
+                session.tourney_scores, session.tourney_target_score,
+                session.tourney_game_number,
+            )
+        if projection.get("hands") == "own+sizes":
+            state["hands"] = [cards if p == player else [] for p, cards in enumerate(state["hands"])]
+            state["handSizes"] = [hand.bit_count() for hand in game.hands]
+
+        response = {
+            "type": "turn",
+            "state": state,
+            "player": player,
+            "valid_actions": (
+                [list(play) for play in plays]
+                if projection.get("valid_actions") == "values"
+                else [[CARD_DATA[v] for v in play] for play in plays]
+            ),
+            "can_pass": game.last_play is not None,
+        }
+        if session.auto_forced:
+            response["forced"] = _count_forced(session.forced_moves)
+        if session.auto_forced == "record" or self._record_seats:
+            response["forced_moves"] = session.forced_moves
+        session.forced_moves = []
+        return response
+
+
+class EngineBridge(GameBridge):
+    """GameBridge backed by an in-process EngineServer instead of a Node server.
+
+    Commands and responses are the same dicts as the JSON protocol, just
+    never serialized, so new_game / step / sessions / batch / stats and
+    VecGameBridge behave as with GameBridge. Turns never carry encoded
+    features (encode_features stays False; encode in Python), and model
+    seats, load_model and simulate raise RuntimeError. seed makes deals and
+    random seats reproducible. Stats count engine time as "wait".
+    """
+
+    def __init__(self, seed: int | None = None):
+        start = time.perf_counter()
+        self._server = EngineServer(seed)
+        self._responses: deque[dict] = deque()
+        self._init_state()
+        self.startup_time = time.perf_counter() - start
+
+    def _write(self, obj: dict) -> None:
+        start = time.perf_counter()
+        self._responses.append(self._server.handle(obj))
+        self._in_flight.append((obj["cmd"], 0.0, 0, start))
+
+    def _read_raw(self) -> tuple[bytes, dict]:
+        resp = self._responses.popleft()
+        self._record(time.perf_counter(), 0)
+        return b"", resp
+
+    def close(self):
+        pass
+
+
+# ── Parity with TS-generated games ────────────────────────────────────────────
+
+def replay_game(log: dict) -> list[str]:
+    """Replay one game-logger.ts JSONL record; returns the mismatches found.
+
+    Checks the snapshot and the valid-action list before every move, the
+    greedy choice for "greedy" players, that each logged move is accepted,
+    and the final win order. Stops at the first divergence of the game state.
+    """
+    moves = log["moves"]
+    if not moves:
+        return []
+    game = GameState([
+        mask_of(c["value"] for c in hand) for hand in moves[0]["state"]["hands"]
+    ])
+    errors = []
+    for i, move in enumerate(moves):
+        where = f"game {log['game_id']} move {i}"
+        if game.to_snapshot() != move["state"]:
+            errors.append(f"{where}: state differs")
+            return errors
+        player = move["player"]
+        plays = get_all_plays(evaluate(game.hands[player], game.last_play))
+        logged = [tuple(c["value"] for c in cards) for cards in move["valid_actions"]]
+        if plays != logged:
+            errors.append(f"{where}: valid actions differ: {plays} != {logged}")
+        cards = tuple(c["value"] for c in move["cards"])
+        if log["players"][player] == "greedy":
+            chosen = choose_play(game.hands[player], game.last_play)
+            if chosen != cards:
+                errors.append(f"{where}: greedy chose {list(chosen)}, logged {list(cards)}")
+        if cards:
+            result = game.play_cards(player, cards)
+            if not result.valid:
+                errors.append(f"{where}: logged play {list(cards)} rejected: {result.error}")
+                return errors
+        elif not game.pass_turn(player):
+            errors.append(f"{where}: logged pass rejected")
+            return errors
+    if game.win_order != log["win_order"]:
+        errors.append(f"game {log['game_id']}: win order {game.win_order} != {log['win_order']}")
+    return errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check the Python engine against TS-generated games (generate.ts JSONL)",
+    )
+    parser.add_argument("data", nargs="+", help="JSONL game logs")
+    parser.add_argument("--max-errors", type=int, default=20, help="Mismatches to print")
+    args = parser.parse_args()
+
+    games = moves = 0
+    errors: list[str] = []
+    for path in args.data:
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                log = json.loads(line)
+                errors.extend(replay_game(log))
+                games += 1
+                moves += len(log["moves"])
+
+    for error in errors[:args.max_errors]:
+        print(error)
+    print(f"{games} games, {moves} moves: {len(errors)} mismatches")
+    sys.exit(1 if errors else 0)
@@ -6,6 +6,10 @@ This validates the full pipeline: data → encoding → training → model.
 
 Usage:
     python train_imitation.py --data greedy-10k.jsonl [--epochs 50] [--output model.pt]
+    python train_imitation.py --games 10000 [--epochs 50] [--output model.pt]
+
+--games plays greedy self-play games in-process (batched_env) instead of
+reading generate-data output, labelling each decision with greedy_policy.
 """
 
 import argparse
@@ -18,6 +22,7 @@ import torch
 import torch.nn as nn
 from torch.utils.data import Dataset, DataLoader
 
+from batched_env import BatchedGameEnv
 from features import encode_state, encode_action, encode_pass_action, STATE_SIZE, ACTION_SIZE
 from model import TienLenNet
 
@@ -121,15 +126,61 @@ class ImitationDataset(Dataset):
         )
 
 
+class GreedySelfPlayDataset(ImitationDataset):
+    """
+    The same samples as ImitationDataset, from greedy self-play games run
+    in-process: every decision of every seat, labelled with the greedy
+    bot's choice. Decisions whose choice falls past max_actions are skipped.
+    """
+
+    def __init__(
+        self, num_games: int, max_actions: int = 80, num_envs: int = 256, seed: int | None = None,
+    ):
+        self.samples = []
+        self.max_actions = max_actions
+        self.skipped = 0
+
+        print(f"Playing {num_games} greedy games...")
+        env = BatchedGameEnv(min(num_envs, num_games), seed=seed, max_actions=max_actions)
+        env.reset()
+        dealt, finished = env.num_games, 0
+        while not env.done.all():
+            states, action_features, action_mask, _ = env.observe()
+            labels = env.greedy_actions()
+            for b in np.flatnonzero(~env.done):
+                if labels[b] < 0:
+                    self.skipped += 1
+                    continue
+                self.samples.append(
+                    (states[b].copy(), action_features[b].copy(), action_mask[b].copy(), int(labels[b]))
+                )
+            done = env.step_greedy()
+            # Deal replacements until num_games have been played
+            refill = done[:num_games - dealt]
+            dealt += refill.size
+            env.reset(refill)
+            if done.size:
+                finished += done.size
+                print(f"\r  {finished} games, {len(self.samples)} samples", end="", file=sys.stderr)
+
+        print(
+            f"\nPlayed {len(self.samples)} samples ({self.skipped} skipped)",
+            file=sys.stderr,
+        )
+
+
 def train(
-    data_path: str,
+    data_path: str | None,
     epochs: int = 50,
     batch_size: int = 256,
     lr: float = 3e-4,
     output_path: str = "model.pt",
     val_split: float = 0.1,
+    games: int | None = None,
 ):
-    dataset = ImitationDataset(data_path)
+    """Train on data_path (generate-data JSONL), or on `games` greedy
+    self-play games played in-process when data_path is None."""
+    dataset = ImitationDataset(data_path) if data_path else GreedySelfPlayDataset(games)
 
     # Train/val split
     n = len(dataset)
@@ -228,11 +279,13 @@ def train(
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Train imitation learning model")
-    parser.add_argument("--data", required=True, help="Path to JSONL training data")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", help="Path to JSONL training data")
+    source.add_argument("--games", type=int, help="Play this many greedy games in-process instead")
     parser.add_argument("--epochs", type=int, default=50)
     parser.add_argument("--batch-size", type=int, default=256)
     parser.add_argument("--lr", type=float, default=3e-4)
     parser.add_argument("--output", default="model.pt")
     args = parser.parse_args()
 
-    train(args.data, args.epochs, args.batch_size, args.lr, args.output)
+    train(args.data, args.epochs, args.batch_size, args.lr, args.output, games=args.games)
@@ -14,10 +14,13 @@ Usage:
 """
 
 import argparse
+import asyncio
+import copy
 import csv
 import os
 import random
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass as dc_dataclass
 from datetime import datetime
 from typing import Callable
@@ -28,7 +31,10 @@ import torch.nn as nn
 
 from features import encode_state, encode_action, encode_pass_action, STATE_SIZE, ACTION_SIZE
 from model import TienLenNet
-from game_bridge import GameBridge, TurnInfo, GameOver
+from game_bridge import (
+    AsyncGameBridge, AsyncGameSession, GameBridge, VecGameBridge, TurnInfo, GameOver,
+    encoder_projection,
+)
 from game_logger import GameLogger, GameRecord
 
 
@@ -163,27 +169,36 @@ LEADER_WON_PENALTY = -0.3       # penalty when leader wins the game (for non-lea
 TRAILING_URGENCY_SCALE = 0.5    # scale factor for trailing player urgency
 
 
+def count_actions(turn: TurnInfo) -> int:
+    """Number of encoded actions for a turn (plays truncated as in encode_turn, plus pass)."""
+    # Reserve a slot for pass so it's never truncated
+    max_play_slots = MAX_ACTIONS - 1 if turn.can_pass else MAX_ACTIONS
+    return min(turn.num_actions, max_play_slots) + (1 if turn.can_pass else 0)
+
+
 def encode_turn(turn: TurnInfo, player: int):
     """Encode a turn into state features and padded action features.
 
     Pass is always included when available — play actions are truncated
-    to MAX_ACTIONS-1 to reserve a slot for it.
+    to MAX_ACTIONS-1 to reserve a slot for it. Uses the server-encoded
+    features when the bridge provides them.
     """
-    state = encode_state(turn.state, player)
-
-    # Reserve a slot for pass so it's never truncated
-    max_play_slots = MAX_ACTIONS - 1 if turn.can_pass else MAX_ACTIONS
-    action_list = [encode_action(cards) for cards in turn.valid_actions[:max_play_slots]]
-    if turn.can_pass:
-        action_list.append(encode_pass_action())
-
-    num_actions = len(action_list)
+    num_actions = count_actions(turn)
+    num_plays = num_actions - (1 if turn.can_pass else 0)
     action_features = np.zeros((MAX_ACTIONS, ACTION_SIZE), dtype=np.float32)
     action_mask = np.zeros(MAX_ACTIONS, dtype=np.bool_)
+    action_mask[:num_actions] = True
 
-    for i, af in enumerate(action_list):
-        action_features[i] = af
-        action_mask[i] = True
+    if turn.state_features is not None and player == turn.player:
+        # Copy out of the response buffer so stored rollouts don't pin it
+        state = turn.state_features.copy()
+        action_features[:num_plays] = turn.action_features[:num_plays]
+    else:
+        state = encode_state(turn.state, player)
+        for i, cards in enumerate(turn.valid_actions[:num_plays]):
+            action_features[i] = encode_action(cards)
+    if turn.can_pass:
+        action_features[num_plays] = encode_pass_action()
 
     return state, action_features, action_mask, num_actions
 
@@ -196,7 +211,7 @@ def to_bridge_action(action_index: int, num_actions: int, turn: TurnInfo) -> int
     pass index (len(valid_actions)).
     """
     if turn.can_pass and action_index == num_actions - 1:
-        return len(turn.valid_actions)  # pass in TS coordinates
+        return turn.num_actions  # pass in TS coordinates
     return action_index
 
 
@@ -270,6 +285,57 @@ def sample_opponents(dist: dict[str, float]) -> dict[int, str]:
     }
 
 
+def sample_seat_types(opponent_dist: dict[str, float] | None) -> dict[int, str]:
+    """Seat types for one game; None means pure self-play (--no-opponent-pool)."""
+    if opponent_dist is None:
+        return {s: "self" for s in range(4)}
+    return {0: "self", **sample_opponents(opponent_dist)}
+
+
+AVERAGE_MODEL_ID = "average"
+
+
+def server_seats(
+    seat_types: dict[int, str], has_average: bool, server_average: bool = False,
+) -> tuple[list[int] | None, list[int] | None, dict[int, str] | None]:
+    """(greedy_seats, random_seats, model_seats): the seats the server auto-plays.
+
+    Random seats, and average seats without an average model to play them
+    (they fall back to random), never consult a model, so the server plays
+    them without a round trip. With server_average the average seats are
+    played by the ONNX export loaded as AVERAGE_MODEL_ID (push_average_model).
+    """
+    greedy = [s for s, t in seat_types.items() if t == "greedy"]
+    rand = [
+        s for s, t in seat_types.items()
+        if t == "random" or (t == "average" and not has_average)
+    ]
+    models = {
+        s: AVERAGE_MODEL_ID for s, t in seat_types.items()
+        if t == "average" and has_average and server_average
+    }
+    return greedy or None, rand or None, models or None
+
+
+def push_average_model(
+    avg_model: TienLenNet,
+    onnx_path: str,
+    servers: GameBridge | VecGameBridge,
+    async_loop: asyncio.AbstractEventLoop | None = None,
+    async_bridge: AsyncGameBridge | None = None,
+) -> None:
+    """Export the average policy to ONNX and hot-swap it into every game server."""
+    from export_onnx import export_module
+
+    export_module(copy.deepcopy(avg_model).cpu().eval(), onnx_path)
+    servers.load_model(AVERAGE_MODEL_ID, onnx_path, sample=True)
+    if async_bridge is not None:
+        assert async_loop is not None
+        async_loop.run_until_complete(
+            async_bridge.load_model(AVERAGE_MODEL_ID, onnx_path, sample=True)
+        )
+
+
 def select_action_average(
     avg_model: TienLenNet,
     state: np.ndarray,
@@ -291,6 +357,83 @@ def select_action_average(
         return action.item()
 
 
+def select_actions_batch(
+    model: TienLenNet,
+    states: list[np.ndarray],
+    action_features: list[np.ndarray],
+    action_masks: list[np.ndarray],
+    device: torch.device,
+    with_value: bool = True,
+) -> tuple[list[int], list[float], list[float]]:
+    """Batched select_action: one forward pass for many decision points.
+
+    Returns (action_indices, log_probs, values); values is empty when
+    with_value is False (average-policy seats don't need it).
+    """
+    with torch.no_grad():
+        state_t = torch.from_numpy(np.stack(states)).to(device)
+        actions_t = torch.from_numpy(np.stack(action_features)).to(device)
+        mask_t = torch.from_numpy(np.stack(action_masks)).to(device)
+
+        scores = model(state_t, actions_t)
+        scores = scores.masked_fill(~mask_t, float("-inf"))
+        dist = torch.distributions.Categorical(logits=scores)
+        actions = dist.sample()
+
+        log_probs = dist.log_prob(actions).tolist()
+        values = model.value(state_t).squeeze(-1).tolist() if with_value else []
+        return actions.tolist(), log_probs, values
+
+
+class InferenceBatcher:
+    """Coalesces concurrent async decision requests into batched forward passes.
+
+    The first select() in an event loop iteration schedules a flush with
+    call_soon, so every game coroutine that becomes ready in the meantime
+    joins the same select_actions_batch call.
+    """
+
+    def __init__(self, model: TienLenNet, device: torch.device, with_value: bool = True):
+        self.model = model
+        self.device = device
+        self.with_value = with_value
+        self._pending: list[tuple[np.ndarray, np.ndarray, np.ndarray, asyncio.Future]] = []
+
+    async def select(
+        self,
+        state: np.ndarray,
+        action_features: np.ndarray,
+        action_mask: np.ndarray,
+    ) -> tuple[int, float, float]:
+        """Returns (action_index, log_prob, value); value is 0.0 without with_value."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._flush)
+        self._pending.append((state, action_features, action_mask, fut))
+        return await fut
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        try:
+            actions, log_probs, values = select_actions_batch(
+                self.model,
+                [p[0] for p in pending],
+                [p[1] for p in pending],
+                [p[2] for p in pending],
+                self.device,
+                with_value=self.with_value,
+            )
+        except Exception as e:
+            for *_, fut in pending:
+                fut.set_exception(e)
+            return
+        if not values:
+            values = [0.0] * len(actions)
+        for (_, _, _, fut), a, lp, v in zip(pending, actions, log_probs, values):
+            fut.set_result((a, lp, v))
+
+
 def compute_gae(
     rewards: torch.Tensor,
     values: torch.Tensor,
@@ -379,6 +522,81 @@ class GameResult:
     moves: int
 
 
+class EpisodeTracker:
+    """Per-game reward bookkeeping for self-seats.
+
+    Shared by play_one_game and the vectorized collector so both credit
+    finish, shaping and terminal rewards identically.
+    """
+
+    def __init__(
+        self,
+        first_turn: TurnInfo,
+        self_seats: set[int],
+        use_shaping: bool,
+        reward_fn: Callable[[float, int, int, list[int]], float] | None = None,
+    ):
+        self.player_bufs = {p: TrajectoryBuffer() for p in self_seats}
+        self.use_shaping = use_shaping
+        self.reward_fn = reward_fn
+        self.prev_can_pass = False
+        self.finish_position = len(first_turn.win_order)
+        self.moves = 0
+
+    def observe(self, result: TurnInfo | GameOver) -> GameResult | None:
+        """Credit rewards for one step result. Returns the GameResult at game over."""
+        self.moves += 1
+        player_bufs = self.player_bufs
+        reward_fn = self.reward_fn
+        self._observe_record(result)
+
+        if isinstance(result, GameOver):
+            win_order = result.win_order
+            for position, player_id in enumerate(win_order):
+                if player_id in player_bufs:
+                    pb = player_bufs[player_id]
+                    if pb.size() > 0:
+                        base = POSITION_REWARDS[position]
+                        r = reward_fn(base, position, player_id, win_order) if reward_fn else base
+                        if position >= self.finish_position:
+                            pb.rewards[-1] += r
+                        pb.dones[-1] = True
+            return GameResult(player_bufs, win_order, self.moves)
+
+        # Players who finished since the last observation, in finishing order
+        win_order = result.win_order
+        for position in range(self.finish_position, len(win_order)):
+            p = win_order[position]
+            if p in player_bufs and player_bufs[p].size() > 0:
+                base = POSITION_REWARDS[position]
+                # Mid-game: pass incomplete win_order — reward_fn should handle gracefully
+                r = reward_fn(base, position, p, []) if reward_fn else base
+                player_bufs[p].rewards[-1] += r
+        self.finish_position = len(win_order)
+
+        self._observe_turn(result.player, result.can_pass)
+        return None
+
+    def _observe_record(self, result: TurnInfo | GameOver) -> None:
+        """Replay the turns the server played since the last result.
+
+        Forced moves count as moves, as if we had stepped them; random and
+        model seat moves (record_seats) only feed shaping, so avg_moves means
+        the same with or without it.
+        """
+        self.moves += result.forced
+        for move in result.forced_moves or ():
+            self._observe_turn(move["player"], move["can_pass"])
+
+    def _observe_turn(self, player: int, can_pass: bool) -> None:
+        """Power-gain shaping: a turn without pass after one with pass means a trick was won."""
+        player_bufs = self.player_bufs
+        if self.use_shaping and not can_pass and self.prev_can_pass:
+            if player in player_bufs and player_bufs[player].size() > 0:
+                player_bufs[player].rewards[-1] += POWER_GAIN_REWARD
+        self.prev_can_pass = can_pass
+
+
 def play_one_game(
     bridge: GameBridge,
     first_turn: TurnInfo,
@@ -396,19 +614,16 @@ def play_one_game(
     reward_fn: optional (base_reward, position, player_seat, win_order) -> adjusted_reward.
     If None, uses base_reward directly (individual game behavior).
     """
-    player_bufs = {p: TrajectoryBuffer() for p in self_seats}
+    tracker = EpisodeTracker(first_turn, self_seats, use_shaping, reward_fn)
+    player_bufs = tracker.player_bufs
     turn = first_turn
-    prev_can_pass = False
-    prev_hand_sizes = {p: len(turn.state["hands"][p]) for p in range(4)}
-    finish_position = 0
-    total_moves = 0
 
     while True:
         player = turn.player
         seat_type = seat_types.get(player, "self")
-        state, action_features, action_mask, num_actions = encode_turn(turn, player)
 
         if seat_type == "self":
+            state, action_features, action_mask, num_actions = encode_turn(turn, player)
             action_index, log_prob, value = select_action(
                 model, state, action_features, action_mask, num_actions, device
             )
@@ -418,51 +633,74 @@ def play_one_game(
             player_bufs[player].rewards[-1] = 0.0  # shaping added below
             if reservoir is not None:
                 reservoir.add(state, action_features, action_mask, action_index)
-        elif seat_type == "random":
-            action_index = random.randrange(num_actions)
         elif seat_type == "average" and avg_model is not None:
+            state, action_features, action_mask, num_actions = encode_turn(turn, player)
             action_index = select_action_average(
                 avg_model, state, action_features, action_mask, num_actions, device
             )
         else:
+            # Random play needs no encoding (normally the server plays these seats)
+            num_actions = count_actions(turn)
             action_index = random.randrange(num_actions)
 
-        total_moves += 1
         result = bridge.step(to_bridge_action(action_index, num_actions, turn))
+        game_result = tracker.observe(result)
+        if game_result is not None:
+            return game_result
 
-        if isinstance(result, GameOver):
-            win_order = result.win_order
-            for position, player_id in enumerate(win_order):
-                if player_id in player_bufs:
-                    pb = player_bufs[player_id]
-                    if pb.size() > 0:
-                        base = POSITION_REWARDS[position]
-                        r = reward_fn(base, position, player_id, win_order) if reward_fn else base
-                        if position >= finish_position:
-                            pb.rewards[-1] += r
-                        pb.dones[-1] = True
-            return GameResult(player_bufs, win_order, total_moves)
+        assert isinstance(result, TurnInfo)
+        turn = result
+
+
+async def play_one_game_async(
+    session: AsyncGameSession,
+    first_turn: TurnInfo,
+    batchers: dict[str, InferenceBatcher],
+    seat_types: dict[int, str],
+    self_seats: set[int],
+    use_shaping: bool,
+    reservoir: ReservoirBuffer | None = None,
+    reward_fn: Callable[[float, int, int, list[int]], float] | None = None,
+) -> GameResult:
+    """Coroutine version of play_one_game for many games on one event loop.
+
+    batchers maps "self" (and optionally "average") to the InferenceBatcher
+    used for that seat type; seats without a batcher play randomly.
+    """
+    tracker = EpisodeTracker(first_turn, self_seats, use_shaping, reward_fn)
+    player_bufs = tracker.player_bufs
+    turn = first_turn
+
+    while True:
+        player = turn.player
+        seat_type = seat_types.get(player, "self")
+        batcher = batchers.get(seat_type)
+        if batcher is not None:
+            state, action_features, action_mask, num_actions = encode_turn(turn, player)
+        else:
+            num_actions = count_actions(turn)
+
+        if seat_type == "self" and batcher is not None:
+            action_index, log_prob, value = await batcher.select(
+                state, action_features, action_mask,
+            )
+            player_bufs[player].add(
+                state, action_features, action_mask, action_index, log_prob, value
+            )
+            player_bufs[player].rewards[-1] = 0.0  # shaping added below
+            if reservoir is not None:
+                reservoir.add(state, action_features, action_mask, action_index)
+        elif batcher is not None:
+            action_index, _, _ = await batcher.select(state, action_features, action_mask)
+        else:
+            action_index = random.randrange(num_actions)
+
+        result = await session.step(to_bridge_action(action_index, num_actions, turn))
+        game_result = tracker.observe(result)
+        if game_result is not None:
+            return game_result
 
         assert isinstance(result, TurnInfo)
-        curr_hand_sizes = {p: len(result.state["hands"][p]) for p in range(4)}
-        for p in range(4):
-            if prev_hand_sizes[p] > 0 and curr_hand_sizes[p] == 0:
-                position = finish_position
-                finish_position += 1
-                if p in player_bufs and player_bufs[p].size() > 0:
-                    base = POSITION_REWARDS[position]
-                    # Mid-game: pass incomplete win_order — reward_fn should handle gracefully
-                    r = reward_fn(base, position, p, []) if reward_fn else base
-                    player_bufs[p].rewards[-1] += r
-
-        prev_hand_sizes = curr_hand_sizes
-
-        if use_shaping and not result.can_pass and prev_can_pass:
-            power_player = result.player
-            if power_player in player_bufs and player_bufs[power_player].size() > 0:
-                player_bufs[power_player].rewards[-1] += POWER_GAIN_REWARD
-
-        prev_can_pass = result.can_pass
         turn = result
 
 
@@ -477,25 +715,37 @@ def collect_trajectories(
     avg_model: TienLenNet | None = None,
     opponent_dist: dict[str, float] | None = None,
     reservoir: ReservoirBuffer | None = None,
+    server_average: bool = False,
+    auto_forced: bool = False,
+    projection: dict | None = None,
 ) -> tuple[TrajectoryBuffer, dict]:
-    """Play games with mixed opponents, collect PPO data from self-seats only."""
+    """Play games with mixed opponents, collect PPO data from self-seats only.
+
+    server_average: average seats are played by the game server from the
+    ONNX export pushed with push_average_model, instead of in Python.
+    auto_forced: the server plays single-option moves (e.g. a pass with
+    nothing playable) itself; they are never stored as PPO steps, and
+    EpisodeTracker replays them for reward shaping.
+    projection: trims turn responses to the fields read here (encoder_projection).
+    Each game announces the next one's seats, so a prefetching bridge can
+    deal it while this one is played out.
+    """
     buf = TrajectoryBuffer()
     games_played = 0
     total_moves = 0
     opponent_counts: dict[str, int] = {"self": 0, "greedy": 0, "random": 0, "average": 0}
 
-    # Pure self-play fallback (--no-opponent-pool)
-    pure_self_play = opponent_dist is None
-
+    next_seat_types = sample_seat_types(opponent_dist)
     while buf.size() < target_steps:
-        # Assign opponent types for seats 1-3
-        if pure_self_play:
-            seat_types: dict[int, str] = {s: "self" for s in range(4)}
-            greedy_seats: list[int] = []
-        else:
-            assignments = sample_opponents(opponent_dist)
-            seat_types = {0: "self", **assignments}
-            greedy_seats = [s for s, t in seat_types.items() if t == "greedy"]
+        # Assign opponent types for seats 1-3 (all "self" without an opponent pool),
+        # drawing the following game's one game ahead
+        seat_types, next_seat_types = next_seat_types, sample_seat_types(opponent_dist)
+        greedy_seats, random_seats, model_seats = server_seats(
+            seat_types, avg_model is not None, server_average,
+        )
+        next_greedy, next_random, next_models = server_seats(
+            next_seat_types, avg_model is not None, server_average,
+        )
 
         # Track opponent mix
         for t in seat_types.values():
@@ -504,9 +754,17 @@ def collect_trajectories(
         # Only self-seats collect PPO data
         self_seats = {s for s, t in seat_types.items() if t == "self"}
 
-        result = bridge.new_game(greedy_seats=greedy_seats if greedy_seats else None)
+        result = bridge.new_game(
+            greedy_seats=greedy_seats, random_seats=random_seats, model_seats=model_seats,
+            auto_forced="record" if auto_forced else False,
+            projection=projection,
+            next_seats={
+                "greedy_seats": next_greedy, "random_seats": next_random,
+                "model_seats": next_models,
+            },
+        )
 
-        # Edge case: all greedy seats finish before any non-greedy turn
+        # Edge case: all server-played seats finish before any other turn
         if isinstance(result, GameOver):
             games_played += 1
             continue
@@ -531,6 +789,260 @@ def collect_trajectories(
     return buf, stats
 
 
+def collect_trajectories_vec(
+    vec_bridge: VecGameBridge,
+    model: TienLenNet,
+    device: torch.device,
+    target_steps: int,
+    use_shaping: bool = True,
+    avg_model: TienLenNet | None = None,
+    opponent_dist: dict[str, float] | None = None,
+    reservoir: ReservoirBuffer | None = None,
+    server_average: bool = False,
+    auto_forced: bool = False,
+    projection: dict | None = None,
+) -> tuple[TrajectoryBuffer, dict]:
+    """collect_trajectories over N envs in lockstep.
+
+    Every round, decisions for all envs are made with one batched forward
+    pass per policy, then all envs are stepped with a single step_all().
+    Once target_steps is reached, no new games are started and in-flight
+    games are played to completion, as in the serial collector.
+    """
+    buf = TrajectoryBuffer()
+    games_played = 0
+    total_moves = 0
+    opponent_counts: dict[str, int] = {"self": 0, "greedy": 0, "random": 0, "average": 0}
+
+    n = vec_bridge.num_envs
+    seat_types: list[dict[int, str]] = [{} for _ in range(n)]
+    trackers: list[EpisodeTracker | None] = [None] * n
+    turns: list[TurnInfo | None] = [None] * n
+
+    def start_games(envs: list[int]):
+        nonlocal games_played
+        while envs:
+            greedy_seats: list[list[int] | None] = [None] * n
+            random_seats: list[list[int] | None] = [None] * n
+            model_seats: list[dict[int, str] | None] = [None] * n
+            for i in envs:
+                seat_types[i] = sample_seat_types(opponent_dist)
+                for t in seat_types[i].values():
+                    opponent_counts[t] = opponent_counts.get(t, 0) + 1
+                greedy_seats[i], random_seats[i], model_seats[i] = server_seats(
+                    seat_types[i], avg_model is not None, server_average,
+                )
+
+            results = vec_bridge.reset_all(
+                greedy_seats=greedy_seats, envs=envs,
+                random_seats=random_seats, model_seats=model_seats,
+                auto_forced="record" if auto_forced else False,
+                projection=projection,
+            )
+            retry = []
+            for i in envs:
+                result = results[i]
+                if isinstance(result, GameOver):
+                    # Edge case: all greedy seats finish before any non-greedy turn
+                    games_played += 1
+                    retry.append(i)
+                    continue
+                assert isinstance(result, TurnInfo)
+                self_seats = {s for s, t in seat_types[i].items() if t == "self"}
+                trackers[i] = EpisodeTracker(result, self_seats, use_shaping)
+                turns[i] = result
+            envs = retry
+
+    start_games(list(range(n)))
+
+    while any(t is not None for t in turns):
+        actions: list[int | None] = [None] * n
+        encoded: dict[int, tuple] = {}
+        num_actions: dict[int, int] = {}
+        groups: dict[str, list[int]] = {"self": [], "average": []}
+
+        for i, turn in enumerate(turns):
+            if turn is None:
+                continue
+            seat_type = seat_types[i].get(turn.player, "self")
+            if seat_type == "self" or (seat_type == "average" and avg_model is not None):
+                encoded[i] = encode_turn(turn, turn.player)
+                num_actions[i] = encoded[i][3]
+                groups[seat_type].append(i)
+            else:
+                num_actions[i] = count_actions(turn)
+                actions[i] = random.randrange(num_actions[i])
+
+        if groups["self"]:
+            idx = groups["self"]
+            chosen, log_probs, values = select_actions_batch(
+                model,
+                [encoded[i][0] for i in idx],
+                [encoded[i][1] for i in idx],
+                [encoded[i][2] for i in idx],
+                device,
+            )
+            for i, a, lp, v in zip(idx, chosen, log_probs, values):
+                state, action_features, action_mask, _ = encoded[i]
+                pb = trackers[i].player_bufs[turns[i].player]
+                pb.add(state, action_features, action_mask, a, lp, v)
+                if reservoir is not None:
+                    reservoir.add(state, action_features, action_mask, a)
+                actions[i] = a
+
+        if groups["average"]:
+            idx = groups["average"]
+            chosen, _, _ = select_actions_batch(
+                avg_model,
+                [encoded[i][0] for i in idx],
+                [encoded[i][1] for i in idx],
+                [encoded[i][2] for i in idx],
+                device,
+                with_value=False,
+            )
+            for i, a in zip(idx, chosen):
+                actions[i] = a
+
+        bridge_actions = [
+            to_bridge_action(a, num_actions[i], turns[i]) if a is not None else None
+            for i, a in enumerate(actions)
+        ]
+        results = vec_bridge.step_all(bridge_actions)
+
+        finished = []
+        for i, result in enumerate(results):
+            if result is None:
+                continue
+            game_result = trackers[i].observe(result)
+            if game_result is None:
+                turns[i] = result
+                continue
+            total_moves += game_result.moves
+            for pb in game_result.player_bufs.values():
+                buf.extend(pb)
+            games_played += 1
+            trackers[i] = None
+            turns[i] = None
+            finished.append(i)
+
+        if finished and buf.size() < target_steps:
+            start_games(finished)
+
+    stats = {
+        "games": games_played,
+        "steps": buf.size(),
+        "avg_moves": total_moves / max(games_played, 1),
+        "opponent_counts": opponent_counts,
+    }
+    return buf, stats
+
+
+async def collect_trajectories_async(
+    bridge: AsyncGameBridge,
+    model: TienLenNet,
+    device: torch.device,
+    target_steps: int,
+    use_shaping: bool = True,
+    avg_model: TienLenNet | None = None,
+    opponent_dist: dict[str, float] | None = None,
+    reservoir: ReservoirBuffer | None = None,
+    concurrency: int = 64,
+    server_average: bool = False,
+    auto_forced: bool = False,
+    projection: dict | None = None,
+) -> tuple[TrajectoryBuffer, dict]:
+    """collect_trajectories with `concurrency` games in flight on one server.
+
+    Each worker coroutine plays games back to back in its own session;
+    model decisions from all workers are batched by InferenceBatcher.
+    """
+    buf = TrajectoryBuffer()
+    games_played = 0
+    total_moves = 0
+    opponent_counts: dict[str, int] = {"self": 0, "greedy": 0, "random": 0, "average": 0}
+    batchers = {"self": InferenceBatcher(model, device)}
+    if avg_model is not None:
+        batchers["average"] = InferenceBatcher(avg_model, device, with_value=False)
+
+    async def worker():
+        nonlocal games_played, total_moves
+        session = bridge.session()
+        while buf.size() < target_steps:
+            seat_types = sample_seat_types(opponent_dist)
+            for t in seat_types.values():
+                opponent_counts[t] = opponent_counts.get(t, 0) + 1
+            greedy_seats, random_seats, model_seats = server_seats(
+                seat_types, "average" in batchers, server_average,
+            )
+            self_seats = {s for s, t in seat_types.items() if t == "self"}
+
+            result = await session.new_game(
+                greedy_seats=greedy_seats, random_seats=random_seats, model_seats=model_seats,
+                auto_forced="record" if auto_forced else False,
+                projection=projection,
+            )
+            # Edge case: all server-played seats finish before any other turn
+            if isinstance(result, GameOver):
+                games_played += 1
+                continue
+
+            game_result = await play_one_game_async(
+                session, result, batchers, seat_types, self_seats,
+                use_shaping, reservoir,
+            )
+            total_moves += game_result.moves
+            for pb in game_result.player_bufs.values():
+                buf.extend(pb)
+            games_played += 1
+        await session.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    stats = {
+        "games": games_played,
+        "steps": buf.size(),
+        "avg_moves": total_moves / max(games_played, 1),
+        "opponent_counts": opponent_counts,
+    }
+    return buf, stats
+
+
+def open_game_servers(
+    num_envs: int, engine: str, **bridge_kwargs,
+) -> GameBridge | VecGameBridge:
+    """A single game server, or a VecGameBridge of num_envs when --num-envs > 1.
+
+    Both provide the stats(), load_model() and close() that train() uses
+    outside the collectors. engine="python" runs the in-process
+    thirteen_engine instead, which only takes record_seats.
+    """
+    if num_envs > 1:
+        return VecGameBridge(num_envs, engine=engine, **bridge_kwargs)
+    if engine == "python":
+        from thirteen_engine import EngineBridge
+
+        bridge = EngineBridge()
+        if bridge_kwargs.get("record_seats"):
+            bridge.configure(record_seats=True)
+        return bridge
+    return GameBridge(**bridge_kwargs)
+
+
+@contextmanager
+def async_bridge_loop(enabled: bool, **bridge_kwargs):
+    """Event loop plus AsyncGameBridge for --async-games; yields (None, None) if disabled."""
+    if not enabled:
+        yield None, None
+        return
+    loop = asyncio.new_event_loop()
+    bridge = loop.run_until_complete(AsyncGameBridge.start(**bridge_kwargs))
+    try:
+        yield loop, bridge
+    finally:
+        loop.run_until_complete(bridge.close())
+        loop.close()
+
+
 def collect_tourney_trajectories(
     bridge: GameBridge,
     model: TienLenNet,
@@ -541,6 +1053,9 @@ def collect_tourney_trajectories(
     opponent_dist: dict[str, float] | None = None,
     reservoir: ReservoirBuffer | None = None,
     target_score: int = 21,
+    server_average: bool = False,
+    auto_forced: bool = False,
+    projection: dict | None = None,
 ) -> tuple[TrajectoryBuffer, dict]:
     """Play tournaments, collect PPO data with tournament-aware rewards."""
     from game_bridge import TourneyOver
@@ -551,16 +1066,11 @@ def collect_tourney_trajectories(
     total_moves = 0
     opponent_counts: dict[str, int] = {"self": 0, "greedy": 0, "random": 0, "average": 0}
 
-    pure_self_play = opponent_dist is None
-
     while buf.size() < target_steps:
-        if pure_self_play:
-            seat_types: dict[int, str] = {s: "self" for s in range(4)}
-            greedy_seats: list[int] = []
-        else:
-            assignments = sample_opponents(opponent_dist)
-            seat_types = {0: "self", **assignments}
-            greedy_seats = [s for s, t in seat_types.items() if t == "greedy"]
+        seat_types = sample_seat_types(opponent_dist)
+        greedy_seats, random_seats, model_seats = server_seats(
+            seat_types, avg_model is not None, server_average,
+        )
 
         for t in seat_types.values():
             opponent_counts[t] = opponent_counts.get(t, 0) + 1
@@ -569,8 +1079,12 @@ def collect_tourney_trajectories(
 
         # Start a tournament
         result = bridge.new_tourney(
-            greedy_seats=greedy_seats if greedy_seats else None,
+            greedy_seats=greedy_seats,
             target_score=target_score,
+            random_seats=random_seats,
+            model_seats=model_seats,
+            auto_forced="record" if auto_forced else False,
+            projection=projection,
         )
 
         # Track scores locally for reward shaping.
@@ -607,7 +1121,11 @@ def collect_tourney_trajectories(
             # Start next game or end tournament
             result = bridge.next_game(
                 win_order=win_order,
-                greedy_seats=greedy_seats if greedy_seats else None,
+                greedy_seats=greedy_seats,
+                random_seats=random_seats,
+                model_seats=model_seats,
+                auto_forced="record" if auto_forced else False,
+                projection=projection,
             )
             if isinstance(result, TourneyOver):
                 tourneys_played += 1
@@ -623,6 +1141,49 @@ def collect_tourney_trajectories(
     return buf, stats
 
 
+BRIDGE_STATS_HEADER = [
+    "bridge_cmds", "bridge_rtt_mean_ms", "bridge_rtt_p99_ms",
+    "bridge_write_s", "bridge_wait_s", "bridge_decode_s",
+    "bridge_bytes_sent", "bridge_bytes_recv",
+    "server_compute_s", "server_greedy_s", "server_model_s", "server_send_s", "python_s",
+]
+
+
+def bridge_stats_row(stats: dict, t_collect: float) -> list:
+    """Epoch CSV columns from the game servers' stats() over one collection phase.
+
+    wait_s is time spent blocked on responses (pipe transfer plus server
+    work); python_s is what remains of the collection time. With several
+    envs the per-bridge waits overlap, so python_s is clamped at zero.
+    """
+    client = stats["client"].values()
+    count = sum(c["count"] for c in client)
+    total_s = sum(c["total_s"] for c in client)
+    write_s = sum(c["write_s"] for c in client)
+    wait_s = sum(c["wait_s"] for c in client)
+    decode_s = sum(c["decode_s"] for c in client)
+    p99_ms = max((c["p99_ms"] for c in client), default=0.0)
+    server = stats["server"]
+    compute_ms = sum(
+        c["compute_ms"] for cmd, c in server["commands"].items() if cmd != "stats"
+    )
+    return [
+        count,
+        f"{total_s / count * 1000 if count else 0.0:.4f}",
+        f"{p99_ms:.3f}",
+        f"{write_s:.3f}",
+        f"{wait_s:.3f}",
+        f"{decode_s:.3f}",
+        sum(c["bytes_sent"] for c in client),
+        sum(c["bytes_received"] for c in client),
+        f"{compute_ms / 1000:.3f}",
+        f"{server['greedy_ms'] / 1000:.3f}",
+        f"{server['model_ms'] / 1000:.3f}",
+        f"{server['send_ms'] / 1000:.3f}",
+        f"{max(t_collect - total_s, 0.0):.3f}",
+    ]
+
+
 # ── PPO update ───────────────────────────────────────────────────────────────
 
 def ppo_update(
@@ -766,6 +1327,7 @@ def eval_vs_greedy(
     games: int = 100,
     logger: GameLogger | None = None,
     eval_num: int = 0,
+    projection: dict | None = None,
 ) -> tuple[float, float, list[GameRecord]]:  # (win_rate, avg_ppg, records)
     """
     Play model (seat 0) vs 3 greedy bots. Returns (win_rate, avg_ppg, game_records).
@@ -786,7 +1348,12 @@ def eval_vs_greedy(
         if logger:
             logger.start_game(eval_num, g, model_seat)
 
-        result = bridge.new_game(greedy_seats=greedy_seats)
+        # Forced moves are only worth a round trip when they get logged, and
+        # the logger reads the valid actions' cards
+        result = bridge.new_game(
+            greedy_seats=greedy_seats, auto_forced=logger is None,
+            projection=projection if logger is None else {"hands": "own+sizes"},
+        )
 
         while not isinstance(result, GameOver):
             turn = result
@@ -836,6 +1403,7 @@ def eval_vs_random(
     model: TienLenNet,
     device: torch.device,
     games: int = 100,
+    projection: dict | None = None,
 ) -> tuple[float, float]:  # (win_rate, avg_ppg)
     """Play model (1 seat) vs 3 random bots. Returns (win_rate, avg_ppg)."""
     import random
@@ -847,23 +1415,23 @@ def eval_vs_random(
 
     for g in range(games):
         model_seat = random.randrange(4)
-        # All seats handled in Python (no greedy_seats)
-        result = bridge.new_game()
+        # The server plays the random seats; every turn here is the model's
+        result = bridge.new_game(
+            random_seats=[s for s in range(4) if s != model_seat], auto_forced=True,
+            projection=projection,
+        )
 
         while not isinstance(result, GameOver):
             turn = result
             state, action_features, action_mask, num_actions = encode_turn(turn, turn.player)
 
-            if turn.player == model_seat:
-                with torch.no_grad():
-                    state_t = torch.from_numpy(state).unsqueeze(0).to(device)
-                    actions_t = torch.from_numpy(action_features).unsqueeze(0).to(device)
-                    mask_t = torch.from_numpy(action_mask).unsqueeze(0).to(device)
-                    scores = model(state_t, actions_t)
-                    scores = scores.masked_fill(~mask_t, float("-inf"))
-                    action_index = scores[0, :num_actions].argmax().item()
-            else:
-                action_index = random.randrange(num_actions)
+            with torch.no_grad():
+                state_t = torch.from_numpy(state).unsqueeze(0).to(device)
+                actions_t = torch.from_numpy(action_features).unsqueeze(0).to(device)
+                mask_t = torch.from_numpy(action_mask).unsqueeze(0).to(device)
+                scores = model(state_t, actions_t)
+                scores = scores.masked_fill(~mask_t, float("-inf"))
+                action_index = scores[0, :num_actions].argmax().item()
 
             result = bridge.step(to_bridge_action(action_index, num_actions, turn))
 
@@ -927,7 +1495,22 @@ def train(
     expand_from: str | None = None,
     tourney_mode: bool = False,
     tourney_target_score: int = 21,
+    num_envs: int = 1,
+    bridge_protocol: str = "json",
+    server_encode: bool = False,
+    bridge_delta: bool = False,
+    async_games: int = 0,
+    bridge_transport: str = "pipe",
+    server_opponents: bool = False,
+    auto_forced: bool = False,
+    bridge_prefetch: bool = False,
+    engine: str = "node",
 ):
+    if engine == "python" and (server_encode or server_opponents or async_games):
+        raise ValueError(
+            "--engine python runs games in-process: no --server-encode, "
+            "--server-opponents or --async-games"
+        )
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     print(f"Training on {device}")
 
@@ -984,6 +1567,7 @@ def train(
     print(f"Model parameters: {param_count:,}")
     print(f"Mode: {mode} | Reward shaping: {'ON' if use_shaping else 'OFF'}")
     print(f"Eval: every {eval_interval} epochs, {eval_games} games vs greedy")
+    print(f"Game servers: {num_envs}")
 
     best_score = -999.0
     best_win_rate = -1.0
@@ -996,8 +1580,32 @@ def train(
     with (
         open(epoch_csv_path, "w", newline="") as epoch_f,
         open(eval_csv_path, "w", newline="") as eval_f,
-        GameBridge() as bridge,
+        open_game_servers(
+            num_envs, engine, protocol=bridge_protocol,
+            encode_features=server_encode, delta=bridge_delta,
+            transport=bridge_transport, prefetch=bridge_prefetch,
+            record_seats=use_shaping,
+        ) as servers,
+        async_bridge_loop(
+            async_games > 0, protocol=bridge_protocol,
+            encode_features=server_encode, delta=bridge_delta, prefetch=bridge_prefetch,
+            record_seats=use_shaping,
+        ) as (async_loop, async_bridge),
     ):
+        # Eval and tournament collection run serially on the first env
+        envs = servers.bridges if isinstance(servers, VecGameBridge) else [servers]
+        bridge = envs[0]
+        startup = max(b.startup_time for b in envs)
+        print(f"Game servers ready in {startup:.2f}s")
+
+        # NFSP average seats played inside the game servers from an ONNX
+        # export, re-pushed after every average policy update
+        server_average = server_opponents and avg_model is not None
+        avg_onnx_path = os.path.join(run_dir, "avg-opponent.onnx")
+        if server_average:
+            push_average_model(avg_model, avg_onnx_path, servers, async_loop, async_bridge)
+        # Turn responses carry only what encode_turn reads
+        projection = encoder_projection(server_encode)
         epoch_writer = csv.writer(epoch_f)
         epoch_header = [
             "epoch", "policy_loss", "value_loss", "entropy", "kl",
@@ -1007,6 +1615,9 @@ def train(
             epoch_header.extend(["avg_loss", "reservoir_size", "opponent_mix"])
         if tourney_mode:
             epoch_header.extend(["tourney_frac", "used_tourney"])
+        # Bridge telemetry for the collection phase (the --async-games
+        # bridge is not instrumented, so these stay zero in that mode)
+        epoch_header.extend(BRIDGE_STATS_HEADER)
         epoch_writer.writerow(epoch_header)
 
         eval_writer = csv.writer(eval_f)
@@ -1018,6 +1629,8 @@ def train(
         ])
 
         for epoch in range(epochs):
+            # Drop bridge telemetry from the previous epoch's eval games
+            servers.stats(reset=True)
             t0 = time.time()
 
             # Schedule opponent distribution
@@ -1037,6 +1650,30 @@ def train(
                     opponent_dist=opponent_dist,
                     reservoir=reservoir,
                     target_score=tourney_target_score,
+                    server_average=server_average,
+                    auto_forced=auto_forced,
+                    projection=projection,
+                )
+            elif async_games > 0:
+                buf, collect_stats = async_loop.run_until_complete(collect_trajectories_async(
+                    async_bridge, model, device, batch_size, use_shaping,
+                    avg_model=avg_model,
+                    opponent_dist=opponent_dist,
+                    reservoir=reservoir,
+                    concurrency=async_games,
+                    server_average=server_average,
+                    auto_forced=auto_forced,
+                    projection=projection,
+                ))
+            elif isinstance(servers, VecGameBridge):
+                buf, collect_stats = collect_trajectories_vec(
+                    servers, model, device, batch_size, use_shaping,
+                    avg_model=avg_model,
+                    opponent_dist=opponent_dist,
+                    reservoir=reservoir,
+                    server_average=server_average,
+                    auto_forced=auto_forced,
+                    projection=projection,
                 )
             else:
                 buf, collect_stats = collect_trajectories(
@@ -1044,8 +1681,12 @@ def train(
                     avg_model=avg_model,
                     opponent_dist=opponent_dist,
                     reservoir=reservoir,
+                    server_average=server_average,
+                    auto_forced=auto_forced,
+                    projection=projection,
                 )
             t_collect = time.time() - t0
+            bridge_row = bridge_stats_row(servers.stats(), t_collect)
 
             # PPO update
             t1 = time.time()
@@ -1068,6 +1709,10 @@ def train(
                     avg_model, avg_optimizer, reservoir, device,
                     num_updates=avg_updates, batch_size=minibatch_size,
                 )
+                if server_average:
+                    push_average_model(
+                        avg_model, avg_onnx_path, servers, async_loop, async_bridge,
+                    )
                 t_avg = time.time() - t2
 
             elapsed = t_collect + t_update + t_avg
@@ -1101,6 +1746,7 @@ def train(
                     f"{tourney_frac:.4f}",
                     int(use_tourney),
                 ])
+            epoch_row.extend(bridge_row)
             epoch_writer.writerow(epoch_row)
             epoch_f.flush()
 
@@ -1135,10 +1781,10 @@ def train(
                 eval_num += 1
                 win_rate, avg_ppg, _ = eval_vs_greedy(
                     bridge, model, device, eval_games,
-                    logger=logger, eval_num=eval_num,
+                    logger=logger, eval_num=eval_num, projection=projection,
                 )
                 rand_wr, rand_ppg = eval_vs_random(
-                    bridge, model, device, eval_games,
+                    bridge, model, device, eval_games, projection=projection,
                 )
                 # Combined score: greedy performance + small random bonus
                 # avg_ppg in [0,4], random baseline = 1.75
@@ -1228,6 +1874,30 @@ if __name__ == "__main__":
                         help="Target score for tournament games")
     parser.add_argument("--expand-from", type=str, default=None,
                         help="Path to 725-feature model to expand to 740 features (for first fine-tune)")
+    parser.add_argument("--num-envs", type=int, default=1,
+                        help="Game server processes stepped in lockstep during collection")
+    parser.add_argument("--bridge-protocol", choices=["json", "binary"], default="json",
+                        help="Game server response encoding (binary = length-prefixed frames)")
+    parser.add_argument("--server-encode", action="store_true",
+                        help="Have the game server send encoded state/action features")
+    parser.add_argument("--bridge-delta", action="store_true",
+                        help="Send play-log deltas instead of full snapshots (JSON protocol)")
+    parser.add_argument("--bridge-transport", choices=["pipe", "shm"], default="pipe",
+                        help="Exchange commands/responses over pipes or a shared-memory ring")
+    parser.add_argument("--async-games", type=int, default=0,
+                        help="Collect with N concurrent games on one asyncio-driven server (0 = off)")
+    parser.add_argument("--server-opponents", action="store_true",
+                        help="Play NFSP average-policy seats inside the game server via ONNX "
+                             "(needs onnxruntime-node)")
+    parser.add_argument("--auto-forced", action="store_true",
+                        help="Let the game server play moves with a single legal option "
+                             "(no PPO step is stored for them)")
+    parser.add_argument("--bridge-prefetch", action="store_true",
+                        help="Have the game server deal and auto-play each next game while "
+                             "idle (between games and during PPO updates)")
+    parser.add_argument("--engine", choices=["node", "python"], default="node",
+                        help="Game engine: the TS game server (node) or the in-process "
+                             "Python port (thirteen_engine)")
     args = parser.parse_args()
 
     train(
@@ -1246,4 +1916,14 @@ if __name__ == "__main__":
         expand_from=args.expand_from,
         tourney_mode=args.tourney_mode,
         tourney_target_score=args.tourney_target_score,
+        num_envs=args.num_envs,
+        bridge_protocol=args.bridge_protocol,
+        server_encode=args.server_encode,
+        bridge_delta=args.bridge_delta,
+        async_games=args.async_games,
+        bridge_transport=args.bridge_transport,
+        server_opponents=args.server_opponents,
+        auto_forced=args.auto_forced,
+        bridge_prefetch=args.bridge_prefetch,
+        engine=args.engine,
     )
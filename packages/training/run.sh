@@ -57,6 +57,9 @@ fi
 # ── 2. Train PPO via self-play ───────────────────────────────────────────────
 mkdir -p "$DATA_DIR"
 
+log "Bundling game server..."
+(cd "$REPO_ROOT" && yarn workspace @thirteen/game-logic build:game-server)
+
 log "Starting PPO training: epochs=$EPOCHS batch_size=$BATCH_SIZE lr=$LR"
 
 cd "$PYTHON_DIR"